@@ -23,7 +23,7 @@ Description:
 
 import os
 from pathlib import Path
-from typing import Optional
+from typing import List, Optional
 from dotenv import load_dotenv
 
 # Load environment variables from .env file if it exists
@@ -57,6 +57,89 @@ class Config:
     self.workspace_name: str = os.getenv(
         "DATAFORM_WORKSPACE_NAME", "default-workspace"
     )
+    # Seconds before the local workspace file index is reloaded, to pick up
+    # changes made outside this process (0 reloads on every search).
+    self.dataform_index_ttl_seconds: float = float(
+        os.getenv("DATAFORM_INDEX_TTL_SECONDS", "300")
+    )
+
+    # Client Pool Configuration
+    self.http_pool_size: int = int(os.getenv("GCP_HTTP_POOL_SIZE", "32"))
+
+    # Async Tool Configuration
+    self.async_tool_concurrency: int = int(
+        os.getenv("ASYNC_TOOL_CONCURRENCY", "16")
+    )
+
+    # Local Cache Configuration
+    self.cache_dir: str = os.getenv(
+        "TOKENAISER_CACHE_DIR", str(Path.home() / ".cache" / "tokenaiser")
+    )
+    self.gcs_cache_max_bytes: int = int(
+        os.getenv("GCS_CACHE_MAX_BYTES", str(2 * 1024**3))
+    )
+    self.gcs_spill_max_bytes: int = int(
+        os.getenv("GCS_SPILL_MAX_BYTES", str(4 * 1024**3))
+    )
+
+    # GCS Sliced Download Configuration
+    self.gcs_sliced_threshold: int = int(
+        os.getenv("GCS_SLICED_THRESHOLD", str(256 * 1024**2))
+    )
+    self.gcs_sliced_chunk_size: int = int(
+        os.getenv("GCS_SLICED_CHUNK_SIZE", str(32 * 1024**2))
+    )
+    self.gcs_sliced_max_workers: int = int(
+        os.getenv("GCS_SLICED_MAX_WORKERS", "8")
+    )
+
+    # BigQuery Sampling Configuration
+    self.bq_tablesample_min_bytes: int = int(
+        os.getenv("BQ_TABLESAMPLE_MIN_BYTES", str(1024**3))
+    )
+
+    # BigQuery Cost Guard Configuration (0 disables a limit)
+    self.bq_max_bytes_per_query: int = int(
+        os.getenv("BQ_MAX_BYTES_PER_QUERY", str(100 * 1024**3))
+    )
+    self.bq_max_bytes_per_session: int = int(
+        os.getenv("BQ_MAX_BYTES_PER_SESSION", str(1024**4))
+    )
+    # Seconds after which the budget of an idle agent session is dropped.
+    self.bq_session_budget_idle_seconds: float = float(
+        os.getenv("BQ_SESSION_BUDGET_IDLE_SECONDS", str(24 * 3600))
+    )
+
+    # BigQuery Result Cache Configuration (0 disables the cache)
+    self.bq_result_cache_max_bytes: int = int(
+        os.getenv("BQ_RESULT_CACHE_MAX_BYTES", str(1024**3))
+    )
+
+    # BigQuery Ingestion Configuration
+    self.bq_query_max_rows: int = int(
+        os.getenv("BQ_QUERY_MAX_ROWS", "1000000")
+    )
+    self.bq_query_max_bytes: int = int(
+        os.getenv("BQ_QUERY_MAX_BYTES", str(1024**3))
+    )
+    self.bq_spill_max_bytes: int = int(
+        os.getenv("BQ_SPILL_MAX_BYTES", str(4 * 1024**3))
+    )
+
+    # Metadata Cache Configuration
+    self.metadata_cache_ttl_seconds: float = float(
+        os.getenv("METADATA_CACHE_TTL_SECONDS", "300")
+    )
+
+    # BigQuery Catalog Configuration
+    self.bq_catalog_datasets: List[str] = [
+        dataset.strip()
+        for dataset in os.getenv("BQ_CATALOG_DATASETS", "").split(",")
+        if dataset.strip()
+    ]
+    self.bq_catalog_persist: bool = (
+        os.getenv("BQ_CATALOG_PERSIST", "1") == "1"
+    )
 
   def validate(self) -> bool:
     """Validate that all required configuration is present."""
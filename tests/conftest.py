@@ -0,0 +1,28 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Makes the checkout importable as the `tokenaiser` package."""
+
+import os
+import sys
+import types
+
+_CHECKOUT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+if "tokenaiser" not in sys.modules:
+  # The package has no __init__.py; register the checkout as its namespace
+  # so that tests run from a checkout under any directory name.
+  _PACKAGE = types.ModuleType("tokenaiser")
+  _PACKAGE.__path__ = [_CHECKOUT]
+  sys.modules["tokenaiser"] = _PACKAGE
@@ -0,0 +1,95 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Tests for running blocking tools on the async tool pool."""
+
+import asyncio
+import concurrent.futures
+import threading
+import time
+
+import pytest
+
+pytest.importorskip("dotenv")
+
+from tokenaiser.tools import async_tools
+
+# Seconds each blocking call takes.
+_CALL_SECONDS = 0.05
+
+
+class _Tracker:
+  """Blocking call that records how many copies of it run at once."""
+
+  def __init__(self):
+    self._lock = threading.Lock()
+    self.active = 0
+    self.peak = 0
+
+  def __call__(self, value):
+    with self._lock:
+      self.active += 1
+      self.peak = max(self.peak, self.active)
+    time.sleep(_CALL_SECONDS)
+    with self._lock:
+      self.active -= 1
+    return value
+
+
+@pytest.fixture(name="concurrency")
+def _concurrency(monkeypatch):
+  """Set the per-loop limit over a pool with more threads than the limit."""
+  pool = concurrent.futures.ThreadPoolExecutor(max_workers=8)
+  monkeypatch.setattr(async_tools, "_EXECUTOR", pool)
+
+  def concurrency(limit):
+    monkeypatch.setattr(async_tools.config, "async_tool_concurrency", limit)
+
+  yield concurrency
+  pool.shutdown()
+
+
+async def _run_all(func, count):
+  return await asyncio.gather(
+      *(async_tools.run_blocking(func, i) for i in range(count))
+  )
+
+
+def test_run_blocking_respects_the_concurrency_bound(concurrency):
+  concurrency(2)
+  tracker = _Tracker()
+
+  results = asyncio.run(_run_all(tracker, 6))
+
+  assert results == list(range(6))
+  assert tracker.peak == 2
+
+
+def test_run_blocking_overlaps_calls(concurrency):
+  concurrency(8)
+  tracker = _Tracker()
+
+  start = time.perf_counter()
+  asyncio.run(_run_all(tracker, 8))
+  elapsed = time.perf_counter() - start
+
+  assert tracker.peak > 1
+  assert elapsed < 8 * _CALL_SECONDS / 2
+
+
+def test_async_variant_keeps_the_tool_signature():
+  variant = async_tools.read_gcs_file_tool_async
+
+  assert asyncio.iscoroutinefunction(variant)
+  assert variant.__name__ == "read_gcs_file_tool_async"
+  assert variant.__doc__ == async_tools.gcs_tools.read_gcs_file_tool.__doc__
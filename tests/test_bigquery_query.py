@@ -0,0 +1,66 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Tests for the per-session BigQuery byte budgets."""
+
+import contextvars
+
+import pytest
+
+pytest.importorskip("dotenv")
+
+from tokenaiser.tools import bigquery_query
+
+
+@pytest.fixture(name="budgets")
+def _budgets(monkeypatch):
+  budgets = bigquery_query.SessionBudgets(
+      max_bytes_per_query=0, max_bytes_per_session=100, idle_seconds=3600
+  )
+  monkeypatch.setattr(bigquery_query, "QUERY_BUDGETS", budgets)
+  return budgets
+
+
+def _spend(session_id, num_bytes):
+  """Reserve and settle `num_bytes` as a tool call of `session_id` would."""
+
+  def call():
+    bigquery_query.set_budget_session(session_id)
+    budget = bigquery_query.current_budget()
+    budget.reserve(num_bytes)
+    budget.settle(num_bytes, num_bytes)
+    return budget.stats()
+
+  return contextvars.copy_context().run(call)
+
+
+def test_sessions_do_not_share_an_allowance(budgets):
+  assert _spend("a", 80)["bytes_remaining"] == 20
+  assert _spend("b", 80)["bytes_remaining"] == 20
+  with pytest.raises(bigquery_query.QueryBudgetExceeded):
+    _spend("a", 30)
+  assert _spend("b", 20)["bytes_remaining"] == 0
+  assert budgets.get(None).stats()["bytes_billed"] == 0
+
+
+def test_idle_sessions_are_dropped(budgets):
+  _spend("a", 80)
+  budgets.idle_seconds = 0
+  assert _spend("a", 80)["bytes_remaining"] == 20
+
+
+def test_reset_restores_the_allowance(budgets):
+  _spend("a", 100)
+  budgets.get("a").reset()
+  assert _spend("a", 100)["bytes_remaining"] == 0
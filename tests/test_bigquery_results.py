@@ -0,0 +1,150 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Tests for streaming BigQuery results as Arrow record batches."""
+
+import types
+
+import pytest
+
+pytest.importorskip("dotenv")
+pa = pytest.importorskip("pyarrow")
+
+from tokenaiser.tools import bigquery_results
+from tokenaiser.tools import ingestion_tools
+
+
+def _batches(sizes, start=0):
+  """Record batches of consecutive ids with the given row counts."""
+  batches = []
+  for size in sizes:
+    ids = list(range(start, start + size))
+    batches.append(
+        pa.record_batch({"id": ids, "name": [f"row {i}" for i in ids]})
+    )
+    start += size
+  return batches
+
+
+class _FakeRows:
+  """RowIterator stand-in that streams pre-built record batches."""
+
+  def __init__(self, batches):
+    self.batches = batches
+    self.consumed = 0
+    self.bqstorage_client = None
+
+  def to_arrow_iterable(self, bqstorage_client=None):
+    self.bqstorage_client = bqstorage_client
+    for batch in self.batches:
+      self.consumed += 1
+      yield batch
+
+
+class _FakeCache:
+  """Result cache holding at most one table."""
+
+  def __init__(self, table=None):
+    self.table = table
+
+  def entry_path(self, client, query, job_config, estimate):
+    return "entry"
+
+  def read(self, path, estimate):
+    if self.table is None:
+      return None
+    return self.table, {"result_cache_hit": True}
+
+
+@pytest.fixture(name="query_pages")
+def _query_pages(monkeypatch):
+  """Run `iter_query_pages` over fake batches; returns pages and stats."""
+
+  def query_pages(rows, cached=None, **kwargs):
+    job = types.SimpleNamespace(result=lambda page_size: rows)
+    monkeypatch.setattr(ingestion_tools, "get_bigquery_client", lambda: None)
+    monkeypatch.setattr(
+        ingestion_tools, "get_bigquery_storage_client", lambda: "storage"
+    )
+    monkeypatch.setattr(ingestion_tools, "dry_run", lambda *args: None)
+    monkeypatch.setattr(ingestion_tools, "RESULT_CACHE", _FakeCache(cached))
+    monkeypatch.setattr(
+        ingestion_tools,
+        "submit_query",
+        lambda *args, **kwargs: (job, {"bytes_billed": 0}),
+    )
+    monkeypatch.setattr(ingestion_tools, "complete_query", lambda *args: None)
+    stats = {}
+    pages = list(
+        ingestion_tools.iter_query_pages("SELECT 1", stats=stats, **kwargs)
+    )
+    return pages, stats
+
+  return query_pages
+
+
+def test_iter_record_batches_streams_through_storage_client():
+  rows = _FakeRows(_batches([3, 2]))
+
+  batches = bigquery_results.iter_record_batches(rows, "storage")
+
+  assert rows.consumed == 0
+  assert [len(batch) for batch in batches] == [3, 2]
+  assert rows.bqstorage_client == "storage"
+
+
+def test_pages_are_yielded_as_record_batches(query_pages):
+  rows = _FakeRows(_batches([4, 4, 2]))
+
+  pages, stats = query_pages(rows)
+
+  assert all(isinstance(page, pa.RecordBatch) for page in pages)
+  assert [len(page) for page in pages] == [4, 4, 2]
+  assert stats["rows"] == 10
+  assert not stats["truncated"]
+  assert rows.bqstorage_client == "storage"
+
+
+def test_row_limit_slices_the_last_page(query_pages):
+  rows = _FakeRows(_batches([4, 4, 4, 4]))
+
+  pages, stats = query_pages(rows, max_rows=6)
+
+  assert [len(page) for page in pages] == [4, 2]
+  assert pages[-1].column("id").to_pylist() == [4, 5]
+  assert stats["rows"] == 6
+  assert stats["truncated"]
+  # Pages after the limit are never downloaded.
+  assert rows.consumed == 2
+
+
+def test_byte_limit_drops_the_overflowing_page(query_pages):
+  batches = _batches([4, 4, 4])
+  rows = _FakeRows(batches)
+
+  pages, stats = query_pages(rows, max_bytes=batches[0].nbytes * 2 + 1)
+
+  assert [len(page) for page in pages] == [4, 4]
+  assert stats["bytes"] == batches[0].nbytes + batches[1].nbytes
+  assert stats["truncated"]
+
+
+def test_cached_results_are_sliced_into_pages(query_pages):
+  table = pa.Table.from_batches(_batches([25]))
+  rows = _FakeRows([])
+
+  pages, stats = query_pages(rows, cached=table, page_size=10, max_rows=22)
+
+  assert [len(page) for page in pages] == [10, 10, 2]
+  assert stats["cost"] == {"result_cache_hit": True}
+  assert rows.consumed == 0
@@ -0,0 +1,123 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Tests for the shared client registry and its pooled HTTP sessions."""
+
+import types
+from concurrent import futures
+
+import pytest
+
+pytest.importorskip("dotenv")
+requests = pytest.importorskip("requests")
+from requests import adapters
+
+from tokenaiser.tools import client_pool
+
+
+class _LocalAdapter(adapters.HTTPAdapter):
+  """Pooled adapter that answers every request locally."""
+
+  def __init__(self, *args, **kwargs):
+    super().__init__(*args, **kwargs)
+    self.sent = 0
+
+  def send(self, request, **kwargs):
+    self.sent += 1
+    response = requests.Response()
+    response.status_code = 200
+    response.request = request
+    response.url = request.url
+    response._content = b"{}"
+    return response
+
+
+class _Session(requests.Session):
+  """AuthorizedSession stand-in that needs no credentials."""
+
+  def __init__(self, credentials):
+    super().__init__()
+    self.credentials = credentials
+
+
+@pytest.fixture(name="registry")
+def _registry(monkeypatch):
+  monkeypatch.setattr(
+      client_pool,
+      "auth_requests",
+      types.SimpleNamespace(AuthorizedSession=_Session),
+  )
+  monkeypatch.setattr(
+      client_pool,
+      "auth_credentials",
+      types.SimpleNamespace(with_scopes_if_required=lambda c, scopes: c),
+  )
+  monkeypatch.setattr(
+      client_pool,
+      "requests_adapters",
+      types.SimpleNamespace(HTTPAdapter=_LocalAdapter),
+  )
+  registry = client_pool.ClientRegistry()
+  builds = []
+
+  def factory(project, location, credentials, pool_size):
+    session = client_pool.create_pooled_session(credentials, pool_size)
+    builds.append(session)
+    return types.SimpleNamespace(project=project, session=session)
+
+  registry.register("fake", factory)
+  registry.builds = builds
+  return registry
+
+
+def _tool_call(registry, project="p"):
+  """Fetch the shared client and send one request, as a tool would."""
+  client = registry.get("fake", project=project, credentials="creds")
+  client.session.get("https://storage.googleapis.com/storage/v1/b/bucket")
+  return client
+
+
+def test_repeated_calls_reuse_one_client_per_key(registry):
+  with futures.ThreadPoolExecutor(max_workers=8) as pool:
+    clients = list(pool.map(lambda _: _tool_call(registry), range(200)))
+
+  assert len(registry.builds) == 1
+  assert all(client is clients[0] for client in clients)
+  adapter = clients[0].session.get_adapter("https://storage.googleapis.com")
+  assert adapter.sent == 200
+
+  other = _tool_call(registry, project="q")
+  assert other is not clients[0]
+  assert len(registry.builds) == 2
+
+
+def test_pooled_session_mounts_pool_adapter(registry, monkeypatch):
+  monkeypatch.setattr(client_pool.config, "http_pool_size", 7)
+  session = _tool_call(registry).session
+
+  adapter = session.get_adapter("https://bigquery.googleapis.com")
+  assert isinstance(adapter, _LocalAdapter)
+  assert adapter._pool_connections == 7
+  assert adapter._pool_maxsize == 7
+
+  explicit = client_pool.create_pooled_session("creds", pool_size=3)
+  adapter = explicit.get_adapter("https://dataform.googleapis.com")
+  assert adapter._pool_maxsize == 3
+
+
+def test_evicted_client_is_rebuilt(registry):
+  first = _tool_call(registry)
+  registry.evict(("fake", "p", None, "creds"))
+
+  assert _tool_call(registry) is not first
+  assert len(registry.builds) == 2
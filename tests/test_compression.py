@@ -0,0 +1,50 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Tests for compression detection and streaming decompression."""
+
+import gzip
+import io
+
+import pytest
+
+from tokenaiser.tools import compression
+
+
+@pytest.mark.parametrize(
+    "name, encoding, expected",
+    [
+        ("data.csv", None, None),
+        ("data.csv", "identity", None),
+        ("data.csv", "gzip", "gzip"),
+        ("data.csv", " X-GZIP ", "gzip"),
+        ("data.csv", "zstd", "zstd"),
+        ("data.csv.gz", None, "gzip"),
+        ("data.csv.zst", "", "zstd"),
+    ],
+)
+def test_detect_compression(name, encoding, expected):
+  assert compression.detect_compression(name, encoding) == expected
+
+
+@pytest.mark.parametrize("encoding", ["br", "deflate", "gzip, br"])
+def test_unsupported_content_encoding_is_rejected(encoding):
+  with pytest.raises(ValueError, match="Unsupported content encoding"):
+    compression.detect_compression("data.csv.gz", encoding)
+
+
+def test_open_decompressed_streams_gzip_lines():
+  raw = io.BytesIO(gzip.compress(b"a\nb\n") + gzip.compress(b"c\n"))
+
+  with compression.open_decompressed(raw, "gzip") as stream:
+    assert list(stream) == [b"a\n", b"b\n", b"c\n"]
@@ -0,0 +1,109 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Tests for the Dataform action dependency graph."""
+
+import pytest
+
+pytest.importorskip("dotenv")
+
+from tokenaiser.tools import dataform_dag
+
+
+def _graph(edges, hashes=None):
+  """Build a graph from {target: [dependencies]}; hashes default to "h"."""
+  hashes = hashes or {}
+  return {
+      target: {
+          "type": "relation",
+          "file_path": f"{target}.sqlx",
+          "depends_on": deps,
+          "sql_hash": hashes.get(target, "h"),
+          "ref": None,
+      }
+      for target, deps in edges.items()
+  }
+
+
+def _assert_ordered(order, graph):
+  position = {target: i for i, target in enumerate(order)}
+  for target, node in graph.items():
+    for dep in node["depends_on"]:
+      if dep in position and target in position:
+        assert position[dep] < position[target], (dep, target)
+
+
+def test_topological_order_places_dependencies_first():
+  graph = _graph({
+      "report": ["orders", "customers"],
+      "orders": ["raw_orders"],
+      "customers": [],
+      "raw_orders": [],
+  })
+
+  order = dataform_dag.topological_order(graph)
+
+  assert sorted(order) == sorted(graph)
+  _assert_ordered(order, graph)
+
+
+def test_topological_order_ignores_external_dependencies_and_cycles():
+  graph = _graph({"a": ["b", "external"], "b": ["a"], "c": []})
+
+  order = dataform_dag.topological_order(graph)
+
+  assert sorted(order) == ["a", "b", "c"]
+
+
+def test_downstream_of_selects_transitive_dependents_in_run_order():
+  graph = _graph({
+      "raw": [],
+      "clean": ["raw"],
+      "report": ["clean"],
+      "other": [],
+      "mixed": ["other", "clean"],
+  })
+
+  selected = dataform_dag.downstream_of(graph, ["clean", "unknown"])
+
+  assert set(selected) == {"clean", "report", "mixed"}
+  _assert_ordered(selected, graph)
+
+
+def test_changed_targets_reports_new_and_changed_runnable_targets():
+  graph = _graph(
+      {"same": [], "edited": ["same"], "new": [], "declared": []},
+      hashes={"edited": "h2", "declared": None},
+  )
+
+  changed = dataform_dag.changed_targets(
+      graph, {"same": "h", "edited": "h1", "declared": "x"}
+  )
+
+  assert sorted(changed) == ["edited", "new"]
+
+
+def test_unreadable_state_is_no_baseline(tmp_path, monkeypatch):
+  monkeypatch.setattr(dataform_dag, "_STATE_DIR", str(tmp_path))
+  graph = _graph({"a": []})
+
+  dataform_dag.save_invoked_state("ws", graph, "inv-1")
+  assert dataform_dag.load_invoked_state("ws") == {
+      "hashes": {"a": "h"},
+      "workflow_invocation": "inv-1",
+  }
+
+  with open(dataform_dag._state_path("ws"), "w", encoding="utf-8") as f:
+    f.write('{"hashes": {"a"')
+  assert dataform_dag.load_invoked_state("ws") is None
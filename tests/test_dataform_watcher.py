@@ -0,0 +1,95 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Tests for the Dataform workflow invocation watcher."""
+
+import pytest
+
+dataform_v1 = pytest.importorskip("google.cloud.dataform_v1")
+
+from google.protobuf import timestamp_pb2
+from google.type import interval_pb2
+from tokenaiser.tools import dataform_watcher
+
+_NAME = "projects/p/locations/l/repositories/r/workflowInvocations/i"
+
+
+class _FakeClient:
+  """Serves a fixed invocation and its actions."""
+
+  def __init__(self, state, actions):
+    self.invocation = dataform_v1.WorkflowInvocation(name=_NAME, state=state)
+    self.actions = actions
+
+  def get_workflow_invocation(self, request):
+    del request
+    return self.invocation
+
+  def query_workflow_invocation_actions(self, request):
+    del request
+    return self.actions
+
+
+def _action(name, state, start_seconds=None, end_seconds=None):
+  timing = interval_pb2.Interval()
+  if start_seconds is not None:
+    timing.start_time.CopyFrom(timestamp_pb2.Timestamp(seconds=start_seconds))
+  if end_seconds is not None:
+    timing.end_time.CopyFrom(timestamp_pb2.Timestamp(seconds=end_seconds))
+  return dataform_v1.WorkflowInvocationAction(
+      target=dataform_v1.Target(database="p", schema="s", name=name),
+      state=state,
+      invocation_timing=timing,
+  )
+
+
+def test_polls_action_timings():
+  action_state = dataform_v1.WorkflowInvocationAction.State
+  client = _FakeClient(
+      dataform_v1.WorkflowInvocation.State.SUCCEEDED,
+      [
+          _action("a", action_state.SUCCEEDED, 1_700_000_000, 1_700_000_012),
+          _action("b", action_state.SKIPPED),
+      ],
+  )
+  watcher = dataform_watcher.InvocationWatcher(lambda: client, _NAME)
+
+  assert watcher.start().wait(5)
+  report = watcher.report()
+
+  assert report["status"] == "success"
+  assert report["error"] is None
+  assert report["polls"] == 1
+  actions = {a["target"]: a for a in report["actions"]}
+  assert actions["p.s.a"]["state"] == "SUCCEEDED"
+  assert actions["p.s.a"]["start_time"] == "2023-11-14T22:13:20+00:00"
+  assert actions["p.s.a"]["end_time"] == "2023-11-14T22:13:32+00:00"
+  assert actions["p.s.a"]["duration_ms"] == 12_000
+  assert actions["p.s.b"]["start_time"] is None
+  assert actions["p.s.b"]["duration_ms"] is None
+
+
+def test_unexpected_error_is_reported_and_watcher_replaced():
+  def broken_client():
+    raise RuntimeError("boom")
+
+  watcher = dataform_watcher.watch_invocation(broken_client, _NAME + "-x")
+
+  assert watcher.wait(5)
+  report = watcher.report()
+  assert report["status"] == "error"
+  assert "boom" in report["error_message"]
+  assert dataform_watcher.watch_invocation(broken_client, _NAME + "-x") is not (
+      watcher
+  )
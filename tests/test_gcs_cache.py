@@ -0,0 +1,109 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Tests for the GCS object cache under concurrent eviction."""
+
+import os
+import types
+
+import pytest
+
+pytest.importorskip("dotenv")
+
+from tokenaiser.tools import gcs_cache
+from tokenaiser.tools import ingestion_tools
+
+
+class _FakeBlob:
+  """Blob whose downloads copy bytes from memory."""
+
+  def __init__(self, data, name="data.csv"):
+    self.bucket = types.SimpleNamespace(name="bucket")
+    self.name = name
+    self.data = data
+    self.size = len(data)
+    self.generation = 3
+    self.md5_hash = None
+    self.content_encoding = None
+    self.content_type = "text/csv"
+    self.downloads = 0
+
+  def download_to_filename(self, filename, raw_download, if_generation_match):
+    self.downloads += 1
+    with open(filename, "wb") as f:
+      f.write(self.data)
+
+
+@pytest.fixture(name="cache")
+def _cache(tmp_path, monkeypatch):
+  cache = gcs_cache.GCSObjectCache(str(tmp_path / "gcs"), 10**9)
+  monkeypatch.setattr(ingestion_tools, "GCS_CACHE", cache)
+  monkeypatch.setattr(
+      ingestion_tools, "_GCS_SPILL_DIR", str(tmp_path / "fetch_gcs")
+  )
+  return cache
+
+
+def test_cached_object_survives_eviction(cache):
+  blob = _FakeBlob(b"a,b\n1,2\n")
+
+  with cache.fetch(blob) as cached:
+    os.remove(cached.path)
+    with cached.open() as stream:
+      assert stream.read() == blob.data
+    with cached.view() as view:
+      assert bytes(view) == blob.data
+
+
+def test_lookup_after_eviction_is_a_miss(cache):
+  blob = _FakeBlob(b"x\n")
+  cache.fetch(blob).close()
+  os.remove(cache._entry_path(blob))
+
+  assert cache.lookup(blob) is None
+
+
+def test_fetch_downloads_again_when_evicted_before_opening(cache, monkeypatch):
+  blob = _FakeBlob(b"x\n")
+  evictions = []
+
+  def evict_once(directory, max_bytes, keep=None):
+    if not evictions:
+      evictions.append(keep)
+      os.remove(keep)
+    return 0
+
+  monkeypatch.setattr(gcs_cache, "enforce_byte_budget", evict_once)
+
+  with cache.fetch(blob) as cached:
+    with cached.open() as stream:
+      assert stream.read() == blob.data
+  assert blob.downloads == 2
+
+
+def test_large_objects_are_handed_out_as_spills(cache, monkeypatch):
+  monkeypatch.setattr(ingestion_tools, "_INLINE_MAX_BYTES", 4)
+  blob = _FakeBlob(b"a,b\n1,2\n3,4\n")
+  bucket = types.SimpleNamespace(get_blob=lambda path: blob)
+  client = types.SimpleNamespace(bucket=lambda name: bucket)
+  monkeypatch.setattr(ingestion_tools, "get_gcs_client", lambda: client)
+
+  result = ingestion_tools.fetch_gcs("bucket", blob.name)
+
+  path = result["local_path"]
+  assert path.startswith(ingestion_tools._GCS_SPILL_DIR)
+  os.remove(cache._entry_path(blob))
+  with open(path, "rb") as f:
+    assert f.read() == blob.data
+  # The spill is reused for the same generation.
+  assert ingestion_tools.fetch_gcs("bucket", blob.name)["local_path"] == path
@@ -0,0 +1,170 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Tests and a throughput benchmark for sliced and ranged GCS downloads."""
+
+import os
+import threading
+import time
+import types
+
+import pytest
+
+pytest.importorskip("dotenv")
+
+from tokenaiser.tools import gcs_cache
+from tokenaiser.tools import gcs_tools
+from tokenaiser.tools import gcs_transfer
+
+# Simulated round trip of one range request to the fake server.
+_LATENCY_SECONDS = 0.02
+
+
+class _FakeBlob:
+  """Blob served by an in-memory "server" that answers byte-range reads."""
+
+  def __init__(self, data, name="data.txt", latency=0.0, short_reads=False):
+    self.bucket = types.SimpleNamespace(name="bucket")
+    self.name = name
+    self.data = data
+    self.size = len(data)
+    self.generation = 7
+    self.md5_hash = None
+    self.crc32c = None
+    self.content_encoding = None
+    self.content_type = "text/plain"
+    self.time_created = None
+    self.updated = None
+    self.latency = latency
+    self.short_reads = short_reads
+    self.ranges = []
+    self._lock = threading.Lock()
+
+  def download_as_bytes(
+      self,
+      start=None,
+      end=None,
+      raw_download=False,
+      if_generation_match=None,
+      checksum="md5",
+  ):
+    assert raw_download
+    assert if_generation_match in (None, self.generation)
+    with self._lock:
+      self.ranges.append((start, end))
+    time.sleep(self.latency)
+    data = self.data[start : end + 1]
+    return data[:-1] if self.short_reads else data
+
+
+def _lines(count):
+  return b"".join(b"line %06d\n" % i for i in range(count))
+
+
+def test_sliced_download_assembles_every_slice(tmp_path):
+  blob = _FakeBlob(os.urandom(100_000))
+  target = str(tmp_path / "out")
+
+  size = gcs_transfer.download_sliced_to_filename(
+      blob, target, chunk_size=4096, max_workers=4
+  )
+
+  assert size == blob.size
+  with open(target, "rb") as f:
+    assert f.read() == blob.data
+  assert sorted(blob.ranges) == [
+      (start, min(start + 4096, blob.size) - 1)
+      for start in range(0, blob.size, 4096)
+  ]
+
+
+def test_sliced_download_rejects_short_slices(tmp_path):
+  blob = _FakeBlob(os.urandom(10_000), short_reads=True)
+
+  with pytest.raises(ValueError, match="Short read"):
+    gcs_transfer.download_sliced_to_filename(
+        blob, str(tmp_path / "out"), chunk_size=4096
+    )
+
+
+def test_open_sliced_returns_rewound_handle():
+  blob = _FakeBlob(_lines(1000))
+
+  with gcs_transfer.open_sliced(blob, chunk_size=1000) as handle:
+    assert handle.read() == blob.data
+
+
+def test_range_stream_grows_ranges(monkeypatch):
+  monkeypatch.setattr(gcs_tools, "_RANGE_CHUNK_SIZE", 100)
+  monkeypatch.setattr(gcs_tools, "_MAX_RANGE_CHUNK_SIZE", 400)
+  blob = _FakeBlob(_lines(200))
+
+  read_range = gcs_tools._blob_range_reader(blob)
+  stream = gcs_tools._RangeStream(read_range, blob.size)
+  assert stream.read() == blob.data
+
+  sizes = [end - start + 1 for start, end in blob.ranges]
+  assert sizes[:4] == [100, 200, 400, 400]
+  assert stream.bytes_read == blob.size
+
+
+@pytest.fixture(name="read_full")
+def _read_full(monkeypatch, tmp_path):
+  """Run the full-read mode of `read_gcs_file_tool` against a fake blob."""
+  # An empty cache forces the uncached transfer paths.
+  monkeypatch.setattr(
+      gcs_tools, "GCS_CACHE", gcs_cache.GCSObjectCache(str(tmp_path), 0)
+  )
+  monkeypatch.setattr(gcs_tools.config, "gcs_sliced_chunk_size", 1000)
+  monkeypatch.setattr(gcs_tools, "_RANGE_CHUNK_SIZE", 1000)
+
+  def read_full(blob, threshold):
+    monkeypatch.setattr(gcs_tools.config, "gcs_sliced_threshold", threshold)
+    bucket = types.SimpleNamespace(get_blob=lambda path: blob)
+    client = types.SimpleNamespace(bucket=lambda name: bucket)
+    monkeypatch.setattr(gcs_tools, "get_gcs_client", lambda: client)
+    return gcs_tools.read_gcs_file_tool("bucket", blob.name, mode="full")
+
+  return read_full
+
+
+@pytest.mark.parametrize("threshold", [1, 10**9], ids=["sliced", "ranged"])
+def test_full_read_streams_lines(read_full, threshold):
+  blob = _FakeBlob(_lines(5000))
+
+  result = read_full(blob, threshold)
+
+  assert result["status"] == "success"
+  assert result["num_lines"] == 5000
+  assert result["content"] == blob.data.decode().rstrip("\n")
+  assert result["bytes_read"] == blob.size
+  assert len(blob.ranges) > 1
+
+
+def test_sliced_throughput_beats_serial_reads(tmp_path):
+  """Benchmark: concurrent slices hide the per-request latency."""
+  data = os.urandom(64 * 1024)
+
+  def download(max_workers):
+    blob = _FakeBlob(data, latency=_LATENCY_SECONDS)
+    start = time.perf_counter()
+    gcs_transfer.download_sliced_to_filename(
+        blob, str(tmp_path / f"out{max_workers}"), 4096, max_workers
+    )
+    return time.perf_counter() - start
+
+  serial = download(1)
+  sliced = download(8)
+
+  # 16 slices: about 16 round trips serially against 2 with 8 workers.
+  assert sliced < serial / 3
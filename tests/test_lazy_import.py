@@ -0,0 +1,70 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Import-time benchmark of the tool package."""
+
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+pytest.importorskip("dotenv")
+
+# Seconds importing the package and every tool module may take.
+_IMPORT_BUDGET_SECONDS = 1.0
+
+_CHECKOUT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Runs in a fresh interpreter, so that nothing imported by pytest or other
+# tests counts.
+_SCRIPT = """
+import importlib, json, sys, time, types
+
+package = types.ModuleType("tokenaiser")
+package.__path__ = [sys.argv[1]]
+sys.modules["tokenaiser"] = package
+
+start = time.perf_counter()
+import tokenaiser.tools
+for name in tokenaiser.tools._MODULES:
+  importlib.import_module(f"tokenaiser.tools.{name}")
+seconds = time.perf_counter() - start
+
+heavy = sorted(
+    name
+    for name in sys.modules
+    if name.split(".")[0] in ("google", "pyarrow", "requests")
+)
+print(json.dumps({"seconds": seconds, "heavy": heavy}))
+"""
+
+
+def _import_tools():
+  output = subprocess.run(
+      [sys.executable, "-c", _SCRIPT, _CHECKOUT],
+      check=True,
+      capture_output=True,
+      text=True,
+  ).stdout
+  return json.loads(output.splitlines()[-1])
+
+
+def test_importing_tools_loads_no_cloud_sdks():
+  assert _import_tools()["heavy"] == []
+
+
+def test_importing_tools_stays_within_budget():
+  assert _import_tools()["seconds"] < _IMPORT_BUDGET_SECONDS
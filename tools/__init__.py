@@ -12,67 +12,163 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-from .bigquery_tools import *
-from .dataform_tools import *
-from .gcs_tools import *
-from .ingestion_tools import *
-from .pra_tools import *
-from .integration_tools import *
-from .audit_tools import *
-from .ds_tools import *
-from .crm import *
-from .callbacks import *
+"""Agent tools, imported lazily.
 
-__all__ = [
+Importing this package does not import any tool module. Each tool is resolved
+from its module on first attribute access, so that the cloud SDKs the tool
+modules depend on are only loaded once a tool is actually used.
+"""
+
+import importlib
+import importlib.util
+from typing import TYPE_CHECKING, Any, List
+
+if TYPE_CHECKING:
+  from .bigquery_tools import *
+  from .dataform_tools import *
+  from .gcs_tools import *
+  from .gcs_index import *
+  from .ingestion_tools import *
+  from .pra_tools import *
+  from .integration_tools import *
+  from .audit_tools import *
+  from .ds_tools import *
+  from .crm import *
+  from .callbacks import *
+  from .async_tools import *
+
+# Tool modules whose public names the package exports. On a name clash the
+# module listed last wins.
+_MODULES = (
+    'bigquery_tools',
+    'dataform_tools',
+    'gcs_tools',
+    'gcs_index',
+    'ingestion_tools',
+    'pra_tools',
+    'integration_tools',
+    'audit_tools',
+    'ds_tools',
+    'crm',
+    'callbacks',
+    'async_tools',
+)
+
+# Agent tools and the module defining each of them.
+_TOOLS = {
     # Dataform tools
-    'write_file_to_dataform',
-    'compile_dataform',
-    'get_dataform_execution_logs',
-    'search_files_in_dataform',
-    'read_file_from_dataform',
-    'get_udf_sp_tool',
+    'write_file_to_dataform': 'dataform_tools',
+    'delete_file_from_dataform': 'dataform_tools',
+    'sync_files_to_dataform': 'dataform_tools',
+    'compile_dataform': 'dataform_tools',
+    'get_dataform_execution_logs': 'dataform_tools',
+    'execute_dataform_workflow': 'dataform_tools',
+    'wait_for_dataform_workflow': 'dataform_tools',
+    'search_files_in_dataform': 'dataform_tools',
+    'read_file_from_dataform': 'dataform_tools',
+    'get_udf_sp_tool': 'bigquery_tools',
     # BigQuery tools
-    'bigquery_job_details_tool',
-    'validate_table_data',
-    'sample_table_data_tool',
+    'bigquery_job_details_tool': 'bigquery_tools',
+    'bigquery_jobs_status_tool': 'bigquery_tools',
+    'validate_table_data': 'bigquery_tools',
+    'sample_table_data_tool': 'bigquery_tools',
+    'lookup_table_tool': 'bigquery_tools',
+    'refresh_catalog_tool': 'bigquery_tools',
+    'get_query_budget_tool': 'bigquery_tools',
     # GCS tools
-    'validate_bucket_exists_tool',
-    'validate_file_exists_tool',
-    'list_bucket_files_tool',
-    'read_gcs_file_tool',
+    'validate_bucket_exists_tool': 'gcs_tools',
+    'validate_file_exists_tool': 'gcs_tools',
+    'validate_files_exist_tool': 'gcs_tools',
+    'list_bucket_files_tool': 'gcs_tools',
+    'read_gcs_file_tool': 'gcs_tools',
+    'search_bucket_index_tool': 'gcs_index',
     # Ingestion tools
-    'fetch_apigee',
-    'fethc_apigee',  # Alias for typo in YAML
-    'query_bq',
-    'fetch_pub',
-    'fetch_Snowflake',
-    'fetch_crm',
+    'fetch_apigee': 'ingestion_tools',
+    'fethc_apigee': 'ingestion_tools',  # Alias for typo in YAML
+    'query_bq': 'ingestion_tools',
+    'fetch_gcs': 'ingestion_tools',
+    'fetch_pub': 'ingestion_tools',
+    'fetch_Snowflake': 'ingestion_tools',
+    'fetch_crm': 'crm',
     # PRA tools
-    'unipath_process_doc',
-    'unipath_data_frame',
+    'unipath_process_doc': 'pra_tools',
+    'unipath_data_frame': 'pra_tools',
     # Integration tools
-    'mock_boomi',
-    'merge_csv',
-    'normalize_json',
-    'clean_dates',
-    'deduplicate',
-    'map_schema',
-    'filter_fields',
-    'transform_numeric',
-    'validate_data',
+    'mock_boomi': 'integration_tools',
+    'merge_csv': 'integration_tools',
+    'normalize_json': 'integration_tools',
+    'clean_dates': 'integration_tools',
+    'deduplicate': 'integration_tools',
+    'map_schema': 'integration_tools',
+    'filter_fields': 'integration_tools',
+    'transform_numeric': 'integration_tools',
+    'validate_data': 'integration_tools',
     # Audit tools
-    'audit_sth',
-    'involved_human',
-    'schema_diff',
-    'exit_loop',
+    'audit_sth': 'audit_tools',
+    'involved_human': 'audit_tools',
+    'schema_diff': 'audit_tools',
+    'exit_loop': 'audit_tools',
     # DS tools
-    'insert_into_bigquery',
-    'insert_into_gcs',
-    'insert_into_nosql',
-    'insert_into_sql',
-    'logging_sth',
-    'trigger_sth',
+    'insert_into_bigquery': 'ds_tools',
+    'insert_into_gcs': 'ds_tools',
+    'insert_into_nosql': 'ds_tools',
+    'insert_into_sql': 'ds_tools',
+    'logging_sth': 'ds_tools',
+    'trigger_sth': 'ds_tools',
     # Callbacks
-    'ops_tracing',
-    'failure_alert',
-]
+    'ops_tracing': 'callbacks',
+    'failure_alert': 'callbacks',
+    # Async tools
+    'validate_bucket_exists_tool_async': 'async_tools',
+    'validate_file_exists_tool_async': 'async_tools',
+    'validate_files_exist_tool_async': 'async_tools',
+    'list_bucket_files_tool_async': 'async_tools',
+    'read_gcs_file_tool_async': 'async_tools',
+    'search_bucket_index_tool_async': 'async_tools',
+    'fetch_gcs_async': 'async_tools',
+    'bigquery_job_details_tool_async': 'async_tools',
+    'bigquery_jobs_status_tool_async': 'async_tools',
+    'get_udf_sp_tool_async': 'async_tools',
+    'validate_table_data_async': 'async_tools',
+    'sample_table_data_tool_async': 'async_tools',
+    'lookup_table_tool_async': 'async_tools',
+    'refresh_catalog_tool_async': 'async_tools',
+    'query_bq_async': 'async_tools',
+    'write_file_to_dataform_async': 'async_tools',
+    'delete_file_from_dataform_async': 'async_tools',
+    'sync_files_to_dataform_async': 'async_tools',
+    'compile_dataform_async': 'async_tools',
+    'read_file_from_dataform_async': 'async_tools',
+    'search_files_in_dataform_async': 'async_tools',
+    'get_dataform_execution_logs_async': 'async_tools',
+    'execute_dataform_workflow_async': 'async_tools',
+    'wait_for_dataform_workflow_async': 'async_tools',
+}
+
+__all__ = list(_TOOLS)
+
+
+def _find(name: str) -> Any:
+  if name in _TOOLS:
+    module = importlib.import_module(f'.{_TOOLS[name]}', __name__)
+    return getattr(module, name)
+  if importlib.util.find_spec(f'{__name__}.{name}') is not None:
+    return importlib.import_module(f'.{name}', __name__)
+  # Other public names of the tool modules, as the star imports exported.
+  for module_name in reversed(_MODULES):
+    module = importlib.import_module(f'.{module_name}', __name__)
+    if hasattr(module, name):
+      return getattr(module, name)
+  raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+
+
+def __getattr__(name: str) -> Any:
+  if name.startswith('_'):
+    raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+  value = _find(name)
+  globals()[name] = value
+  return value
+
+
+def __dir__() -> List[str]:
+  return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,213 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""This module provides async variants of the GCS, BigQuery and Dataform tools.
+
+Each `<tool>_async` coroutine has the signature and docstring of its blocking
+counterpart and runs it on a shared thread pool, so that several tool calls
+issued in one agent turn overlap their network waits instead of running one
+after another. The number of tool calls in flight is bounded per event loop by
+`config.async_tool_concurrency`. The pooled clients of the client registry are
+thread-safe and shared by all of them.
+
+ADK awaits tools that are coroutine functions on its event loop, so agent
+configs list the `_async` variants in place of the blocking tools, e.g.
+`tokenaiser.tools.async_tools.read_gcs_file_tool_async`.
+"""
+
+import asyncio
+import concurrent.futures
+import contextvars
+import functools
+import threading
+import time
+import weakref
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Awaitable,
+    Callable,
+    Dict,
+    Optional,
+    TypeVar,
+)
+
+from ..config import config
+from . import (
+    bigquery_tools,
+    dataform_tools,
+    gcs_index,
+    gcs_tools,
+    ingestion_tools,
+)
+from .dataform_watcher import watch_invocation
+from .lazy_import import lazy_import
+
+if TYPE_CHECKING:
+  from google.api_core import exceptions as api_exceptions
+else:
+  api_exceptions = lazy_import("google.api_core.exceptions")
+
+_T = TypeVar("_T")
+
+# Seconds between checks of a watched Dataform workflow invocation.
+_WORKFLOW_CHECK_INTERVAL = 0.5
+
+# Event loop -> semaphore bounding the tool calls running on it.
+_SEMAPHORES: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+_EXECUTOR: Optional[concurrent.futures.ThreadPoolExecutor] = None
+_LOCK = threading.Lock()
+
+
+def _loop_semaphore() -> asyncio.Semaphore:
+  """Return the semaphore bounding tool calls on the running event loop."""
+  loop = asyncio.get_running_loop()
+  with _LOCK:
+    semaphore = _SEMAPHORES.get(loop)
+    if semaphore is None:
+      semaphore = asyncio.Semaphore(max(1, config.async_tool_concurrency))
+      _SEMAPHORES[loop] = semaphore
+    return semaphore
+
+
+def _executor() -> concurrent.futures.ThreadPoolExecutor:
+  global _EXECUTOR
+  with _LOCK:
+    if _EXECUTOR is None:
+      _EXECUTOR = concurrent.futures.ThreadPoolExecutor(
+          max_workers=max(1, config.async_tool_concurrency),
+          thread_name_prefix="tokenaiser-tool",
+      )
+    return _EXECUTOR
+
+
+async def run_blocking(
+    func: Callable[..., _T], *args: Any, **kwargs: Any
+) -> _T:
+  """Run a blocking function on the tool thread pool and await its result.
+
+  The call waits for a slot of the running loop's concurrency limit first, and
+  runs with a copy of the caller's context variables. Cancelling the awaiting
+  task does not interrupt a call that has already started.
+  """
+  async with _loop_semaphore():
+    context = contextvars.copy_context()
+    call = functools.partial(context.run, func, *args, **kwargs)
+    return await asyncio.get_running_loop().run_in_executor(_executor(), call)
+
+
+def _as_variant(
+    func: Callable[..., _T], variant: Callable[..., Awaitable[_T]]
+) -> Callable[..., Awaitable[_T]]:
+  """Give a coroutine function the signature, docstring and name of a tool."""
+  functools.update_wrapper(variant, func)
+  variant.__name__ = variant.__qualname__ = f"{func.__name__}_async"
+  variant.__module__ = __name__
+  return variant
+
+
+def _async_variant(func: Callable[..., _T]) -> Callable[..., Awaitable[_T]]:
+  """Wrap a blocking tool as a coroutine function running it on the pool."""
+
+  async def variant(*args: Any, **kwargs: Any) -> _T:
+    return await run_blocking(func, *args, **kwargs)
+
+  return _as_variant(func, variant)
+
+
+# GCS tools
+validate_bucket_exists_tool_async = _async_variant(
+    gcs_tools.validate_bucket_exists_tool
+)
+validate_file_exists_tool_async = _async_variant(
+    gcs_tools.validate_file_exists_tool
+)
+validate_files_exist_tool_async = _async_variant(
+    gcs_tools.validate_files_exist_tool
+)
+list_bucket_files_tool_async = _async_variant(gcs_tools.list_bucket_files_tool)
+read_gcs_file_tool_async = _async_variant(gcs_tools.read_gcs_file_tool)
+search_bucket_index_tool_async = _async_variant(
+    gcs_index.search_bucket_index_tool
+)
+fetch_gcs_async = _async_variant(ingestion_tools.fetch_gcs)
+
+# BigQuery tools
+bigquery_job_details_tool_async = _async_variant(
+    bigquery_tools.bigquery_job_details_tool
+)
+bigquery_jobs_status_tool_async = _async_variant(
+    bigquery_tools.bigquery_jobs_status_tool
+)
+get_udf_sp_tool_async = _async_variant(bigquery_tools.get_udf_sp_tool)
+validate_table_data_async = _async_variant(bigquery_tools.validate_table_data)
+sample_table_data_tool_async = _async_variant(
+    bigquery_tools.sample_table_data_tool
+)
+lookup_table_tool_async = _async_variant(bigquery_tools.lookup_table_tool)
+refresh_catalog_tool_async = _async_variant(
+    bigquery_tools.refresh_catalog_tool
+)
+query_bq_async = _async_variant(ingestion_tools.query_bq)
+
+# Dataform tools
+write_file_to_dataform_async = _async_variant(
+    dataform_tools.write_file_to_dataform
+)
+delete_file_from_dataform_async = _async_variant(
+    dataform_tools.delete_file_from_dataform
+)
+sync_files_to_dataform_async = _async_variant(
+    dataform_tools.sync_files_to_dataform
+)
+compile_dataform_async = _async_variant(dataform_tools.compile_dataform)
+read_file_from_dataform_async = _async_variant(
+    dataform_tools.read_file_from_dataform
+)
+search_files_in_dataform_async = _async_variant(
+    dataform_tools.search_files_in_dataform
+)
+get_dataform_execution_logs_async = _async_variant(
+    dataform_tools.get_dataform_execution_logs
+)
+execute_dataform_workflow_async = _async_variant(
+    dataform_tools.execute_dataform_workflow
+)
+
+
+async def _wait_for_dataform_workflow(
+    workflow_invocation_id: str, timeout_seconds: float = 300, since: int = 0
+) -> Dict[str, Any]:
+  # The invocation is polled by its background watcher, so waiting for it
+  # only sleeps on the loop and holds neither a thread nor a slot.
+  try:
+    watcher = watch_invocation(
+        dataform_tools.get_dataform_client, workflow_invocation_id
+    )
+  except api_exceptions.GoogleAPIError as e:
+    error_msg = f"Error watching workflow '{workflow_invocation_id}': {e}"
+    print(error_msg)
+    return {"status": "error", "error_message": error_msg}
+  deadline = time.monotonic() + timeout_seconds
+  while not watcher.finished:
+    remaining = deadline - time.monotonic()
+    if remaining <= 0:
+      break
+    await asyncio.sleep(min(_WORKFLOW_CHECK_INTERVAL, remaining))
+  return watcher.report(since)
+
+
+wait_for_dataform_workflow_async = _as_variant(
+    dataform_tools.wait_for_dataform_workflow, _wait_for_dataform_workflow
+)
@@ -0,0 +1,274 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""This module provides a local catalog of BigQuery tables and schemas.
+
+Table metadata is bulk-loaded per dataset from the `__TABLES__` meta-table
+(which carries `last_modified_time`) and column metadata from
+`INFORMATION_SCHEMA.COLUMNS`, then kept in memory and optionally persisted to
+disk. Refreshes only reload the columns of tables whose last modification time
+changed. Name validation, fuzzy table lookup and schema retrieval are answered
+from memory, so tools can reject doomed queries before submitting a job.
+"""
+
+import difflib
+import json
+import os
+import re
+import threading
+import time
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional
+
+from ..config import config
+from .disk_cache import atomic_write
+from .lazy_import import lazy_import
+
+if TYPE_CHECKING:
+  from google.cloud import bigquery
+else:
+  bigquery = lazy_import("google.cloud.bigquery")
+
+_IDENTIFIER = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*$")
+
+
+class BigQueryCatalog:
+  """In-memory index of tables and columns for a set of datasets."""
+
+  def __init__(
+      self,
+      client_getter: Callable[[], "bigquery.Client"],
+      path: Optional[str] = None,
+      max_age_seconds: Optional[float] = None,
+  ):
+    """Create a catalog.
+
+    Args:
+        client_getter (Callable[[], bigquery.Client]): Returns the BigQuery
+          client used for metadata queries.
+        path (Optional[str]): File the catalog is persisted to and restored
+          from. No persistence if None.
+        max_age_seconds (Optional[float]): Age after which a dataset is
+          incrementally refreshed on access. Defaults to
+          `config.metadata_cache_ttl_seconds`.
+    """
+    self._client_getter = client_getter
+    self.path = path
+    self.max_age_seconds = (
+        config.metadata_cache_ttl_seconds
+        if max_age_seconds is None
+        else max_age_seconds
+    )
+    self._lock = threading.RLock()
+    # dataset -> {"refreshed_at": float, "tables": {table: entry}}
+    self._datasets: Dict[str, Dict[str, Any]] = {}
+    if path and os.path.exists(path):
+      # A damaged catalog file only costs a reload, never the tools.
+      try:
+        with open(path, "r", encoding="utf-8") as f:
+          datasets = json.load(f)
+        if not isinstance(datasets, dict):
+          raise ValueError("not a JSON object")
+        self._datasets = datasets
+      except (OSError, ValueError) as e:
+        print(f"Ignoring unreadable BigQuery catalog '{path}': {e}")
+        self._datasets = {}
+
+  def _save(self) -> None:
+    if not self.path:
+      return
+    with atomic_write(self.path) as tmp_path:
+      with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(self._datasets, f)
+
+  def _load_columns(
+      self, dataset_id: str, table_names: Optional[List[str]] = None
+  ) -> Dict[str, List[Dict[str, Any]]]:
+    """Load column metadata for some or all tables of a dataset."""
+    where = "WHERE table_name IN UNNEST(@table_names)" if table_names else ""
+    query = f"""
+        SELECT table_name, column_name, data_type, is_nullable
+        FROM `{config.project_id}.{dataset_id}.INFORMATION_SCHEMA.COLUMNS`
+        {where}
+        ORDER BY table_name, ordinal_position
+    """
+    job_config = bigquery.QueryJobConfig()
+    if table_names:
+      job_config.query_parameters = [
+          bigquery.ArrayQueryParameter("table_names", "STRING", table_names)
+      ]
+    columns: Dict[str, List[Dict[str, Any]]] = {}
+    rows = self._client_getter().query(query, job_config=job_config).result()
+    for row in rows:
+      columns.setdefault(row["table_name"], []).append({
+          "name": row["column_name"],
+          "data_type": row["data_type"],
+          "is_nullable": row["is_nullable"] == "YES",
+      })
+    return columns
+
+  def refresh(self, dataset_id: str) -> Dict[str, int]:
+    """Load a dataset, or incrementally refresh it if already loaded.
+
+    Only tables that are new or whose `last_modified_time` changed have their
+    columns reloaded; dropped tables are removed.
+
+    Returns:
+        Dict[str, int]: Counts of added, updated and removed tables.
+    """
+    query = f"""
+        SELECT table_id, type, last_modified_time, row_count, size_bytes
+        FROM `{config.project_id}.{dataset_id}.__TABLES__`
+    """
+    rows = list(self._client_getter().query(query).result())
+
+    with self._lock:
+      known = self._datasets.get(dataset_id, {}).get("tables", {})
+      tables = {}
+      changed = []
+      for row in rows:
+        name = row["table_id"]
+        entry = {
+            "table_type": {1: "TABLE", 2: "VIEW", 3: "EXTERNAL"}.get(
+                row["type"], str(row["type"])
+            ),
+            "last_modified": row["last_modified_time"],
+            "row_count": row["row_count"],
+            "size_bytes": row["size_bytes"],
+            "columns": known.get(name, {}).get("columns"),
+        }
+        if (
+            name not in known
+            or known[name]["last_modified"] != entry["last_modified"]
+        ):
+          changed.append(name)
+        tables[name] = entry
+      removed = len(set(known) - set(tables))
+
+    if changed:
+      # A full dataset load reads all columns at once instead of filtering.
+      columns = self._load_columns(dataset_id, changed if known else None)
+      for name in changed:
+        tables[name]["columns"] = columns.get(name, [])
+
+    with self._lock:
+      self._datasets[dataset_id] = {
+          "refreshed_at": time.time(),
+          "tables": tables,
+      }
+      self._save()
+
+    return {
+        "added": len([name for name in changed if name not in known]),
+        "updated": len([name for name in changed if name in known]),
+        "removed": removed,
+    }
+
+  def _dataset(
+      self, dataset_id: str, load: bool = False
+  ) -> Optional[Dict[str, Any]]:
+    """Return a dataset's tables, refreshing configured or stale datasets.
+
+    Datasets that are neither configured nor loaded yet are only loaded if
+    `load` is True; otherwise None is returned for them.
+    """
+    with self._lock:
+      entry = self._datasets.get(dataset_id)
+    if (
+        entry is None
+        and not load
+        and dataset_id not in config.bq_catalog_datasets
+    ):
+      return None
+    if (
+        entry is None
+        or time.time() - entry["refreshed_at"] > self.max_age_seconds
+    ):
+      self.refresh(dataset_id)
+    with self._lock:
+      return self._datasets[dataset_id]["tables"]
+
+  def get_schema(
+      self, dataset_id: str, table_id: str
+  ) -> Optional[List[Dict[str, Any]]]:
+    """Return the columns of a table, or None if the table does not exist.
+
+    A dataset that is not in the catalog yet is loaded on demand.
+    """
+    tables = self._dataset(dataset_id, load=True)
+    if table_id not in tables:
+      return None
+    return tables[table_id]["columns"]
+
+  def suggest_tables(
+      self, name: str, dataset_id: Optional[str] = None, limit: int = 5
+  ) -> List[str]:
+    """Fuzzy-match a table name against the catalog.
+
+    Args:
+        name (str): Table name, optionally qualified as "dataset.table".
+        dataset_id (Optional[str]): Restrict matches to this dataset.
+        limit (int): Maximum number of suggestions.
+
+    Returns:
+        List[str]: Closest "dataset.table" names, best first.
+    """
+    if dataset_id is not None:
+      self._dataset(dataset_id)
+    with self._lock:
+      candidates = {
+          f"{ds}.{table}": table
+          for ds, entry in self._datasets.items()
+          if dataset_id is None or ds == dataset_id
+          for table in entry["tables"]
+      }
+    needle = name.lower()
+    haystack = {
+        (key if "." in name else table).lower(): key
+        for key, table in candidates.items()
+    }
+    matches = difflib.get_close_matches(needle, haystack, n=limit, cutoff=0.5)
+    return [haystack[match] for match in matches]
+
+  def check_table(
+      self,
+      dataset_id: str,
+      table_id: str,
+      columns: Optional[List[str]] = None,
+  ) -> Optional[str]:
+    """Validate a table (and optionally column) reference against the catalog.
+
+    A dataset that is not in the catalog yet is loaded on first use. Only
+    plain column identifiers are checked, not expressions.
+
+    Returns:
+        Optional[str]: An error message with suggestions if the reference is
+        known to be invalid, otherwise None.
+    """
+    tables = self._dataset(dataset_id, load=True)
+    if table_id not in tables:
+      suggestions = self.suggest_tables(table_id, dataset_id)
+      hint = f" Did you mean: {', '.join(suggestions)}?" if suggestions else ""
+      return f"Table '{dataset_id}.{table_id}' does not exist.{hint}"
+    known_columns = {c["name"].lower() for c in tables[table_id]["columns"]}
+    missing = [
+        c
+        for c in columns or []
+        if c and _IDENTIFIER.match(c) and c.lower() not in known_columns
+    ]
+    if missing:
+      return (
+          f"Columns {missing} do not exist in '{dataset_id}.{table_id}'."
+          f" Available columns: {sorted(known_columns)}"
+      )
+    return None
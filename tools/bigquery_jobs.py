@@ -0,0 +1,166 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""This module provides concurrent status tracking for BigQuery jobs.
+
+Job metadata is fetched for many jobs at once through a bounded thread pool.
+Waiting for all or any of a set of jobs polls only the unfinished ones, with
+exponential backoff between rounds. Each status reports queue and execution
+time derived from the job's created/started/ended timestamps, and slot-ms.
+"""
+
+import concurrent.futures
+import time
+from datetime import datetime
+from typing import TYPE_CHECKING, Any, Dict, List, Optional
+
+from ..config import config
+from .lazy_import import lazy_import
+
+if TYPE_CHECKING:
+  from google.cloud import bigquery
+else:
+  bigquery = lazy_import("google.cloud.bigquery")
+
+_WAIT_MODES = ("all", "any")
+
+
+def _millis_between(
+    start: Optional[datetime], end: Optional[datetime]
+) -> Optional[int]:
+  if start is None or end is None:
+    return None
+  return int((end - start).total_seconds() * 1000)
+
+
+def job_status(job: Any) -> Dict[str, Any]:
+  """Summarize a job's state, timing and resource usage.
+
+  Args:
+      job (Any): BigQuery job of any type, with loaded metadata.
+
+  Returns:
+      Dict[str, Any]: State, error, timestamps, queue and execution time in
+      milliseconds, slot-ms and bytes processed.
+  """
+  error = job.error_result
+  return {
+      "job_id": job.job_id,
+      "job_type": job.job_type,
+      "state": job.state,
+      "error": error["message"] if error else None,
+      "created": job.created.isoformat() if job.created else None,
+      "started": job.started.isoformat() if job.started else None,
+      "ended": job.ended.isoformat() if job.ended else None,
+      "queue_ms": _millis_between(job.created, job.started),
+      "execution_ms": _millis_between(job.started, job.ended),
+      "slot_millis": getattr(job, "slot_millis", None),
+      "total_bytes_processed": getattr(job, "total_bytes_processed", None),
+  }
+
+
+def fetch_job_statuses(
+    client: "bigquery.Client", job_ids: List[str], max_workers: int = 16
+) -> List[Dict[str, Any]]:
+  """Fetch the status of many jobs concurrently.
+
+  Args:
+      client (bigquery.Client): Client to fetch the jobs with.
+      job_ids (List[str]): IDs of the jobs.
+      max_workers (int): Maximum number of concurrent requests. Defaults to 16.
+
+  Returns:
+      List[Dict[str, Any]]: One status per job, in input order. Jobs that could
+      not be fetched have state "UNKNOWN" and an error.
+  """
+
+  def fetch(job_id: str) -> Dict[str, Any]:
+    try:
+      return job_status(client.get_job(job_id))
+    except Exception as e:
+      return {"job_id": job_id, "state": "UNKNOWN", "error": str(e)}
+
+  workers = max(1, min(max_workers, config.http_pool_size, len(job_ids) or 1))
+  with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as pool:
+    return list(pool.map(fetch, job_ids))
+
+
+def _is_finished(status: Dict[str, Any]) -> bool:
+  # Jobs that cannot be fetched will not finish by polling them again.
+  return status["state"] in ("DONE", "UNKNOWN")
+
+
+def wait_for_jobs(
+    client: "bigquery.Client",
+    job_ids: List[str],
+    mode: str = "all",
+    timeout_seconds: float = 300,
+    initial_interval: float = 0.5,
+    max_interval: float = 10,
+    multiplier: float = 2,
+    max_workers: int = 16,
+) -> Dict[str, Any]:
+  """Poll jobs until all (or any) of them have finished.
+
+  Each round only fetches jobs that were still pending, and the interval
+  between rounds grows exponentially up to `max_interval`.
+
+  Args:
+      client (bigquery.Client): Client to fetch the jobs with.
+      job_ids (List[str]): IDs of the jobs.
+      mode (str): "all" waits for every job, "any" for the first one.
+      timeout_seconds (float): Give up after this many seconds.
+      initial_interval (float): Seconds between the first two rounds.
+      max_interval (float): Upper bound on the seconds between rounds.
+      multiplier (float): Factor the interval grows by after each round.
+      max_workers (int): Maximum number of concurrent requests per round.
+
+  Returns:
+      Dict[str, Any]: Job statuses in input order, the finished job IDs,
+      whether the wait timed out, and the number of polling rounds.
+  """
+  if mode not in _WAIT_MODES:
+    raise ValueError(f"Unknown wait mode: {mode}")
+
+  deadline = time.monotonic() + timeout_seconds
+  interval = initial_interval
+  statuses: Dict[str, Dict[str, Any]] = {}
+  pending = list(dict.fromkeys(job_ids))
+  rounds = 0
+  timed_out = False
+
+  while True:
+    rounds += 1
+    fetched = fetch_job_statuses(client, pending, max_workers)
+    statuses.update(zip(pending, fetched))
+    pending = [j for j in pending if not _is_finished(statuses[j])]
+    finished = len(statuses) - len(pending)
+
+    if not pending or (mode == "any" and finished):
+      break
+    remaining = deadline - time.monotonic()
+    if remaining <= 0:
+      timed_out = True
+      break
+    time.sleep(min(interval, remaining))
+    interval = min(interval * multiplier, max_interval)
+
+  return {
+      "mode": mode,
+      "jobs": [statuses[job_id] for job_id in job_ids],
+      "finished": [j for j in statuses if j not in pending],
+      "pending": pending,
+      "timed_out": timed_out,
+      "polls": rounds,
+  }
@@ -0,0 +1,319 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""This module provides a cost-guarded execution layer for BigQuery queries.
+
+Every query is dry-run first to estimate the bytes it will scan. The estimate
+is checked against a per-query and a per-session byte budget before the job is
+submitted, and the job itself is capped with `maximum_bytes_billed` so that an
+underestimate cannot turn into a runaway scan. Estimated and actual costs are
+returned alongside the results so tools can report them to the agent.
+
+Session budgets are kept per agent session: the `bind_query_budget` callback
+records the session of each tool call in a context variable, and queries run
+by that call are charged to it. Queries made outside an agent session share a
+process-wide budget. Budgets of sessions idle for
+`config.bq_session_budget_idle_seconds` are dropped.
+"""
+
+import contextvars
+import threading
+import time
+from typing import TYPE_CHECKING, Any, Dict, Optional, Tuple
+
+from ..config import config
+from .lazy_import import lazy_import
+
+if TYPE_CHECKING:
+  from google.cloud import bigquery
+else:
+  bigquery = lazy_import("google.cloud.bigquery")
+
+# BigQuery bills at least 10 MiB per referenced table, so a lower cap would
+# fail even trivial queries.
+_MIN_BYTES_BILLED = 10 * 1024**2
+
+
+def _format_bytes(num_bytes: int) -> str:
+  size = float(num_bytes)
+  for unit in ("B", "KiB", "MiB", "GiB", "TiB"):
+    if size < 1024 or unit == "TiB":
+      return f"{size:.1f} {unit}"
+    size /= 1024
+  return f"{size:.1f} TiB"
+
+
+class QueryBudgetExceeded(ValueError):
+  """Raised when a query's estimated scan exceeds a byte budget."""
+
+  def __init__(self, message: str, estimated_bytes: int, limit_bytes: int):
+    super().__init__(message)
+    self.estimated_bytes = estimated_bytes
+    self.limit_bytes = limit_bytes
+
+
+class QueryBudget:
+  """Per-query and per-session limits on the bytes scanned by queries.
+
+  Estimated bytes are reserved when a query is submitted and replaced by the
+  billed bytes once it finishes, so concurrent queries cannot jointly overrun
+  the session budget. A limit of 0 disables the corresponding check.
+  """
+
+  def __init__(self, max_bytes_per_query: int, max_bytes_per_session: int):
+    self.max_bytes_per_query = max_bytes_per_query
+    self.max_bytes_per_session = max_bytes_per_session
+    self._lock = threading.Lock()
+    self.bytes_billed = 0
+    self.bytes_reserved = 0
+    self.queries = 0
+
+  def reserve(self, estimated_bytes: int) -> None:
+    """Reserve budget for a query, or raise `QueryBudgetExceeded`."""
+    with self._lock:
+      if self.max_bytes_per_query and (
+          estimated_bytes > self.max_bytes_per_query
+      ):
+        raise QueryBudgetExceeded(
+            f"Query would scan {_format_bytes(estimated_bytes)}, above the"
+            f" per-query limit of {_format_bytes(self.max_bytes_per_query)}."
+            " Restrict it to a partition, select fewer columns or sample the"
+            " table.",
+            estimated_bytes,
+            self.max_bytes_per_query,
+        )
+      remaining = (
+          self.max_bytes_per_session - self.bytes_billed - self.bytes_reserved
+      )
+      if self.max_bytes_per_session and estimated_bytes > remaining:
+        raise QueryBudgetExceeded(
+            f"Query would scan {_format_bytes(estimated_bytes)}, but only"
+            f" {_format_bytes(max(remaining, 0))} of the session budget of"
+            f" {_format_bytes(self.max_bytes_per_session)} remain.",
+            estimated_bytes,
+            max(remaining, 0),
+        )
+      self.bytes_reserved += estimated_bytes
+
+  def settle(self, estimated_bytes: int, billed_bytes: int) -> None:
+    """Replace a reservation with the bytes actually billed."""
+    with self._lock:
+      self.bytes_reserved -= estimated_bytes
+      self.bytes_billed += billed_bytes
+      self.queries += 1
+
+  def reset(self) -> None:
+    """Forget the bytes billed so far; running queries stay reserved."""
+    with self._lock:
+      self.bytes_billed = 0
+      self.queries = 0
+
+  def stats(self) -> Dict[str, Any]:
+    """Return the limits and the bytes spent so far in this session."""
+    with self._lock:
+      return {
+          "max_bytes_per_query": self.max_bytes_per_query,
+          "max_bytes_per_session": self.max_bytes_per_session,
+          "bytes_billed": self.bytes_billed,
+          "bytes_reserved": self.bytes_reserved,
+          "bytes_remaining": (
+              max(
+                  self.max_bytes_per_session
+                  - self.bytes_billed
+                  - self.bytes_reserved,
+                  0,
+              )
+              if self.max_bytes_per_session
+              else None
+          ),
+          "queries": self.queries,
+      }
+
+
+# Agent session whose budget the queries of the current tool call count
+# against, or None outside an agent session.
+_SESSION_ID: "contextvars.ContextVar[Optional[str]]" = contextvars.ContextVar(
+    "query_budget_session", default=None
+)
+
+
+class SessionBudgets:
+  """Query budgets keyed by agent session, created on first use."""
+
+  def __init__(
+      self,
+      max_bytes_per_query: int,
+      max_bytes_per_session: int,
+      idle_seconds: float,
+  ):
+    self.max_bytes_per_query = max_bytes_per_query
+    self.max_bytes_per_session = max_bytes_per_session
+    self.idle_seconds = idle_seconds
+    self._lock = threading.Lock()
+    # Session ID -> (time last used, budget).
+    self._budgets: Dict[Optional[str], Tuple[float, QueryBudget]] = {}
+
+  def get(self, session_id: Optional[str]) -> QueryBudget:
+    """Return the budget of a session, dropping those idle for too long."""
+    now = time.monotonic()
+    with self._lock:
+      for key, (used_at, budget) in list(self._budgets.items()):
+        if now - used_at > self.idle_seconds and not budget.bytes_reserved:
+          del self._budgets[key]
+      entry = self._budgets.get(session_id)
+      budget = entry[1] if entry else QueryBudget(
+          self.max_bytes_per_query, self.max_bytes_per_session
+      )
+      self._budgets[session_id] = (now, budget)
+      return budget
+
+  def current(self) -> QueryBudget:
+    """Return the budget of the session the current tool call belongs to."""
+    return self.get(_SESSION_ID.get())
+
+
+QUERY_BUDGETS = SessionBudgets(
+    config.bq_max_bytes_per_query,
+    config.bq_max_bytes_per_session,
+    config.bq_session_budget_idle_seconds,
+)
+
+
+def set_budget_session(session_id: Optional[str]) -> contextvars.Token:
+  """Charge the queries of the current context to an agent session."""
+  return _SESSION_ID.set(session_id)
+
+
+def current_budget() -> QueryBudget:
+  """Return the query budget of the current agent session."""
+  return QUERY_BUDGETS.current()
+
+
+def _copy_job_config(
+    job_config: Optional["bigquery.QueryJobConfig"],
+) -> "bigquery.QueryJobConfig":
+  if job_config is None:
+    return bigquery.QueryJobConfig()
+  return bigquery.QueryJobConfig.from_api_repr(job_config.to_api_repr())
+
+
+def dry_run(
+    client: "bigquery.Client",
+    query: str,
+    job_config: Optional["bigquery.QueryJobConfig"] = None,
+) -> "bigquery.QueryJob":
+  """Dry-run a query; the returned job carries the estimate and references.
+
+  The query cache is bypassed so the estimate is an upper bound on the scan.
+  """
+  dry_config = _copy_job_config(job_config)
+  dry_config.dry_run = True
+  dry_config.use_query_cache = False
+  return client.query(query, job_config=dry_config)
+
+
+def submit_query(
+    client: "bigquery.Client",
+    query: str,
+    job_config: Optional["bigquery.QueryJobConfig"] = None,
+    budget: Optional[QueryBudget] = None,
+    estimate: Optional["bigquery.QueryJob"] = None,
+) -> Tuple["bigquery.QueryJob", Dict[str, Any]]:
+  """Estimate a query, check it against the budget and start it.
+
+  Every successfully submitted job must be passed to `complete_query` exactly
+  once to release its reservation.
+
+  Args:
+      client (bigquery.Client): Client to run the query with.
+      query (str): Standard SQL query.
+      job_config (Optional[bigquery.QueryJobConfig]): Job configuration; it is
+        copied, not modified.
+      budget (Optional[QueryBudget]): Budget to enforce. Defaults to the
+        budget of the current agent session.
+      estimate (Optional[bigquery.QueryJob]): Result of an earlier `dry_run`
+        of the same query, to avoid dry-running it twice.
+
+  Returns:
+      Tuple[bigquery.QueryJob, Dict[str, Any]]: The running job and its cost
+      record.
+  """
+  budget = budget or current_budget()
+  if estimate is None:
+    estimate = dry_run(client, query, job_config)
+  estimated_bytes = estimate.total_bytes_processed or 0
+  budget.reserve(estimated_bytes)
+
+  run_config = _copy_job_config(job_config)
+  if (
+      budget.max_bytes_per_query
+      and run_config.maximum_bytes_billed is None
+  ):
+    run_config.maximum_bytes_billed = max(
+        budget.max_bytes_per_query, _MIN_BYTES_BILLED
+    )
+  try:
+    job = client.query(query, job_config=run_config)
+  except Exception:
+    budget.settle(estimated_bytes, 0)
+    raise
+
+  cost = {
+      "estimated_bytes_processed": estimated_bytes,
+      "maximum_bytes_billed": run_config.maximum_bytes_billed,
+  }
+  return job, cost
+
+
+def complete_query(
+    job: "bigquery.QueryJob",
+    cost: Dict[str, Any],
+    budget: Optional[QueryBudget] = None,
+) -> Dict[str, Any]:
+  """Record the actual cost of a finished or failed job.
+
+  Returns:
+      Dict[str, Any]: The cost record, updated with the processed and billed
+      bytes.
+  """
+  budget = budget or current_budget()
+  billed_bytes = job.total_bytes_billed or 0
+  cost["total_bytes_processed"] = job.total_bytes_processed
+  cost["total_bytes_billed"] = billed_bytes
+  cost["cache_hit"] = job.cache_hit
+  budget.settle(cost["estimated_bytes_processed"], billed_bytes)
+  return cost
+
+
+def run_query(
+    client: "bigquery.Client",
+    query: str,
+    job_config: Optional["bigquery.QueryJobConfig"] = None,
+    budget: Optional[QueryBudget] = None,
+) -> Tuple["bigquery.table.RowIterator", Dict[str, Any]]:
+  """Run a query under the byte budget and wait for its results.
+
+  Raises:
+      QueryBudgetExceeded: If the dry-run estimate exceeds the budget.
+
+  Returns:
+      Tuple[bigquery.table.RowIterator, Dict[str, Any]]: The result rows and
+      the cost record.
+  """
+  job, cost = submit_query(client, query, job_config, budget)
+  try:
+    rows = job.result()
+  finally:
+    complete_query(job, cost, budget)
+  return rows, cost
@@ -0,0 +1,266 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""This module provides a local disk cache of BigQuery query results.
+
+Entries are keyed by a fingerprint of the normalized SQL and its parameters
+together with the last modification time of every table the query references,
+as reported by the query's dry run. A cached result is therefore reused exactly
+until one of its input tables changes. Queries whose result can change without
+a table modification (non-deterministic functions, views, external tables or
+tables with a streaming buffer) are never cached. Results are stored as
+zstd-compressed Arrow IPC files in a directory bounded by
+`config.bq_result_cache_max_bytes` with least recently used eviction. Caching
+requires the optional `pyarrow` package.
+"""
+
+import hashlib
+import json
+import os
+import re
+import shutil
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple, Union
+
+from ..config import config
+from .bigquery_query import (
+    QueryBudget,
+    complete_query,
+    dry_run,
+    submit_query,
+)
+from .bigquery_results import pyarrow, to_arrow
+from .disk_cache import atomic_write, enforce_byte_budget, file_lock, touch
+from .lazy_import import lazy_import
+
+if TYPE_CHECKING:
+  from google.cloud import bigquery
+else:
+  bigquery = lazy_import("google.cloud.bigquery")
+
+feather = lazy_import("pyarrow.feather") if pyarrow is not None else None
+
+_TOKENS = re.compile(
+    r"""
+    (?P<literal>'(?:[^'\\]|\\.)*'|"(?:[^"\\]|\\.)*"|`[^`]*`)
+    | (?P<comment>--[^\n]*|\#[^\n]*|/\*.*?\*/)
+    | (?P<space>\s+)
+    """,
+    re.DOTALL | re.VERBOSE,
+)
+
+_NONDETERMINISTIC = re.compile(
+    r"\b(RAND|GENERATE_UUID|SESSION_USER|NOW"
+    r"|CURRENT_(DATE|DATETIME|TIME|TIMESTAMP))\b",
+    re.IGNORECASE,
+)
+
+_UNCACHEABLE_TABLE_TYPES = ("VIEW", "MATERIALIZED_VIEW", "EXTERNAL")
+
+
+def normalize_sql(query: str) -> str:
+  """Normalize a query so that formatting-only differences compare equal.
+
+  Comments are dropped and runs of whitespace collapse to a single space,
+  while string literals and quoted identifiers are kept verbatim.
+  """
+  parts: List[str] = []
+  pos = 0
+  for match in _TOKENS.finditer(query):
+    if match.start() > pos:
+      parts.append(query[pos:match.start()])
+    if match.lastgroup == "literal":
+      parts.append(match.group())
+    elif parts and parts[-1] != " ":
+      parts.append(" ")
+    pos = match.end()
+  parts.append(query[pos:])
+  return "".join(parts).strip().rstrip(";").strip()
+
+
+def sql_fingerprint(
+    query: str,
+    job_config: Optional["bigquery.QueryJobConfig"] = None,
+    project: Optional[str] = None,
+) -> str:
+  """Hash a normalized query with the settings that affect its result."""
+  options = (job_config.to_api_repr() if job_config else {}).get("query", {})
+  payload = {
+      "project": project,
+      "sql": normalize_sql(query),
+      "parameters": options.get("queryParameters"),
+      "default_dataset": options.get("defaultDataset"),
+      "legacy_sql": options.get("useLegacySql"),
+  }
+  return hashlib.sha256(
+      json.dumps(payload, sort_keys=True, default=str).encode("utf-8")
+  ).hexdigest()
+
+
+class QueryResultCache:
+  """Size-bounded cache of query results keyed by SQL and table versions."""
+
+  def __init__(self, root: str, max_bytes: int):
+    self.root = root
+    self.max_bytes = max_bytes
+
+  @property
+  def enabled(self) -> bool:
+    return feather is not None and self.max_bytes > 0
+
+  def _table_versions(
+      self, client: "bigquery.Client", estimate: "bigquery.QueryJob"
+  ) -> Optional[List[str]]:
+    """Return "table@last_modified" for each referenced table, if cacheable."""
+    references = estimate.referenced_tables or []
+    if not references:
+      return None
+    versions = []
+    for reference in references:
+      table = client.get_table(reference)
+      if (
+          table.table_type in _UNCACHEABLE_TABLE_TYPES
+          or table.streaming_buffer is not None
+          or table.modified is None
+      ):
+        return None
+      versions.append(f"{table.full_table_id}@{table.modified.isoformat()}")
+    return sorted(versions)
+
+  def entry_path(
+      self,
+      client: "bigquery.Client",
+      query: str,
+      job_config: Optional["bigquery.QueryJobConfig"],
+      estimate: "bigquery.QueryJob",
+  ) -> Optional[str]:
+    """Return where a query's result is cached, or None if it is uncacheable.
+
+    Args:
+        estimate (bigquery.QueryJob): Dry run of the query, which lists the
+          referenced tables.
+    """
+    if not self.enabled or _NONDETERMINISTIC.search(query):
+      return None
+    versions = self._table_versions(client, estimate)
+    if versions is None:
+      return None
+    key = sql_fingerprint(query, job_config, client.project)
+    digest = hashlib.sha256(
+        "\n".join([key] + versions).encode("utf-8")
+    ).hexdigest()
+    return os.path.join(self.root, digest[:2], f"{digest}.arrow")
+
+  def read(
+      self, path: str, estimate: "bigquery.QueryJob"
+  ) -> Optional[Tuple["pyarrow.Table", Dict[str, Any]]]:
+    """Read a cached result and build the cost record of the cache hit."""
+    if not os.path.exists(path):
+      return None
+    try:
+      table = feather.read_table(path)
+    except Exception as e:
+      print(f"Ignoring unreadable query cache entry {path}: {e}")
+      return None
+    touch(path)
+    return table, {
+        "estimated_bytes_processed": estimate.total_bytes_processed or 0,
+        "total_bytes_processed": 0,
+        "total_bytes_billed": 0,
+        "cache_hit": False,
+        "result_cache_hit": True,
+    }
+
+  def store(self, path: str, table: "pyarrow.Table") -> None:
+    """Cache a query result unless it exceeds the byte budget."""
+    if table.nbytes > self.max_bytes:
+      return
+    with atomic_write(path) as tmp_path:
+      feather.write_feather(table, tmp_path, compression="zstd")
+    with file_lock(self.root):
+      enforce_byte_budget(self.root, self.max_bytes, keep=path)
+
+  def store_file(self, path: str, source_path: str) -> None:
+    """Cache a result already written as a compressed Arrow IPC file."""
+    if os.path.getsize(source_path) > self.max_bytes:
+      return
+    with atomic_write(path) as tmp_path:
+      shutil.copyfile(source_path, tmp_path)
+    with file_lock(self.root):
+      enforce_byte_budget(self.root, self.max_bytes, keep=path)
+
+  def run(
+      self,
+      client: "bigquery.Client",
+      query: str,
+      job_config: Optional["bigquery.QueryJobConfig"] = None,
+      bqstorage_client: Optional[Any] = None,
+      budget: Optional[QueryBudget] = None,
+  ) -> Tuple[
+      Union["bigquery.table.RowIterator", "pyarrow.Table"], Dict[str, Any]
+  ]:
+    """Run a query under the byte budget, serving it from the cache if possible.
+
+    Hits return without submitting a query job; only the free dry run and the
+    metadata lookups of the referenced tables are issued.
+
+    Args:
+        client (bigquery.Client): Client to run the query with.
+        query (str): Standard SQL query.
+        job_config (Optional[bigquery.QueryJobConfig]): Job configuration.
+        bqstorage_client (Optional[Any]): Storage Read API client used to
+          download results that are stored in the cache.
+        budget (Optional[QueryBudget]): Budget to enforce on misses.
+
+    Returns:
+        Tuple[Union[bigquery.table.RowIterator, pyarrow.Table],
+        Dict[str, Any]]: The results, as an Arrow table for cacheable queries,
+        and the cost record including "result_cache_hit".
+    """
+    estimate = dry_run(client, query, job_config)
+    path = self.entry_path(client, query, job_config, estimate)
+    if path is not None:
+      cached = self.read(path, estimate)
+      if cached is not None:
+        return cached
+
+    job, cost = submit_query(client, query, job_config, budget, estimate)
+    try:
+      rows = job.result()
+    finally:
+      complete_query(job, cost, budget)
+    cost["result_cache_hit"] = False
+    if path is None:
+      return rows, cost
+
+    table = to_arrow(rows, bqstorage_client)
+    try:
+      self.store(path, table)
+    except Exception as e:
+      print(f"Failed to cache query result: {e}")
+    return table, cost
+
+  def clear(self) -> int:
+    """Remove every cached result.
+
+    Returns:
+        int: Number of bytes removed.
+    """
+    with file_lock(self.root):
+      return enforce_byte_budget(self.root, 0)
+
+
+RESULT_CACHE = QueryResultCache(
+    os.path.join(config.cache_dir, "bq_results"),
+    config.bq_result_cache_max_bytes,
+)
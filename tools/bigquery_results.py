@@ -0,0 +1,119 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""This module provides an Arrow-native path for BigQuery query results.
+
+Results are materialized as Arrow tables or streamed as record batches, read
+through the BigQuery Storage Read API when a storage client is available and
+the result spans several pages. In-process consumers work on the columnar data
+directly; conversion to JSON-friendly rows only happens at the LLM-facing
+boundary through `to_records`. `pyarrow` and `google-cloud-bigquery-storage` are
+optional: without `pyarrow`, results fall back to row-by-row dictionaries.
+"""
+
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    Union,
+)
+
+from .bigquery_query import QueryBudget, run_query
+from .lazy_import import lazy_import
+
+if TYPE_CHECKING:
+  from google.cloud import bigquery
+else:
+  bigquery = lazy_import("google.cloud.bigquery")
+
+pyarrow = lazy_import("pyarrow", optional=True)
+bigquery_storage = lazy_import("google.cloud.bigquery_storage", optional=True)
+
+
+def _require_pyarrow() -> None:
+  if pyarrow is None:
+    raise ValueError("Arrow query results require the 'pyarrow' package")
+
+
+def to_arrow(
+    rows: Union["bigquery.table.RowIterator", "pyarrow.Table"],
+    bqstorage_client: Optional[Any] = None,
+) -> "pyarrow.Table":
+  """Materialize query results as an Arrow table.
+
+  Args:
+      rows (Union[bigquery.table.RowIterator, pyarrow.Table]): Results of a
+        finished query. Arrow tables are returned as is.
+      bqstorage_client (Optional[Any]): Storage Read API client used to
+        download multi-page results in parallel streams. The REST API is used
+        if None.
+
+  Returns:
+      pyarrow.Table: The results.
+  """
+  _require_pyarrow()
+  if isinstance(rows, pyarrow.Table):
+    return rows
+  return rows.to_arrow(
+      bqstorage_client=bqstorage_client, create_bqstorage_client=False
+  )
+
+
+def iter_record_batches(
+    rows: "bigquery.table.RowIterator", bqstorage_client: Optional[Any] = None
+) -> Iterator["pyarrow.RecordBatch"]:
+  """Stream query results as Arrow record batches, one page at a time."""
+  _require_pyarrow()
+  return rows.to_arrow_iterable(bqstorage_client=bqstorage_client)
+
+
+def to_records(
+    result: Union["bigquery.table.RowIterator", "pyarrow.Table"],
+    bqstorage_client: Optional[Any] = None,
+) -> List[Dict[str, Any]]:
+  """Convert query results to a list of row dictionaries for tool responses.
+
+  Args:
+      result (Union[bigquery.table.RowIterator, pyarrow.Table]): Query results
+        or an Arrow table built from them.
+      bqstorage_client (Optional[Any]): Storage Read API client, used when
+        `result` still has to be downloaded.
+
+  Returns:
+      List[Dict[str, Any]]: One dictionary per row.
+  """
+  if pyarrow is None:
+    return [dict(row.items()) for row in result]
+  return to_arrow(result, bqstorage_client).to_pylist()
+
+
+def query_arrow(
+    client: "bigquery.Client",
+    query: str,
+    job_config: Optional["bigquery.QueryJobConfig"] = None,
+    bqstorage_client: Optional[Any] = None,
+    budget: Optional[QueryBudget] = None,
+) -> Tuple["pyarrow.Table", Dict[str, Any]]:
+  """Run a query under the byte budget and return its results as Arrow.
+
+  Returns:
+      Tuple[pyarrow.Table, Dict[str, Any]]: The results and the cost record.
+  """
+  _require_pyarrow()
+  rows, cost = run_query(client, query, job_config, budget)
+  return to_arrow(rows, bqstorage_client), cost
@@ -21,13 +21,134 @@ based on user-defined rules.
 """
 
 import json
-from typing import Any, Dict, List, Optional
-from google.cloud import bigquery
+import os
+from datetime import datetime, timedelta
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple
 from ..config import config
+from .bigquery_catalog import BigQueryCatalog
+from .bigquery_jobs import fetch_job_statuses, wait_for_jobs
+from .bigquery_query import (
+    QueryBudgetExceeded,
+    current_budget,
+    dry_run,
+    run_query,
+)
+from .bigquery_result_cache import RESULT_CACHE
+from .bigquery_results import bigquery_storage, to_arrow, to_records
+from .client_pool import CLIENT_REGISTRY, create_pooled_session
+from .lazy_import import lazy_import
+from .metadata_cache import TTLCache
+from .validation_state import VALIDATION_STATE, rules_key
 
-def get_bigquery_client() -> bigquery.Client:
-  """Get a configured BigQuery client."""
-  return bigquery.Client(project=config.project_id)
+if TYPE_CHECKING:
+  from google.api_core import exceptions as api_exceptions
+  from google.cloud import bigquery
+else:
+  api_exceptions = lazy_import("google.api_core.exceptions")
+  bigquery = lazy_import("google.cloud.bigquery")
+
+
+def _create_bigquery_client(
+    project: str, location: Optional[str], credentials: Any, pool_size: int
+) -> "bigquery.Client":
+  """Build a BigQuery client backed by a pooled HTTP session."""
+  session = create_pooled_session(credentials, pool_size)
+  return bigquery.Client(
+      project=project,
+      location=location,
+      credentials=session.credentials,
+      _http=session,
+  )
+
+
+CLIENT_REGISTRY.register(
+    "bigquery",
+    _create_bigquery_client,
+    probe=lambda client: list(client.list_datasets(max_results=1)),
+)
+
+
+def get_bigquery_client() -> "bigquery.Client":
+  """Get the shared, pooled BigQuery client."""
+  return CLIENT_REGISTRY.get("bigquery", project=config.project_id)
+
+
+def _create_bigquery_storage_client(
+    project: str, location: Optional[str], credentials: Any, pool_size: int
+) -> Any:
+  """Build a BigQuery Storage Read API client."""
+  return bigquery_storage.BigQueryReadClient(credentials=credentials)
+
+
+CLIENT_REGISTRY.register("bigquery_storage", _create_bigquery_storage_client)
+
+
+def get_bigquery_storage_client() -> Optional[Any]:
+  """Get the shared Storage Read API client, or None if it is not installed."""
+  if bigquery_storage is None:
+    return None
+  return CLIENT_REGISTRY.get("bigquery_storage", project=config.project_id)
+
+
+def query_to_arrow(
+    query: str, job_config: Optional["bigquery.QueryJobConfig"] = None
+) -> Tuple[Any, Dict[str, Any]]:
+  """Run a query under the byte budget and return its results as Arrow.
+
+  Intended for in-process consumers, which should work on the columnar results
+  instead of converting them to rows. Results are served from the local result
+  cache when the query and its input tables are unchanged.
+
+  Args:
+      query (str): Standard SQL query.
+      job_config (Optional[bigquery.QueryJobConfig]): Job configuration.
+
+  Returns:
+      Tuple[pyarrow.Table, Dict[str, Any]]: The results and the cost record.
+  """
+  bqstorage_client = get_bigquery_storage_client()
+  result, cost = RESULT_CACHE.run(
+      get_bigquery_client(), query, job_config, bqstorage_client
+  )
+  return to_arrow(result, bqstorage_client), cost
+
+
+# Partition ID formats of INFORMATION_SCHEMA.PARTITIONS by granularity.
+_PARTITION_ID_FORMATS = {
+    "HOUR": "%Y%m%d%H",
+    "DAY": "%Y%m%d",
+    "MONTH": "%Y%m",
+    "YEAR": "%Y",
+}
+
+# Changed partitions validated per query during incremental validation.
+_MAX_PARTITIONS_PER_QUERY = 50
+
+# Routines per (project, dataset), filtered by routine type on read.
+ROUTINES_CACHE = TTLCache(config.metadata_cache_ttl_seconds)
+
+CATALOG = BigQueryCatalog(
+    get_bigquery_client,
+    path=(
+        os.path.join(config.cache_dir, "bq_catalog.json")
+        if config.bq_catalog_persist
+        else None
+    ),
+)
+
+
+def _catalog_error(
+    dataset_id: str, table_id: str, columns: Optional[List[str]] = None
+) -> Optional[str]:
+  """Check a table reference against the catalog before running a query.
+
+  The catalog is advisory: if it cannot be consulted, the query goes ahead.
+  """
+  try:
+    return CATALOG.check_table(dataset_id, table_id, columns)
+  except Exception as e:
+    print(f"Catalog check skipped for '{dataset_id}.{table_id}': {e}")
+    return None
 
 def bigquery_job_details_tool(job_id: str) -> Dict[str, Any]:
   """Retrieve details of a BigQuery job.
@@ -55,19 +176,43 @@ def bigquery_job_details_tool(job_id: str) -> Dict[str, Any]:
   except Exception as e:
     return {"error": f"Error getting job details: {e}"}
 
-def get_udf_sp_tool(dataset_id: str, routine_type: Optional[str] = None) -> str:
-  """Retrieve UDFs and Stored Procedures from a BigQuery dataset.
+def bigquery_jobs_status_tool(
+    job_ids: List[str],
+    wait: Optional[str] = None,
+    timeout_seconds: float = 300,
+) -> Dict[str, Any]:
+  """Retrieve the status of several BigQuery jobs concurrently.
 
   Args:
-      dataset_id (str): The dataset ID to search.
-      routine_type (Optional[str]): Filter by routine type ('FUNCTION' or
-        'PROCEDURE').
+      job_ids (List[str]): The IDs of the BigQuery jobs.
+      wait (Optional[str]): "all" to wait until every job has finished, "any"
+        to wait for the first one, or None to return the current status
+        immediately.
+      timeout_seconds (float): Maximum time to wait. Defaults to 300.
 
   Returns:
-      str: JSON string containing routine information.
+      Dict[str, Any]: Per-job state, error, queue and execution time in
+      milliseconds, and slot-ms.
   """
-  client = get_bigquery_client()
+  try:
+    client = get_bigquery_client()
+    if wait is None:
+      return {
+          "status": "success",
+          "jobs": fetch_job_statuses(client, job_ids),
+      }
+    return {
+        "status": "success",
+        **wait_for_jobs(client, job_ids, wait, timeout_seconds),
+    }
 
+  except Exception as e:
+    return {"status": "error", "error": str(e)}
+
+
+def _fetch_routines(project_id: str, dataset_id: str) -> List[Dict[str, Any]]:
+  """Fetch every routine of a dataset from INFORMATION_SCHEMA.ROUTINES."""
+  client = get_bigquery_client()
   query = f"""
         SELECT 
             routine_name,
@@ -78,15 +223,38 @@ def get_udf_sp_tool(dataset_id: str, routine_type: Optional[str] = None) -> str:
             routine_definition,
             created,
             last_modified
-        FROM `{config.project_id}.{dataset_id}.INFORMATION_SCHEMA.ROUTINES`
-        {f"WHERE routine_type = '{routine_type}'" if routine_type else ""}
+        FROM `{project_id}.{dataset_id}.INFORMATION_SCHEMA.ROUTINES`
         ORDER BY routine_type, routine_name
     """
+  rows, _ = run_query(client, query)
+  return to_records(rows, get_bigquery_storage_client())
 
+
+def get_udf_sp_tool(dataset_id: str, routine_type: Optional[str] = None) -> str:
+  """Retrieve UDFs and Stored Procedures from a BigQuery dataset.
+
+  Routines are fetched once per dataset and cached for
+  `config.metadata_cache_ttl_seconds`; the routine type filter is applied to
+  the cached list.
+
+  Args:
+      dataset_id (str): The dataset ID to search.
+      routine_type (Optional[str]): Filter by routine type ('FUNCTION' or
+        'PROCEDURE').
+
+  Returns:
+      str: JSON string containing routine information.
+  """
   try:
-    query_job = client.query(query)
-    results = query_job.result()
-    routine_info_list = [dict(row.items()) for row in results]
+    routines = ROUTINES_CACHE.get_or_load(
+        (config.project_id, dataset_id),
+        lambda: _fetch_routines(config.project_id, dataset_id),
+    )
+    routine_info_list = [
+        routine
+        for routine in routines
+        if not routine_type or routine["routine_type"] == routine_type
+    ]
 
     if not routine_info_list:
       return json.dumps(
@@ -112,84 +280,612 @@ def get_udf_sp_tool(dataset_id: str, routine_type: Optional[str] = None) -> str:
     )
 
 
+def invalidate_routines_cache(
+    dataset_id: Optional[str] = None,
+) -> Dict[str, Any]:
+  """Invalidate cached routine lookups.
+
+  Args:
+      dataset_id (Optional[str]): Only invalidate this dataset. Invalidates all
+        datasets if omitted.
+
+  Returns:
+      Dict[str, Any]: Number of invalidated entries and the cache statistics.
+  """
+  invalidated = ROUTINES_CACHE.invalidate(
+      None if dataset_id is None else lambda key: key[1] == dataset_id
+  )
+  return {"invalidated": invalidated, "stats": ROUTINES_CACHE.stats()}
+
+
+def get_routines_cache_stats() -> Dict[str, Any]:
+  """Get hit/miss counters of the routine metadata cache."""
+  return ROUTINES_CACHE.stats()
+
+
+def _compile_validation_rules(
+    rules: List[Dict[str, Any]],
+    unique_sample_size: int,
+    dataset_id: str,
+    table_id: str,
+) -> Tuple[List[str], List[Optional[str]]]:
+  """Compile validation rules into conditional aggregate expressions.
+
+  Rules on columns the catalog knows to be missing are rejected up front so a
+  single bad rule does not fail the whole query.
+
+  Returns:
+      Tuple[List[str], List[Optional[str]]]: The SELECT expressions and, per
+      rule, None if it compiled or an error message if it did not.
+  """
+  expressions = []
+  errors = []
+  for i, rule in enumerate(rules):
+    column = rule.get("column")
+    rule_type = rule.get("type")
+    if not column:
+      errors.append("Rule is missing 'column'")
+      continue
+    column_error = _catalog_error(dataset_id, table_id, [column])
+    if column_error:
+      errors.append(column_error)
+      continue
+    if rule_type == "not_null":
+      expressions.append(f"COUNTIF({column} IS NULL) AS r{i}")
+    elif rule_type == "unique":
+      expressions.append(
+          f"COUNT({column}) - COUNT(DISTINCT {column}) AS r{i}"
+      )
+      # The most frequent values double as a sample of the duplicated keys.
+      # APPROX_TOP_COUNT counts NULL as a value while COUNT ignores it, so
+      # one extra entry is requested and NULL is dropped from the sample.
+      expressions.append(
+          f"APPROX_TOP_COUNT({column}, {unique_sample_size + 1}) AS r{i}_top"
+      )
+    elif rule_type == "value":
+      expressions.append(f"COUNTIF({column} != {rule.get('value')}) AS r{i}")
+    else:
+      errors.append(f"Unknown rule type: {rule_type}")
+      continue
+    errors.append(None)
+  return expressions, errors
+
+
+def _rule_result(
+    rule: Dict[str, Any],
+    row: Dict[str, Any],
+    i: int,
+    unique_sample_size: int,
+) -> Dict[str, Any]:
+  """Turn the aggregates of rule `i` into a pass/fail validation result."""
+  count = row[f"r{i}"]
+  if rule["type"] == "not_null":
+    details = {"null_count": count}
+  elif rule["type"] == "unique":
+    details = {
+        "duplicate_count": count,
+        "sample_duplicate_keys": [
+            {"value": top["value"], "count": top["count"]}
+            for top in row[f"r{i}_top"]
+            if top["value"] is not None and top["count"] > 1
+        ][:unique_sample_size],
+    }
+  else:
+    details = {"invalid_count": count}
+
+  return {
+      "rule": rule,
+      "status": "pass" if count == 0 else "fail",
+      "details": details,
+  }
+
+
+def _partition_id_filter(table: "bigquery.Table", partition_id: str) -> str:
+  """Build a partition-pruning WHERE condition from an INFORMATION_SCHEMA ID.
+
+  Args:
+      table (bigquery.Table): Table with loaded metadata.
+      partition_id (str): Partition ID as listed in
+        INFORMATION_SCHEMA.PARTITIONS, or "" for an unpartitioned table.
+
+  Returns:
+      str: SQL condition selecting exactly the rows of the partition.
+  """
+  if not partition_id:
+    return "TRUE"
+
+  if table.range_partitioning:
+    field = table.range_partitioning.field
+    range_ = table.range_partitioning.range_
+    if partition_id == "__NULL__":
+      return f"{field} IS NULL"
+    if partition_id == "__UNPARTITIONED__":
+      return f"({field} < {range_.start} OR {field} >= {range_.end})"
+    start = int(partition_id)
+    return f"{field} >= {start} AND {field} < {start + range_.interval}"
+
+  partitioning = table.time_partitioning
+  if not partitioning:
+    raise ValueError(f"Table {table.table_id} is not partitioned")
+  field = partitioning.field or "_PARTITIONTIME"
+  if partition_id == "__UNPARTITIONED__":
+    return "_PARTITIONTIME IS NULL"
+  if partition_id == "__NULL__":
+    return f"{field} IS NULL"
+
+  granularity = partitioning.type_ or "DAY"
+  lower = datetime.strptime(partition_id, _PARTITION_ID_FORMATS[granularity])
+  if granularity == "HOUR":
+    upper = lower + timedelta(hours=1)
+  elif granularity == "DAY":
+    upper = lower + timedelta(days=1)
+  elif granularity == "MONTH":
+    upper = lower.replace(
+        year=lower.year + lower.month // 12, month=lower.month % 12 + 1
+    )
+  else:
+    upper = lower.replace(year=lower.year + 1)
+
+  field_type = "TIMESTAMP"
+  if partitioning.field:
+    field_type = next(
+        (f.field_type for f in table.schema if f.name == partitioning.field),
+        "TIMESTAMP",
+    )
+  if field_type == "DATE":
+    return (
+        f"{field} >= DATE '{lower:%Y-%m-%d}'"
+        f" AND {field} < DATE '{upper:%Y-%m-%d}'"
+    )
+  return (
+      f"{field} >= {field_type} '{lower:%Y-%m-%d %H:%M:%S}'"
+      f" AND {field} < {field_type} '{upper:%Y-%m-%d %H:%M:%S}'"
+  )
+
+
+def _add_cost(total: Dict[str, Any], cost: Dict[str, Any]) -> None:
+  for key in (
+      "estimated_bytes_processed",
+      "total_bytes_processed",
+      "total_bytes_billed",
+  ):
+    total[key] = total.get(key, 0) + (cost.get(key) or 0)
+
+
+def _list_partitions(
+    client: "bigquery.Client", table: "bigquery.Table", cost: Dict[str, Any]
+) -> Dict[str, Optional[int]]:
+  """Return the last modification time in ms of each partition of a table."""
+  dataset_ref = f"{config.project_id}.{table.dataset_id}"
+  query = f"""
+        SELECT partition_id, UNIX_MILLIS(last_modified_time) AS last_modified
+        FROM `{dataset_ref}.INFORMATION_SCHEMA.PARTITIONS`
+        WHERE table_name = @table_name
+    """
+  job_config = bigquery.QueryJobConfig(
+      query_parameters=[
+          bigquery.ScalarQueryParameter("table_name", "STRING", table.table_id)
+      ]
+  )
+  rows, query_cost = run_query(client, query, job_config)
+  _add_cost(cost, query_cost)
+
+  # Streaming-buffer rows of column-partitioned tables have no usable filter;
+  # they are validated once they land in their partition.
+  skip_unpartitioned = bool(
+      table.time_partitioning and table.time_partitioning.field
+  )
+  return {
+      row["partition_id"] or "": row["last_modified"]
+      for row in to_records(rows)
+      if not (skip_unpartitioned and row["partition_id"] == "__UNPARTITIONED__")
+  }
+
+
+def _validate_partitions(
+    client: "bigquery.Client",
+    table: "bigquery.Table",
+    partition_ids: List[str],
+    expressions: List[str],
+    cost: Dict[str, Any],
+) -> Dict[str, Dict[str, Any]]:
+  """Compute the rule aggregates of several partitions in one pruned scan."""
+  conditions = {p: _partition_id_filter(table, p) for p in partition_ids}
+  cases = " ".join(f"WHEN {c} THEN '{p}'" for p, c in conditions.items())
+  where = " OR ".join(f"({c})" for c in conditions.values())
+  select_list = ",\n                ".join(expressions)
+  query = f"""
+            SELECT
+                CASE {cases} END AS _partition_id,
+                {select_list}
+            FROM `{config.project_id}.{table.dataset_id}.{table.table_id}`
+            WHERE {where}
+            GROUP BY _partition_id
+        """
+  rows, query_cost = run_query(client, query)
+  _add_cost(cost, query_cost)
+
+  aliases = [expression.rsplit(" AS ", 1)[1] for expression in expressions]
+  # Partitions without rows produce no group.
+  results = {
+      p: {a: [] if a.endswith("_top") else 0 for a in aliases}
+      for p in partition_ids
+  }
+  for row in to_records(rows):
+    results[row.pop("_partition_id")] = row
+  return results
+
+
+def _merge_partition_results(
+    results: Dict[str, Dict[str, Any]], unique_sample_size: int
+) -> Dict[str, Any]:
+  """Sum per-partition aggregates into a table-wide summary row."""
+  merged: Dict[str, Any] = {}
+  for result in results.values():
+    for name, value in result.items():
+      if name.endswith("_top"):
+        # Only keys duplicated within a partition count, matching the
+        # per-partition duplicate counts. Keyed by serialized value, since
+        # STRUCT values are not hashable.
+        counts = merged.setdefault(name, {})
+        for top in value:
+          if top["value"] is None or top["count"] <= 1:
+            continue
+          value_key = json.dumps(top["value"], sort_keys=True, default=str)
+          previous = counts.get(value_key, (top["value"], 0))
+          counts[value_key] = (top["value"], previous[1] + top["count"])
+      else:
+        merged[name] = merged.get(name, 0) + (value or 0)
+
+  for name, value in merged.items():
+    if name.endswith("_top"):
+      merged[name] = [
+          {"value": v, "count": c}
+          for v, c in sorted(value.values(), key=lambda item: -item[1])
+      ][:unique_sample_size]
+  return merged
+
+
+def _validate_incremental(
+    client: "bigquery.Client",
+    dataset_id: str,
+    table_id: str,
+    rules: List[Dict[str, Any]],
+    expressions: List[str],
+    errors: List[Optional[str]],
+    unique_sample_size: int,
+) -> Dict[str, Any]:
+  """Validate only new or modified partitions and merge the stored results."""
+  key = rules_key(rules)
+  cost: Dict[str, Any] = {}
+  validated: List[str] = []
+  state = VALIDATION_STATE.load(dataset_id, table_id, key)
+
+  if expressions:
+    try:
+      table = client.get_table(f"{config.project_id}.{dataset_id}.{table_id}")
+      partitions = _list_partitions(client, table, cost)
+      changed = [
+          p
+          for p, last_modified in partitions.items()
+          if p not in state or state[p]["last_modified"] != last_modified
+      ]
+      removed = [p for p in state if p not in partitions]
+      if removed:
+        VALIDATION_STATE.remove(dataset_id, table_id, key, removed)
+
+      # Each batch is saved as it completes, so progress survives a budget
+      # error part way through a large backfill.
+      for i in range(0, len(changed), _MAX_PARTITIONS_PER_QUERY):
+        batch = changed[i : i + _MAX_PARTITIONS_PER_QUERY]
+        results = _validate_partitions(client, table, batch, expressions, cost)
+        VALIDATION_STATE.save(
+            dataset_id,
+            table_id,
+            key,
+            {
+                p: {"last_modified": partitions[p], "result": results[p]}
+                for p in batch
+            },
+        )
+        validated.extend(batch)
+    except QueryBudgetExceeded as e:
+      cost["estimated_bytes_processed"] = e.estimated_bytes
+      errors = [error or str(e) for error in errors]
+    except Exception as e:
+      errors = [error or str(e) for error in errors]
+    state = VALIDATION_STATE.load(dataset_id, table_id, key)
+
+  results = {p: entry["result"] for p, entry in state.items()}
+  summary = _merge_partition_results(results, unique_sample_size)
+  validation_results = []
+  for i, rule in enumerate(rules):
+    if errors[i] is not None or not results:
+      validation_results.append({
+          "rule": rule,
+          "status": "error",
+          "message": errors[i] or "No partitions have been validated",
+      })
+      continue
+    result = _rule_result(rule, summary, i, unique_sample_size)
+    result["details"]["failing_partitions"] = sorted(
+        p for p, r in results.items() if r[f"r{i}"]
+    )
+    validation_results.append(result)
+
+  return {
+      "dataset": dataset_id,
+      "table": table_id,
+      "mode": "incremental",
+      "validations": validation_results,
+      "partitions_validated": validated,
+      "partitions_total": len(results),
+      "total_bytes_processed": cost.get("total_bytes_processed"),
+      "cost": cost,
+  }
+
+
+def _run_validation_query(
+    client: "bigquery.Client", table_ref: str, expressions: List[str]
+) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+  """Run compiled rules over a whole table as one query of aggregates.
+
+  Returns:
+      Tuple[Dict[str, Any], Dict[str, Any]]: The aggregate row and the cost
+      record.
+  """
+  select_list = ",\n                ".join(expressions)
+  query = f"""
+            SELECT
+                {select_list}
+            FROM `{table_ref}`
+        """
+  rows, cost = RESULT_CACHE.run(
+      client, query, bqstorage_client=get_bigquery_storage_client()
+  )
+  return to_records(rows)[0], cost
+
+
+def _isolate_rejected_rules(
+    client: "bigquery.Client",
+    table_ref: str,
+    expressions: List[str],
+    errors: List[Optional[str]],
+) -> Tuple[List[str], List[Optional[str]]]:
+  """Dry-run each compiled rule alone to report the ones BigQuery rejects.
+
+  Used when the combined query fails with BadRequest. Dry runs scan nothing,
+  so the remaining rules can still be checked in a single query.
+
+  Returns:
+      Tuple[List[str], List[Optional[str]]]: The expressions of the rules that
+      compile, and the per-rule errors with the rejected rules filled in.
+  """
+  valid = []
+  errors = list(errors)
+  for i, error in enumerate(errors):
+    if error is not None:
+      continue
+    rule_expressions = [
+        expression
+        for expression in expressions
+        if expression.rsplit(" AS ", 1)[1] in (f"r{i}", f"r{i}_top")
+    ]
+    try:
+      dry_run(
+          client, f"SELECT {', '.join(rule_expressions)} FROM `{table_ref}`"
+      )
+    except api_exceptions.BadRequest as e:
+      errors[i] = str(e)
+      continue
+    valid.extend(rule_expressions)
+  return valid, errors
+
+
 def validate_table_data(
-    dataset_id: str, table_id: str, rules: List[Dict[str, Any]]
+    dataset_id: str,
+    table_id: str,
+    rules: List[Dict[str, Any]],
+    unique_sample_size: int = 5,
+    incremental: bool = False,
 ) -> Dict[str, Any]:
   """Validate data in a BigQuery table against specified rules.
 
+  All rules are compiled into one query of conditional aggregates, so the table
+  is scanned once regardless of the number of rules. Results are reused from
+  the local result cache until the table is modified. If BigQuery rejects the
+  combined query, each rule is dry-run on its own so that the rejected rules
+  get their own errors and the others are still checked.
+
+  In incremental mode, only partitions that are new or were modified since
+  they were last validated with the same rules are scanned, and their results
+  are merged with the stored results of the other partitions. Uniqueness is
+  then checked within each partition, not across partitions.
+
   Args:
       dataset_id (str): The dataset ID.
       table_id (str): The table ID.
       rules (List[Dict[str, Any]]): List of validation rules.
+      unique_sample_size (int): Maximum number of duplicated keys reported per
+        failing unique rule. Defaults to 5.
+      incremental (bool): Only validate new or modified partitions. Defaults to
+        False.
 
   Returns:
       Dict[str, Any]: Validation results.
   """
-  client = get_bigquery_client()
-  validation_results = []
-
-  for rule in rules:
-    try:
-      column = rule["column"]
-      rule_type = rule["type"]
-      value = rule.get("value")
-
-      if rule_type == "not_null":
-        query = f"""
-                    SELECT COUNT(*) as null_count
-                    FROM `{config.project_id}.{dataset_id}.{table_id}`
-                    WHERE {column} IS NULL
-                """
-      elif rule_type == "unique":
-        query = f"""
-                    SELECT {column}, COUNT(*) as count
-                    FROM `{config.project_id}.{dataset_id}.{table_id}`
-                    GROUP BY {column}
-                    HAVING COUNT(*) > 1
-                """
-      elif rule_type == "value":
-        query = f"""
-                    SELECT COUNT(*) as invalid_count
-                    FROM `{config.project_id}.{dataset_id}.{table_id}`
-                    WHERE {column} != {value}
-                """
-      else:
-        validation_results.append({
-            "rule": rule,
-            "status": "error",
-            "message": f"Unknown rule type: {rule_type}",
-        })
-        continue
+  table_error = _catalog_error(dataset_id, table_id)
+  if table_error:
+    return {
+        "dataset": dataset_id,
+        "table": table_id,
+        "validations": [
+            {"rule": rule, "status": "error", "message": table_error}
+            for rule in rules
+        ],
+        "total_bytes_processed": 0,
+    }
 
-      query_job = client.query(query)
-      results = query_job.result()
-      row = next(iter(results))
+  client = get_bigquery_client()
+  expressions, errors = _compile_validation_rules(
+      rules, unique_sample_size, dataset_id, table_id
+  )
+  if incremental:
+    return _validate_incremental(
+        client,
+        dataset_id,
+        table_id,
+        rules,
+        expressions,
+        errors,
+        unique_sample_size,
+    )
 
-      validation_results.append({
-          "rule": rule,
-          "status": "pass" if row[0] == 0 else "fail",
-          "details": dict(row.items()),
-      })
+  row = None
+  cost = None
 
+  if expressions:
+    table_ref = f"{config.project_id}.{dataset_id}.{table_id}"
+    try:
+      try:
+        row, cost = _run_validation_query(client, table_ref, expressions)
+      except api_exceptions.BadRequest:
+        valid, errors = _isolate_rejected_rules(
+            client, table_ref, expressions, errors
+        )
+        if len(valid) == len(expressions):
+          # Every rule compiles on its own, so the error is not a rule's.
+          raise
+        if valid:
+          row, cost = _run_validation_query(client, table_ref, valid)
+    except QueryBudgetExceeded as e:
+      cost = {"estimated_bytes_processed": e.estimated_bytes}
+      errors = [error or str(e) for error in errors]
     except Exception as e:
-      validation_results.append(
-          {"rule": rule, "status": "error", "message": str(e)}
-      )
+      errors = [error or str(e) for error in errors]
+
+  validation_results = [
+      _rule_result(rule, row, i, unique_sample_size)
+      if errors[i] is None
+      else {"rule": rule, "status": "error", "message": errors[i]}
+      for i, rule in enumerate(rules)
+  ]
 
   return {
       "dataset": dataset_id,
       "table": table_id,
       "validations": validation_results,
+      "total_bytes_processed": (cost or {}).get("total_bytes_processed"),
+      "cost": cost,
   }
 
 
+def _partition_filter(table: "bigquery.Table", partition: str) -> str:
+  """Build a partition-pruning WHERE condition for a single partition.
+
+  Args:
+      table (bigquery.Table): Table with loaded metadata.
+      partition (str): Partition to restrict to: a date or timestamp such as
+        "2025-01-31" for time-partitioned tables, or the start of the range for
+        integer-range-partitioned tables.
+
+  Returns:
+      str: SQL condition selecting the partition.
+  """
+  if table.range_partitioning:
+    field = table.range_partitioning.field
+    interval = table.range_partitioning.range_.interval
+    start = int(partition)
+    return f"{field} >= {start} AND {field} < {start + interval}"
+
+  partitioning = table.time_partitioning
+  if not partitioning:
+    raise ValueError(f"Table {table.table_id} is not partitioned")
+
+  granularity = partitioning.type_ or "DAY"
+  if not partitioning.field:
+    return f"_PARTITIONTIME = TIMESTAMP('{partition}')"
+
+  field_type = next(
+      (f.field_type for f in table.schema if f.name == partitioning.field),
+      "TIMESTAMP",
+  )
+  field = partitioning.field
+  if field_type == "DATE":
+    return f"DATE_TRUNC({field}, {granularity}) = DATE('{partition}')"
+  if field_type == "DATETIME":
+    return f"DATETIME_TRUNC({field}, {granularity}) = DATETIME('{partition}')"
+  return f"TIMESTAMP_TRUNC({field}, {granularity}) = TIMESTAMP('{partition}')"
+
+
+def _partition_size(
+    client: "bigquery.Client",
+    table: "bigquery.Table",
+    partition: str,
+    cost: Dict[str, Any],
+) -> Tuple[Optional[int], Optional[int]]:
+  """Return the row count and logical bytes of one partition, if known.
+
+  Args:
+      client (bigquery.Client): BigQuery client.
+      table (bigquery.Table): Table with loaded metadata.
+      partition (str): Partition as accepted by `_partition_filter`.
+      cost (Dict[str, Any]): Cost record the metadata query is added to.
+
+  Returns:
+      Tuple[Optional[int], Optional[int]]: Rows and bytes of the partition, or
+      (None, None) if the partition ID cannot be derived or is not listed.
+  """
+  try:
+    if table.range_partitioning:
+      partition_id = str(int(partition))
+    else:
+      granularity = table.time_partitioning.type_ or "DAY"
+      partition_id = datetime.fromisoformat(partition).strftime(
+          _PARTITION_ID_FORMATS[granularity]
+      )
+  except (AttributeError, KeyError, ValueError):
+    return None, None
+
+  dataset_ref = f"{config.project_id}.{table.dataset_id}"
+  query = f"""
+        SELECT total_rows, total_logical_bytes
+        FROM `{dataset_ref}.INFORMATION_SCHEMA.PARTITIONS`
+        WHERE table_name = @table_name AND partition_id = @partition_id
+    """
+  job_config = bigquery.QueryJobConfig(
+      query_parameters=[
+          bigquery.ScalarQueryParameter("table_name", "STRING", table.table_id),
+          bigquery.ScalarQueryParameter(
+              "partition_id", "STRING", partition_id
+          ),
+      ]
+  )
+  rows, query_cost = run_query(client, query, job_config)
+  _add_cost(cost, query_cost)
+  records = to_records(rows)
+  if not records:
+    return None, None
+  return records[0]["total_rows"], records[0]["total_logical_bytes"]
+
+
 def sample_table_data_tool(
     dataset_id: str,
     table_id: str,
     sample_size: int = 10,
     random_seed: Optional[int] = None,
+    key_column: Optional[str] = None,
+    partition: Optional[str] = None,
 ) -> str:
-  """Sample data from a BigQuery table using RAND() function.
+  """Sample data from a BigQuery table without sorting the whole table.
+
+  Large tables are sampled with TABLESAMPLE SYSTEM, so only a few storage
+  blocks are read. With `partition`, the sampling fraction is based on the
+  size of that partition, read from INFORMATION_SCHEMA.PARTITIONS. When
+  `random_seed` is given, rows are picked by a hash of the key (or of the
+  whole row) salted with the seed, which is reproducible but reads every row
+  of the referenced columns. A sample that comes up short is retried with a
+  larger fraction, and the result carries a "warning" if it is still short.
 
   Args:
       dataset_id (str): The dataset ID.
@@ -197,43 +893,221 @@ def sample_table_data_tool(
       sample_size (int): Number of rows to sample. Defaults to 10.
       random_seed (Optional[int]): Seed for random sampling. If provided,
         ensures reproducible results.
+      key_column (Optional[str]): Column hashed for reproducible sampling.
+        Defaults to hashing the whole row.
+      partition (Optional[str]): Restrict sampling to one partition, e.g.
+        "2025-01-31" for a daily partitioned table.
 
   Returns:
-      str: JSON string containing sampled data.
+      str: JSON string containing sampled data and the query cost. If the
+      sample would exceed the byte budget, the error includes the estimate so
+      a cheaper sample (e.g. a single partition) can be requested instead.
   """
   try:
+    catalog_error = _catalog_error(
+        dataset_id, table_id, [key_column] if key_column else None
+    )
+    if catalog_error:
+      return json.dumps({"status": "error", "error": catalog_error}, indent=2)
+
     client = get_bigquery_client()
+    table_ref = f"{config.project_id}.{dataset_id}.{table_id}"
+    table = client.get_table(table_ref)
+    num_rows = table.num_rows or 0
+    num_bytes = table.num_bytes or 0
+    metadata_cost: Dict[str, Any] = {}
 
-    # Build the query with optional random seed
-    seed_clause = (
-        f"SET @seed = {random_seed};" if random_seed is not None else ""
+    partition_where = (
+        f"WHERE {_partition_filter(table, partition)}" if partition else ""
     )
-    query = f"""
-            {seed_clause}
-            SELECT *
-            FROM `{config.project_id}.{dataset_id}.{table_id}`
-            ORDER BY {'RAND(@seed)' if random_seed is not None else 'RAND()'}
+    if partition:
+      partition_rows, partition_bytes = _partition_size(
+          client, table, partition, metadata_cost
+      )
+      num_rows, num_bytes = partition_rows or 0, partition_bytes or 0
+    # Oversample so that block-level sampling still yields enough rows.
+    fraction = 1.0
+    if num_rows:
+      fraction = min(1.0, 4 * sample_size / num_rows)
+    tablesample_percent = None
+    hash_buckets = 1000000
+    hash_threshold = None
+
+    if random_seed is not None:
+      method = "hash"
+      hashed = (
+          f"CAST({key_column} AS STRING)" if key_column else "TO_JSON_STRING(t)"
+      )
+      fingerprint = f"FARM_FINGERPRINT(CONCAT({hashed}, '{random_seed}'))"
+      if fraction < 1.0:
+        hash_threshold = max(1, int(fraction * hash_buckets))
+      order_by = fingerprint
+    elif fraction < 1.0 and num_bytes >= config.bq_tablesample_min_bytes:
+      method = "tablesample"
+      tablesample_percent = round(max(fraction * 100, 0.001), 6)
+      order_by = "RAND()"
+    else:
+      method = "rand"
+      order_by = "RAND()"
+
+    while True:
+      where = partition_where
+      if hash_threshold is not None and hash_threshold < hash_buckets:
+        condition = (
+            f"MOD(ABS({fingerprint}), {hash_buckets}) < {hash_threshold}"
+        )
+        where = f"{where} AND {condition}" if where else f"WHERE {condition}"
+      tablesample = (
+          f"TABLESAMPLE SYSTEM ({tablesample_percent} PERCENT)"
+          if tablesample_percent
+          else ""
+      )
+      query = f"""
+            SELECT t.*
+            FROM `{table_ref}` AS t {tablesample}
+            {where}
+            ORDER BY {order_by}
             LIMIT {sample_size}
         """
+      bqstorage_client = get_bigquery_storage_client()
+      results, cost = RESULT_CACHE.run(
+          client, query, bqstorage_client=bqstorage_client
+      )
+      sample_data = to_records(results, bqstorage_client)
 
-    query_job = client.query(query)
-    results = query_job.result()
+      # Block and hash sampling can come up short on small samples; widen and
+      # retry. The hash threshold grows deterministically, so seeded samples
+      # stay reproducible.
+      if len(sample_data) >= sample_size:
+        break
+      if method == "tablesample" and tablesample_percent < 100:
+        tablesample_percent = min(100, tablesample_percent * 10)
+      elif method == "hash" and (hash_threshold or hash_buckets) < hash_buckets:
+        hash_threshold = min(hash_buckets, hash_threshold * 10)
+      else:
+        break
 
-    # Convert results to list of dictionaries
-    sample_data = [dict(row.items()) for row in results]
+    if metadata_cost:
+      cost = dict(cost)
+      _add_cost(cost, metadata_cost)
 
+    result = {
+        "status": "success",
+        "dataset": dataset_id,
+        "table": table_id,
+        "sample_size": sample_size,
+        "random_seed": random_seed,
+        "partition": partition,
+        "method": method,
+        "tablesample_percent": tablesample_percent,
+        "total_bytes_processed": cost["total_bytes_processed"],
+        "cost": cost,
+        "data": sample_data,
+    }
+    if len(sample_data) < sample_size:
+      result["warning"] = (
+          f"Only {len(sample_data)} of {sample_size} requested rows were"
+          " sampled; the table or partition may hold fewer rows."
+      )
+    return json.dumps(result, indent=2, default=str)
+
+  except QueryBudgetExceeded as e:
     return json.dumps(
         {
-            "status": "success",
-            "dataset": dataset_id,
-            "table": table_id,
-            "sample_size": sample_size,
-            "random_seed": random_seed,
-            "data": sample_data,
+            "status": "error",
+            "error": str(e),
+            "estimated_bytes_processed": e.estimated_bytes,
+            "limit_bytes": e.limit_bytes,
         },
         indent=2,
-        default=str,
     )
-
   except Exception as e:
     return json.dumps({"status": "error", "error": str(e)}, indent=2)
+
+
+def lookup_table_tool(
+    table_name: str, dataset_id: Optional[str] = None
+) -> Dict[str, Any]:
+  """Look up a table and its schema in the local BigQuery catalog.
+
+  Use this before querying to confirm that a table exists and to find the
+  correct name when unsure. Lookups are served from memory; a dataset that is
+  not in the catalog yet is loaded on first lookup.
+
+  Args:
+      table_name (str): Table name, optionally qualified as "dataset.table".
+      dataset_id (Optional[str]): Dataset to look in, if not part of
+        `table_name`.
+
+  Returns:
+      Dict[str, Any]: Whether the table exists, its schema, and close matches.
+      "exists" is None, with a "note", when the catalog cannot tell.
+  """
+  try:
+    if dataset_id is None and "." in table_name:
+      dataset_id, table_name = table_name.rsplit(".", 1)
+
+    result = {
+        "status": "success",
+        "dataset": dataset_id,
+        "table": table_name,
+        "exists": None,
+        "schema": None,
+        "suggestions": [],
+    }
+    if dataset_id is None:
+      result["note"] = (
+          "No dataset given; pass the table as 'dataset.table' to check it."
+      )
+      result["suggestions"] = CATALOG.suggest_tables(table_name)
+      return result
+
+    try:
+      schema = CATALOG.get_schema(dataset_id, table_name)
+    except api_exceptions.NotFound:
+      result["exists"] = False
+      result["note"] = f"Dataset '{dataset_id}' does not exist."
+      return result
+    except api_exceptions.GoogleAPIError as e:
+      result["note"] = f"Dataset '{dataset_id}' not in catalog: {e}"
+      return result
+
+    result["exists"] = schema is not None
+    result["schema"] = schema
+    if schema is None:
+      result["suggestions"] = CATALOG.suggest_tables(table_name, dataset_id)
+    return result
+
+  except Exception as e:
+    return {"status": "error", "error": str(e)}
+
+
+def refresh_catalog_tool(
+    dataset_ids: Optional[List[str]] = None,
+) -> Dict[str, Any]:
+  """Load or incrementally refresh datasets in the local BigQuery catalog.
+
+  Args:
+      dataset_ids (Optional[List[str]]): Datasets to refresh. Defaults to the
+        configured catalog datasets.
+
+  Returns:
+      Dict[str, Any]: Per-dataset counts of added, updated and removed tables.
+  """
+  results = {}
+  for dataset_id in dataset_ids or config.bq_catalog_datasets:
+    try:
+      results[dataset_id] = CATALOG.refresh(dataset_id)
+    except Exception as e:
+      results[dataset_id] = {"error": str(e)}
+  return {"status": "success", "datasets": results}
+
+
+def get_query_budget_tool() -> Dict[str, Any]:
+  """Get the BigQuery byte budget and how much of it this session has used.
+
+  Returns:
+      Dict[str, Any]: Per-query and per-session limits, bytes billed so far and
+      bytes remaining.
+  """
+  return {"status": "success", **current_budget().stats()}
@@ -6,6 +6,7 @@ Description: Callback functions for ADK agents - Mock implementations (Optimized
 '''
 from typing import Any, Dict
 from datetime import datetime
+from .bigquery_query import set_budget_session
 
 # 💡 解决方案 1：移除回调函数定义中的特定参数，只使用 **kwargs
 # 这样可以兼容 ADK 传入的任何参数 (包括 callback_context, trace_id, 等)
@@ -50,4 +51,19 @@ def failure_alert(**kwargs) -> Dict[str, Any]:
     else:
         return {
             "alert_sent": False,
-        }
\ No newline at end of file
+        }
+
+
+def bind_query_budget(**kwargs) -> None:
+    """Before-tool callback - charges BigQuery scans to the caller's session.
+
+    Records the ADK session of the tool call, so that the per-session byte
+    budget of `bigquery_query` is kept per session instead of per process.
+    """
+    tool_context = kwargs.get("tool_context")
+    session = getattr(tool_context, "session", None)
+    if session is None:
+        invocation_context = getattr(tool_context, "_invocation_context", None)
+        session = getattr(invocation_context, "session", None)
+    set_budget_session(getattr(session, "id", None))
+    return None
@@ -0,0 +1,208 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""This module provides a process-wide registry of pooled Google Cloud clients.
+
+Tool modules register a factory for each client kind (GCS, BigQuery, Dataform)
+and fetch clients through the shared registry. Clients are built lazily on first
+use and cached by (kind, project, location, credentials), so repeated tool calls
+reuse the same authenticated HTTP session instead of paying auth and TLS setup
+on every call.
+"""
+
+import atexit
+import threading
+from typing import TYPE_CHECKING, Any, Callable, Dict, Optional, Tuple
+
+from ..config import config
+from .lazy_import import lazy_import
+
+if TYPE_CHECKING:
+  import google.auth as google_auth
+  from google.auth import credentials as auth_credentials
+  from google.auth.transport import requests as auth_requests
+  from requests import adapters as requests_adapters
+else:
+  google_auth = lazy_import("google.auth")
+  auth_credentials = lazy_import("google.auth.credentials")
+  auth_requests = lazy_import("google.auth.transport.requests")
+  requests_adapters = lazy_import("requests.adapters")
+
+CLOUD_PLATFORM_SCOPES = ("https://www.googleapis.com/auth/cloud-platform",)
+
+ClientKey = Tuple[str, Optional[str], Optional[str], Any]
+
+
+def create_pooled_session(
+    credentials: Optional[Any] = None, pool_size: Optional[int] = None
+) -> "auth_requests.AuthorizedSession":
+  """Create an authorized HTTP session with a bounded connection pool.
+
+  Args:
+      credentials (Optional[Any]): Credentials to authorize requests with. If
+        None, application default credentials are used.
+      pool_size (Optional[int]): Maximum number of pooled connections per host.
+        Defaults to `config.http_pool_size`.
+
+  Returns:
+      AuthorizedSession: Session suitable for the `_http` argument of the
+      HTTP-based Google Cloud clients.
+  """
+  if credentials is None:
+    credentials, _ = google_auth.default(scopes=CLOUD_PLATFORM_SCOPES)
+  else:
+    credentials = auth_credentials.with_scopes_if_required(
+        credentials, CLOUD_PLATFORM_SCOPES
+    )
+
+  pool_size = pool_size or config.http_pool_size
+  session = auth_requests.AuthorizedSession(credentials)
+  adapter = requests_adapters.HTTPAdapter(
+      pool_connections=pool_size, pool_maxsize=pool_size
+  )
+  session.mount("https://", adapter)
+  return session
+
+
+def _close_client(client: Any) -> None:
+  """Release the network resources held by a client."""
+  close = getattr(client, "close", None)
+  if close is None:
+    transport = getattr(client, "transport", None)
+    close = getattr(transport, "close", None)
+  if close is not None:
+    close()
+
+
+class ClientRegistry:
+  """Thread-safe, lazily populated registry of shared clients."""
+
+  def __init__(self):
+    self._lock = threading.RLock()
+    self._factories: Dict[str, Callable[..., Any]] = {}
+    self._probes: Dict[str, Optional[Callable[[Any], Any]]] = {}
+    self._clients: Dict[ClientKey, Any] = {}
+
+  def register(
+      self,
+      kind: str,
+      factory: Callable[..., Any],
+      probe: Optional[Callable[[Any], Any]] = None,
+  ) -> None:
+    """Register how to build (and optionally probe) a kind of client.
+
+    Args:
+        kind (str): Name of the client kind, e.g. "storage".
+        factory (Callable[..., Any]): Called with `project`, `location`,
+          `credentials` and `pool_size` keyword arguments to build a client.
+        probe (Optional[Callable[[Any], Any]]): Cheap call used by
+          `health_check`; it should raise if the client is unusable.
+    """
+    with self._lock:
+      self._factories[kind] = factory
+      self._probes[kind] = probe
+
+  def get(
+      self,
+      kind: str,
+      project: Optional[str] = None,
+      location: Optional[str] = None,
+      credentials: Optional[Any] = None,
+      pool_size: Optional[int] = None,
+  ) -> Any:
+    """Get the shared client for a key, building it on first use.
+
+    Args:
+        kind (str): Registered client kind.
+        project (Optional[str]): Project ID. Defaults to `config.project_id`.
+        location (Optional[str]): Location the client is bound to, if any.
+        credentials (Optional[Any]): Explicit credentials, if any.
+        pool_size (Optional[int]): Connection pool size used when the client is
+          first built. Defaults to `config.http_pool_size`.
+
+    Returns:
+        Any: The shared client instance.
+    """
+    key = (kind, project or config.project_id, location, credentials)
+    client = self._clients.get(key)
+    if client is not None:
+      return client
+
+    with self._lock:
+      client = self._clients.get(key)
+      if client is None:
+        if kind not in self._factories:
+          raise KeyError(f"No client factory registered for '{kind}'")
+        client = self._factories[kind](
+            project=key[1],
+            location=location,
+            credentials=credentials,
+            pool_size=pool_size or config.http_pool_size,
+        )
+        self._clients[key] = client
+      return client
+
+  def health_check(self, kind: Optional[str] = None) -> Dict[str, bool]:
+    """Probe the live clients and evict the ones that fail.
+
+    Evicted clients are closed and rebuilt on the next `get`.
+
+    Args:
+        kind (Optional[str]): Only check clients of this kind.
+
+    Returns:
+        Dict[str, bool]: Health of each checked client, keyed by
+        "kind:project:location".
+    """
+    with self._lock:
+      entries = [
+          (key, client)
+          for key, client in self._clients.items()
+          if kind is None or key[0] == kind
+      ]
+
+    health = {}
+    for key, client in entries:
+      probe = self._probes.get(key[0])
+      healthy = True
+      if probe is not None:
+        try:
+          probe(client)
+        except Exception:
+          healthy = False
+      if not healthy:
+        self.evict(key)
+      health[f"{key[0]}:{key[1]}:{key[2] or ''}"] = healthy
+    return health
+
+  def evict(self, key: ClientKey) -> None:
+    """Close and drop a single client."""
+    with self._lock:
+      client = self._clients.pop(key, None)
+    if client is not None:
+      try:
+        _close_client(client)
+      except Exception as e:
+        print(f"Error closing client {key[0]}: {e}")
+
+  def shutdown(self) -> None:
+    """Close every client held by the registry."""
+    with self._lock:
+      keys = list(self._clients)
+    for key in keys:
+      self.evict(key)
+
+
+CLIENT_REGISTRY = ClientRegistry()
+atexit.register(CLIENT_REGISTRY.shutdown)
@@ -0,0 +1,103 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""This module provides streaming decompression for compressed objects.
+
+Compression is detected from the object's content encoding or file extension,
+and decompression wraps a binary stream so callers can iterate lines with memory
+bounded by the line length rather than the decompressed payload. gzip is always
+available; zstd requires the optional `zstandard` package. Other content
+encodings are rejected rather than read as raw bytes.
+"""
+
+import gzip
+import io
+from typing import BinaryIO, Optional
+
+from .lazy_import import lazy_import
+
+zstandard = lazy_import("zstandard", optional=True)
+
+_ENCODINGS = {
+    "gzip": "gzip",
+    "x-gzip": "gzip",
+    "zstd": "zstd",
+}
+
+_EXTENSIONS = {
+    ".gz": "gzip",
+    ".gzip": "gzip",
+    ".zst": "zstd",
+    ".zstd": "zstd",
+}
+
+
+def detect_compression(
+    name: str, content_encoding: Optional[str] = None
+) -> Optional[str]:
+  """Detect the compression of an object.
+
+  Args:
+      name (str): Object name; its extension is used as a fallback.
+      content_encoding (Optional[str]): Content-Encoding metadata, if any.
+
+  Returns:
+      Optional[str]: "gzip", "zstd", or None for uncompressed objects.
+
+  Raises:
+      ValueError: If the content encoding is one that cannot be decompressed,
+        e.g. "br" or "deflate". Raw downloads return the stored bytes, which
+        would otherwise be read as garbage.
+  """
+  encoding = (content_encoding or "").strip().lower()
+  if encoding and encoding != "identity":
+    kind = _ENCODINGS.get(encoding)
+    if kind is None:
+      raise ValueError(f"Unsupported content encoding: {content_encoding}")
+    return kind
+  lowered = name.lower()
+  for extension, kind in _EXTENSIONS.items():
+    if lowered.endswith(extension):
+      return kind
+  return None
+
+
+def open_decompressed(raw: BinaryIO, compression: Optional[str]) -> BinaryIO:
+  """Wrap a raw binary stream so that reads return decompressed bytes.
+
+  The returned stream supports `read`, `readline` and line iteration, and holds
+  at most one compressed block and one line in memory at a time.
+
+  Args:
+      raw (BinaryIO): Stream of the stored (compressed) bytes.
+      compression (Optional[str]): Value returned by `detect_compression`.
+
+  Returns:
+      BinaryIO: Stream of decompressed bytes.
+  """
+  if compression is None:
+    return raw
+  if compression == "gzip":
+    # GzipFile also handles multi-member files produced by concatenation.
+    return gzip.GzipFile(fileobj=raw, mode="rb")
+  if compression == "zstd":
+    if zstandard is None:
+      raise ValueError(
+          "Reading zstd-compressed objects requires the 'zstandard' package"
+      )
+    reader = zstandard.ZstdDecompressor().stream_reader(
+        raw, read_across_frames=True
+    )
+    return io.BufferedReader(reader)
+  raise ValueError(f"Unsupported compression: {compression}")
@@ -0,0 +1,209 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""This module provides the dependency graph of compiled Dataform actions.
+
+Compilation actions are parsed into nodes keyed by their target, each with its
+dependencies and a hash of the SQL (or other contents) it runs. Comparing the
+hashes with those of the compilation that was last invoked tells which actions
+changed, so that an invocation can be restricted to them and everything
+downstream of them. The hashes of the last invoked compilation are kept per
+workspace in the local cache directory.
+"""
+
+import hashlib
+import json
+import os
+from typing import Any, Dict, Iterable, List, Optional
+
+from ..config import config
+from .disk_cache import atomic_write
+
+_STATE_DIR = os.path.join(config.cache_dir, "dataform_dag")
+
+# The oneof members of a compilation result action, in the order checked.
+_ACTION_KINDS = (
+    "relation",
+    "operations",
+    "assertion",
+    "declaration",
+    "notebook",
+    "data_preparation",
+)
+
+
+def target_id(target: Any) -> str:
+  """Return "database.schema.name" for a Dataform target."""
+  parts = (target.database, target.schema, target.name)
+  return ".".join(p for p in parts if p)
+
+
+def _action_contents(kind: str, compiled: Any) -> List[str]:
+  """Return the parts of an action that determine what it runs."""
+  if kind == "relation":
+    # Partitioning, clustering, options and `disabled` change the created
+    # table as much as the SQL does, so the whole relation is hashed.
+    return [type(compiled).to_json(compiled, sort_keys=True)]
+  if kind == "operations":
+    return list(compiled.queries)
+  if kind == "assertion":
+    return [compiled.select_query]
+  if kind == "notebook":
+    return [compiled.contents]
+  if kind == "data_preparation":
+    return [str(compiled)]
+  return []
+
+
+def build_action_graph(actions: Iterable[Any]) -> Dict[str, Dict[str, Any]]:
+  """Parse compilation result actions into a dependency graph.
+
+  Args:
+      actions (Iterable[Any]): `CompilationResultAction`s of a compilation.
+
+  Returns:
+      Dict[str, Dict[str, Any]]: Nodes keyed by target ID, each with its
+      "type", "file_path", the target IDs it "depends_on", a "sql_hash" of
+      its contents (None for declarations) and the original "ref" target.
+  """
+  graph = {}
+  for action in actions:
+    kind = next((k for k in _ACTION_KINDS if k in action), None)
+    compiled = getattr(action, kind) if kind else None
+    sql_hash = None
+    if kind and kind != "declaration":
+      payload = json.dumps([kind] + _action_contents(kind, compiled))
+      sql_hash = hashlib.sha256(payload.encode("utf-8")).hexdigest()[:16]
+    depends_on = getattr(compiled, "dependency_targets", None) or []
+    graph[target_id(action.target)] = {
+        "type": kind,
+        "file_path": action.file_path,
+        "depends_on": [target_id(t) for t in depends_on],
+        "sql_hash": sql_hash,
+        "ref": action.target,
+    }
+  return graph
+
+
+def describe_graph(graph: Dict[str, Dict[str, Any]]) -> List[Dict[str, Any]]:
+  """Return the graph as JSON-friendly nodes in dependency order."""
+  return [
+      {
+          "target": target,
+          "type": graph[target]["type"],
+          "file_path": graph[target]["file_path"],
+          "depends_on": graph[target]["depends_on"],
+      }
+      for target in topological_order(graph)
+  ]
+
+
+def topological_order(graph: Dict[str, Dict[str, Any]]) -> List[str]:
+  """Order targets so that each comes after its dependencies.
+
+  Dependencies outside the graph are ignored, and targets on a cycle are
+  appended in their original order.
+  """
+  order: List[str] = []
+  state: Dict[str, bool] = {}  # False while visiting, True once placed.
+  for root in graph:
+    if root in state:
+      continue
+    state[root] = False
+    stack = [(root, iter(graph[root]["depends_on"]))]
+    while stack:
+      node, deps = stack[-1]
+      dep = next(deps, None)
+      if dep is None:
+        stack.pop()
+        state[node] = True
+        order.append(node)
+      elif dep in graph and dep not in state:
+        state[dep] = False
+        stack.append((dep, iter(graph[dep]["depends_on"])))
+  return order
+
+
+def downstream_of(
+    graph: Dict[str, Dict[str, Any]], targets: Iterable[str]
+) -> List[str]:
+  """Return the targets and everything depending on them, in run order."""
+  dependents: Dict[str, List[str]] = {}
+  for target, node in graph.items():
+    for dep in node["depends_on"]:
+      dependents.setdefault(dep, []).append(target)
+  selected = set()
+  pending = [t for t in targets if t in graph]
+  while pending:
+    target = pending.pop()
+    if target not in selected:
+      selected.add(target)
+      pending.extend(dependents.get(target, []))
+  return [t for t in topological_order(graph) if t in selected]
+
+
+def changed_targets(
+    graph: Dict[str, Dict[str, Any]], previous_hashes: Dict[str, str]
+) -> List[str]:
+  """Return the runnable targets that are new or whose contents changed."""
+  return [
+      target
+      for target in topological_order(graph)
+      if graph[target]["sql_hash"] is not None
+      and previous_hashes.get(target) != graph[target]["sql_hash"]
+  ]
+
+
+def _state_path(workspace_path: str) -> str:
+  digest = hashlib.sha256(workspace_path.encode("utf-8")).hexdigest()
+  return os.path.join(_STATE_DIR, f"{digest}.json")
+
+
+def load_invoked_state(workspace_path: str) -> Optional[Dict[str, Any]]:
+  """Return the hashes and invocation name of the last invoked compilation.
+
+  Returns None if there is no baseline or its state file is unreadable.
+  """
+  path = _state_path(workspace_path)
+  if not os.path.exists(path):
+    return None
+  try:
+    with open(path, "r", encoding="utf-8") as f:
+      state = json.load(f)
+  except (OSError, ValueError) as e:
+    print(f"Ignoring unreadable Dataform state '{path}': {e}")
+    return None
+  if not isinstance(state, dict) or not isinstance(state.get("hashes"), dict):
+    print(f"Ignoring malformed Dataform state '{path}'")
+    return None
+  return state
+
+
+def save_invoked_state(
+    workspace_path: str,
+    graph: Dict[str, Dict[str, Any]],
+    workflow_invocation: str,
+) -> None:
+  """Record the compilation that was just invoked as the new baseline."""
+  state = {
+      "hashes": {
+          target: node["sql_hash"]
+          for target, node in graph.items()
+          if node["sql_hash"] is not None
+      },
+      "workflow_invocation": workflow_invocation,
+  }
+  with atomic_write(_state_path(workspace_path)) as tmp_path:
+    with open(tmp_path, "w", encoding="utf-8") as f:
+      json.dump(state, f, sort_keys=True)
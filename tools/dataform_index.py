@@ -0,0 +1,254 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""This module provides an in-memory index of Dataform workspace files.
+
+The index holds the sorted paths of a workspace's files, a bounded cache of
+their contents and the hashes of the files this process wrote. It is loaded
+with a single file listing and then kept current by the writes and removals
+this process makes, so searches and repeated reads are served locally. Changes made elsewhere (the Dataform UI, git pulls) are
+picked up when the index expires after `config.dataform_index_ttl_seconds`.
+"""
+
+import bisect
+import collections
+import concurrent.futures
+import fnmatch
+import hashlib
+import re
+import threading
+import time
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from ..config import config
+
+_MATCH_MODES = ("substring", "prefix", "glob", "regex")
+
+# Upper bound on the file contents kept in memory per workspace.
+_CONTENT_CACHE_MAX_BYTES = 64 * 1024**2
+
+
+class WorkspaceIndex:
+  """File paths and recently read contents of one Dataform workspace."""
+
+  def __init__(
+      self,
+      ttl_seconds: float,
+      max_content_bytes: int = _CONTENT_CACHE_MAX_BYTES,
+  ):
+    self.ttl_seconds = ttl_seconds
+    self.max_content_bytes = max_content_bytes
+    self._lock = threading.Lock()
+    self._paths: Optional[List[str]] = None
+    self._loaded_at = 0.0
+    # Path -> (time cached, contents), least recently used first.
+    self._contents: "collections.OrderedDict[str, Tuple[float, bytes]]" = (
+        collections.OrderedDict()
+    )
+    self._content_bytes = 0
+    # Path -> (time written, content hash) of files this process wrote; kept
+    # for files too large to cache and after their contents are evicted.
+    self._written: Dict[str, Tuple[float, str]] = {}
+    # Bumped by every local change, so that a read racing with a write does
+    # not cache the old contents.
+    self._changes = 0
+
+  def _expired(self) -> bool:
+    return (
+        self._paths is None
+        or time.monotonic() - self._loaded_at >= self.ttl_seconds
+    )
+
+  def load(self, paths: Iterable[str]) -> None:
+    """Replace the indexed paths with a fresh listing."""
+    with self._lock:
+      self._paths = sorted(set(paths))
+      self._loaded_at = time.monotonic()
+
+  def paths(self, list_files: Callable[[], Iterable[str]]) -> List[str]:
+    """Return all indexed paths, listing the workspace if the index expired."""
+    with self._lock:
+      if not self._expired():
+        return list(self._paths)
+    self.load(list_files())
+    with self._lock:
+      return list(self._paths)
+
+  def search(
+      self,
+      list_files: Callable[[], Iterable[str]],
+      pattern: Optional[str] = None,
+      match: str = "substring",
+  ) -> List[str]:
+    """Return the indexed paths matching a pattern.
+
+    Args:
+        list_files (Callable[[], Iterable[str]]): Lists the workspace; called
+          only if the index has expired.
+        pattern (Optional[str]): Pattern to match; all paths if None.
+        match (str): How to match `pattern`: "substring", "prefix", "glob"
+          (where `*` also matches `/`) or "regex" (searched anywhere in the
+          path).
+
+    Raises:
+        ValueError: If `match` is unknown or `pattern` is not a valid regex.
+    """
+    if match not in _MATCH_MODES:
+      raise ValueError(f"Unknown match mode: {match}")
+    paths = self.paths(list_files)
+    if not pattern:
+      return paths
+    if match == "prefix":
+      start = bisect.bisect_left(paths, pattern)
+      end = start
+      while end < len(paths) and paths[end].startswith(pattern):
+        end += 1
+      return paths[start:end]
+    if match == "glob":
+      return [p for p in paths if fnmatch.fnmatchcase(p, pattern)]
+    if match == "regex":
+      try:
+        regex = re.compile(pattern)
+      except re.error as e:
+        raise ValueError(f"Invalid regex '{pattern}': {e}") from e
+      return [p for p in paths if regex.search(p)]
+    return [p for p in paths if pattern in p]
+
+  def _fresh(self, cached_at: float) -> bool:
+    return time.monotonic() - cached_at < self.ttl_seconds
+
+  def read(self, path: str, read_file: Callable[[str], bytes]) -> bytes:
+    """Return a file's contents, reading and caching them on a miss.
+
+    Cached contents expire after the same TTL as the path listing.
+    """
+    with self._lock:
+      entry = self._contents.get(path)
+      if entry is not None and self._fresh(entry[0]):
+        self._contents.move_to_end(path)
+        return entry[1]
+      changes = self._changes
+    contents = read_file(path)
+    with self._lock:
+      if changes == self._changes:
+        self._cache(path, contents)
+    return contents
+
+  def fingerprint(
+      self,
+      list_files: Callable[[], Iterable[str]],
+      read_file: Callable[[str], bytes],
+      trust_written: bool = True,
+      max_workers: int = 8,
+  ) -> str:
+    """Return a hash of the current paths and contents of the workspace.
+
+    The workspace is always listed again, and its files are read again except,
+    with `trust_written`, those this process wrote within the TTL. Contents
+    cached from earlier reads are never used, since they may have been edited
+    elsewhere since. The index is refreshed with what was listed and read.
+    """
+    paths = sorted(set(list_files()))
+    self.load(paths)
+    hashes = {}
+    if trust_written:
+      with self._lock:
+        hashes = {
+            path: self._written[path][1]
+            for path in paths
+            if path in self._written and self._fresh(self._written[path][0])
+        }
+    missing = [path for path in paths if path not in hashes]
+    if missing:
+
+      def read(path: str) -> bytes:
+        with self._lock:
+          changes = self._changes
+        contents = read_file(path)
+        with self._lock:
+          if changes == self._changes:
+            self._cache(path, contents)
+        return contents
+
+      workers = max(1, min(max_workers, len(missing)))
+      with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as pool:
+        for path, data in zip(missing, pool.map(read, missing)):
+          hashes[path] = hashlib.sha256(data).hexdigest()
+    digest = hashlib.sha256()
+    for path in paths:
+      digest.update(f"{path}\0{hashes[path]}\0".encode("utf-8"))
+    return digest.hexdigest()
+
+  def _cache(self, path: str, contents: bytes) -> None:
+    self._forget(path)
+    if len(contents) > self.max_content_bytes:
+      return
+    self._contents[path] = (time.monotonic(), contents)
+    self._content_bytes += len(contents)
+    while self._content_bytes > self.max_content_bytes:
+      _, (_, evicted) = self._contents.popitem(last=False)
+      self._content_bytes -= len(evicted)
+
+  def _forget(self, path: str) -> None:
+    entry = self._contents.pop(path, None)
+    if entry is not None:
+      self._content_bytes -= len(entry[1])
+
+  def written(self, path: str, contents: bytes) -> None:
+    """Record a file written by this process."""
+    with self._lock:
+      self._changes += 1
+      if self._paths is not None:
+        i = bisect.bisect_left(self._paths, path)
+        if i == len(self._paths) or self._paths[i] != path:
+          self._paths.insert(i, path)
+      self._cache(path, contents)
+      self._written[path] = (
+          time.monotonic(),
+          hashlib.sha256(contents).hexdigest(),
+      )
+
+  def removed(self, path: str) -> None:
+    """Record a file removed by this process."""
+    with self._lock:
+      self._changes += 1
+      if self._paths is not None:
+        i = bisect.bisect_left(self._paths, path)
+        if i < len(self._paths) and self._paths[i] == path:
+          del self._paths[i]
+      self._forget(path)
+      self._written.pop(path, None)
+
+  def invalidate(self) -> None:
+    """Forget everything, so the next access lists the workspace again."""
+    with self._lock:
+      self._changes += 1
+      self._paths = None
+      self._contents.clear()
+      self._written.clear()
+      self._content_bytes = 0
+
+
+_INDEXES: Dict[str, WorkspaceIndex] = {}
+_INDEXES_LOCK = threading.Lock()
+
+
+def workspace_index(workspace_path: str) -> WorkspaceIndex:
+  """Return the index of a workspace, creating it on first use."""
+  with _INDEXES_LOCK:
+    index = _INDEXES.get(workspace_path)
+    if index is None:
+      index = WorkspaceIndex(config.dataform_index_ttl_seconds)
+      _INDEXES[workspace_path] = index
+    return index
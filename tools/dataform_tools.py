@@ -19,22 +19,147 @@ within LLM-generated output, uploading and compiling those files in Dataform,
 and attempting to automatically fix compilation errors using an LLM.
 """
 
-from typing import Any, Dict, List, Optional
-from google.api_core.exceptions import GoogleAPIError
-from google.cloud import dataform_v1
+import collections
+import concurrent.futures
+import hashlib
+import json
+import os
+import threading
+import time
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple
 from ..config import config
+from .client_pool import CLIENT_REGISTRY
+from .dataform_dag import (
+    build_action_graph,
+    changed_targets,
+    describe_graph,
+    downstream_of,
+    load_invoked_state,
+    save_invoked_state,
+    target_id,
+    topological_order,
+)
+from .dataform_index import workspace_index
+from .dataform_watcher import watch_invocation
+from .disk_cache import atomic_write
+from .lazy_import import lazy_import
+
+if TYPE_CHECKING:
+  from google.api_core import exceptions as api_exceptions
+  from google.cloud import dataform_v1
+else:
+  api_exceptions = lazy_import("google.api_core.exceptions")
+  dataform_v1 = lazy_import("google.cloud.dataform_v1")
+
+# Hashes of the files last synced to each workspace, keyed by workspace path.
+_SYNC_MANIFEST_DIR = os.path.join(config.cache_dir, "dataform_sync")
+_SYNC_MANIFEST_LOCK = threading.Lock()
+
+# Recent compilations keyed by workspace path and content fingerprint.
+_COMPILATION_CACHE_SIZE = 16
+_COMPILATION_CACHE: "collections.OrderedDict[str, Dict[str, Any]]" = (
+    collections.OrderedDict()
+)
+_COMPILATION_CACHE_LOCK = threading.Lock()
+
+# Action states of an earlier invocation after which the action is run again,
+# even if its SQL is unchanged. PENDING and RUNNING are included because the
+# baseline moves on as soon as an invocation is created: an action still in
+# flight would otherwise never be checked again if it later fails.
+_RERUN_ACTION_STATES = ("FAILED", "CANCELLED", "SKIPPED", "PENDING", "RUNNING")
+
+
+def _create_dataform_client(
+    project: str, location: Optional[str], credentials: Any, pool_size: int
+) -> "dataform_v1.DataformClient":
+  """Build a Dataform client.
+
+  The Dataform client talks gRPC over a single multiplexed channel, so the HTTP
+  pool size does not apply to it.
+  """
+  return dataform_v1.DataformClient(credentials=credentials)
+
+
+CLIENT_REGISTRY.register(
+    "dataform",
+    _create_dataform_client,
+    probe=lambda client: client.get_repository(
+        name=client.repository_path(
+            config.project_id, config.location, config.repository_name
+        )
+    ),
+)
+
+
+def get_dataform_client() -> "dataform_v1.DataformClient":
+  """Get the shared Dataform client."""
+  return CLIENT_REGISTRY.get("dataform", project=config.project_id)
 
-DATAFORM_CLIENT = dataform_v1.DataformClient()
 
 def get_workspace_path() -> str:
   """Get the workspace path using configuration."""
-  return DATAFORM_CLIENT.workspace_path(
+  return get_dataform_client().workspace_path(
       config.project_id,
       config.location,
       config.repository_name,
       config.workspace_name,
   )
 
+def _write_file(
+    file_path: str, contents: bytes, forget_synced: bool = True
+) -> None:
+  """Write a file to the workspace, raising on failure.
+
+  `forget_synced` is False for writes made by a sync, which records the new
+  hashes itself.
+  """
+  workspace_path = get_workspace_path()
+  request = dataform_v1.WriteFileRequest(
+      workspace=workspace_path,
+      path=file_path,
+      contents=contents,
+  )
+  get_dataform_client().write_file(request=request)
+  workspace_index(workspace_path).written(file_path, contents)
+  if forget_synced:
+    _forget_synced_file(workspace_path, file_path)
+
+
+def _read_file(file_path: str) -> bytes:
+  """Read a file from the workspace, raising on failure."""
+  request = dataform_v1.ReadFileRequest(
+      workspace=get_workspace_path(),
+      path=file_path,
+  )
+  return get_dataform_client().read_file(request=request).file_contents
+
+
+def _remove_file(file_path: str, forget_synced: bool = True) -> None:
+  """Remove a file from the workspace, raising on failure.
+
+  `forget_synced` is False for removals made by a sync, which rewrites the
+  manifest itself.
+  """
+  workspace_path = get_workspace_path()
+  request = dataform_v1.RemoveFileRequest(
+      workspace=workspace_path,
+      path=file_path,
+  )
+  get_dataform_client().remove_file(request=request)
+  workspace_index(workspace_path).removed(file_path)
+  if forget_synced:
+    _forget_synced_file(workspace_path, file_path)
+
+
+def _list_files() -> List[str]:
+  """List every file in the workspace, raising on failure."""
+  request = dataform_v1.SearchFilesRequest(
+      workspace=get_workspace_path(),
+  )
+  response = get_dataform_client().search_files(request=request)
+  return [result.file.path for result in response if result.file]
+
+
 def write_file_to_dataform(file_content: str, file_path: str) -> str:
   """Upload a file to Dataform.
 
@@ -45,18 +170,12 @@ def write_file_to_dataform(file_content: str, file_path: str) -> str:
   Returns:
       str: Result of the upload operation.
   """
-  workspace_path = get_workspace_path()
   print(f"Uploading file: {file_path}")
   try:
-    request = dataform_v1.WriteFileRequest(
-        workspace=workspace_path,
-        path=file_path,
-        contents=file_content.encode("utf-8"),
-    )
-    DATAFORM_CLIENT.write_file(request=request)
+    _write_file(file_path, file_content.encode("utf-8"))
     print(f"File Uploaded: {file_path}")
     return f"File Uploaded: {file_path}"
-  except GoogleAPIError as e:
+  except api_exceptions.GoogleAPIError as e:
     error_msg = f"Error uploading file '{file_path}': {e}"
     print(error_msg)
     return error_msg
@@ -71,91 +190,409 @@ def delete_file_from_dataform(file_path: str) -> str:
   Returns:
       str: Result of the deletion operation.
   """
-  workspace_path = get_workspace_path()
-  request = dataform_v1.RemoveFileRequest(
-      workspace=workspace_path,
-      path=file_path,
-  )
   try:
-    DATAFORM_CLIENT.remove_file(request=request)
+    _remove_file(file_path)
     print(f"File Deleted: {file_path}")
     return f"File Deleted: {file_path}"
-  except GoogleAPIError as e:
+  except api_exceptions.GoogleAPIError as e:
     error_msg = f"Error deleting file '{file_path}': {e}"
     print(error_msg)
     return error_msg
 
 
-def compile_dataform(compile_only: bool = False) -> Dict[str, Any]:
-  """Compile Dataform pipeline and get overview of the pipeline DAG.
+def _content_hash(contents: bytes) -> str:
+  return hashlib.sha256(contents).hexdigest()
+
+
+def _sync_manifest_path(workspace_path: str) -> str:
+  digest = hashlib.sha256(workspace_path.encode("utf-8")).hexdigest()
+  return os.path.join(_SYNC_MANIFEST_DIR, f"{digest}.json")
+
+
+def _load_sync_manifest(workspace_path: str) -> Dict[str, str]:
+  path = _sync_manifest_path(workspace_path)
+  if not os.path.exists(path):
+    return {}
+  with open(path, "r", encoding="utf-8") as f:
+    return json.load(f)
+
+
+def _save_sync_manifest(workspace_path: str, manifest: Dict[str, str]) -> None:
+  with atomic_write(_sync_manifest_path(workspace_path)) as tmp_path:
+    with open(tmp_path, "w", encoding="utf-8") as f:
+      json.dump(manifest, f, sort_keys=True)
+
+
+def _forget_synced_file(workspace_path: str, file_path: str) -> None:
+  """Drop a file's recorded hash after it was written or removed.
+
+  The next sync then compares the file against the workspace contents instead
+  of a hash that may no longer match them.
+  """
+  with _SYNC_MANIFEST_LOCK:
+    manifest = _load_sync_manifest(workspace_path)
+    if manifest.pop(file_path, None) is not None:
+      _save_sync_manifest(workspace_path, manifest)
+
+
+def _read_local_dir(local_dir: str) -> Dict[str, bytes]:
+  """Read every file under a directory, keyed by its "/"-separated path."""
+  files = {}
+  for root, dirs, names in os.walk(local_dir):
+    dirs[:] = sorted(
+        d for d in dirs if not d.startswith(".") and d != "node_modules"
+    )
+    for name in sorted(names):
+      if name.startswith("."):
+        continue
+      path = os.path.join(root, name)
+      relative = os.path.relpath(path, local_dir).replace(os.sep, "/")
+      with open(path, "rb") as f:
+        files[relative] = f.read()
+  return files
+
+
+def sync_files_to_dataform(
+    files: Optional[Dict[str, str]] = None,
+    local_dir: Optional[str] = None,
+    verify: bool = False,
+    max_workers: int = 8,
+) -> Dict[str, Any]:
+  """Sync many files to the Dataform workspace, writing only what changed.
+
+  The workspace file list is read once. Files are compared by content hash
+  against the hashes recorded by the previous sync (or, with `verify`, against
+  the workspace contents), and only new or changed files are written. Files
+  written by a previous sync that are no longer part of the input are removed.
+  Writes and removals run concurrently.
+
+  Writes and deletions made through the other tools of this module are taken
+  into account, but edits made outside this process (the Dataform UI, git
+  pulls, another agent) are not: use `verify=True` after those.
 
   Args:
-      compile_only (bool): If True, only compile without execution.
+      files (Optional[Dict[str, str]]): Mapping of workspace path to content.
+      local_dir (Optional[str]): Local directory whose files are synced, with
+        paths relative to it. Hidden files and node_modules are skipped.
+      verify (bool): Read existing workspace files to compare contents instead
+        of trusting the recorded hashes. Needed when the workspace may have
+        been edited outside this process. Defaults to False.
+      max_workers (int): Maximum number of concurrent requests. Defaults to 8.
 
   Returns:
-      Dict[str, Any]: Compilation results including status and pipeline DAG.
+      Dict[str, Any]: Per-file action ("write", "delete" or "unchanged"),
+      status and duration, and counts per action.
   """
   try:
-    repository_path = DATAFORM_CLIENT.repository_path(
-        config.project_id, config.location, config.repository_name
+    if (files is None) == (local_dir is None):
+      raise ValueError("Provide exactly one of 'files' or 'local_dir'")
+    desired = (
+        _read_local_dir(local_dir)
+        if local_dir is not None
+        else {path: content.encode("utf-8") for path, content in files.items()}
     )
     workspace_path = get_workspace_path()
+    manifest = _load_sync_manifest(workspace_path)
+    existing = set(_list_files())
+    workers = max(1, min(max_workers, len(desired) or 1))
+
+    def remote_hash(path: str) -> Optional[str]:
+      if not verify and path in manifest:
+        return manifest[path]
+      try:
+        return _content_hash(_read_file(path))
+      except api_exceptions.GoogleAPIError:
+        return None
+
+    to_compare = [path for path in desired if path in existing]
+    with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as pool:
+      remote_hashes = dict(zip(to_compare, pool.map(remote_hash, to_compare)))
+
+    hashes = {path: _content_hash(data) for path, data in desired.items()}
+    operations = [
+        ("write", path)
+        for path in desired
+        if remote_hashes.get(path) != hashes[path]
+    ] + [
+        ("delete", path)
+        for path in manifest
+        if path not in desired and path in existing
+    ]
+
+    def apply(operation: Tuple[str, str]) -> Dict[str, Any]:
+      action, path = operation
+      start = time.perf_counter()
+      try:
+        # The manifest is saved once below, not once per file.
+        if action == "write":
+          _write_file(path, desired[path], forget_synced=False)
+        else:
+          _remove_file(path, forget_synced=False)
+        status, error = "success", None
+      except api_exceptions.GoogleAPIError as e:
+        status, error = "error", str(e)
+      result = {
+          "path": path,
+          "action": action,
+          "status": status,
+          "seconds": round(time.perf_counter() - start, 3),
+      }
+      if error:
+        result["error"] = error
+      return result
+
+    sync_start = time.perf_counter()
+    with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as pool:
+      results = list(pool.map(apply, operations))
+
+    # Record what the workspace now holds; failed operations are retried on
+    # the next sync.
+    new_manifest = {
+        path: digest
+        for path, digest in hashes.items()
+        if remote_hashes.get(path) == digest
+    }
+    for result in results:
+      if result["status"] == "success" and result["action"] == "write":
+        new_manifest[result["path"]] = hashes[result["path"]]
+      elif result["status"] == "error" and result["action"] == "delete":
+        new_manifest[result["path"]] = manifest[result["path"]]
+    with _SYNC_MANIFEST_LOCK:
+      _save_sync_manifest(workspace_path, new_manifest)
+
+    changed = {path for _, path in operations}
+    results.extend(
+        {"path": path, "action": "unchanged", "status": "success"}
+        for path in desired
+        if path not in changed
+    )
+    errors = sum(1 for r in results if r["status"] == "error")
+    return {
+        "status": "error" if errors else "success",
+        "written": sum(1 for a, _ in operations if a == "write"),
+        "deleted": sum(1 for a, _ in operations if a == "delete"),
+        "unchanged": len(desired) - len(changed & set(desired)),
+        "errors": errors,
+        "seconds": round(time.perf_counter() - sync_start, 3),
+        "files": results,
+    }
+
+  except Exception as e:
+    return {"status": "error", "error_message": str(e)}
+
+
+def _compile_workspace(
+    client: "dataform_v1.DataformClient",
+    repository_path: str,
+    workspace_path: str,
+    use_cache: bool = True,
+    verify_contents: bool = True,
+) -> Dict[str, Any]:
+  """Compile the workspace, reusing the result of an identical earlier compile.
 
-    print("Compiling...")
-    compilation_result = dataform_v1.CompilationResult()
-    compilation_result.git_commitish = "main"
-    compilation_result.workspace = workspace_path
+  Workspaces are compared by a hash of their current file listing and
+  contents. With `verify_contents` every file is read for it; otherwise the
+  hashes of files this process wrote itself are taken from the index, so that
+  a compile-only check after local edits costs fewer reads.
 
-    request = dataform_v1.CreateCompilationResultRequest(
-        parent=repository_path, compilation_result=compilation_result
+  Returns:
+      Dict[str, Any]: The compilation result "name", its "errors" and
+      "actions", and whether it was a "cache_hit".
+  """
+  key = None
+  if use_cache:
+    fingerprint = workspace_index(workspace_path).fingerprint(
+        _list_files, _read_file, trust_written=not verify_contents
     )
+    key = f"{workspace_path}:{fingerprint}"
+    with _COMPILATION_CACHE_LOCK:
+      cached = _COMPILATION_CACHE.get(key)
+      if cached is not None:
+        _COMPILATION_CACHE.move_to_end(key)
+        print("Reusing compilation of unchanged workspace")
+        return {**cached, "cache_hit": True}
+
+  print("Compiling...")
+  compilation_result = dataform_v1.CompilationResult()
+  compilation_result.workspace = workspace_path
+
+  request = dataform_v1.CreateCompilationResultRequest(
+      parent=repository_path, compilation_result=compilation_result
+  )
 
-    compilation_results = DATAFORM_CLIENT.create_compilation_result(
-        request=request
+  compilation_results = client.create_compilation_result(
+      request=request
+  )
+
+  actions = []
+  if not compilation_results.compilation_errors:
+    request = dataform_v1.QueryCompilationResultActionsRequest(
+        name=compilation_results.name,
+    )
+    # Iterating the pager fetches every page of actions.
+    actions = list(client.query_compilation_result_actions(request=request))
+
+  compiled = {
+      "name": compilation_results.name,
+      "errors": compilation_results.compilation_errors,
+      "actions": actions,
+  }
+  if key is not None:
+    with _COMPILATION_CACHE_LOCK:
+      _COMPILATION_CACHE[key] = compiled
+      while len(_COMPILATION_CACHE) > _COMPILATION_CACHE_SIZE:
+        _COMPILATION_CACHE.popitem(last=False)
+  return {**compiled, "cache_hit": False}
+
+
+def _rerun_targets(
+    client: "dataform_v1.DataformClient", workflow_invocation: Optional[str]
+) -> Optional[List[str]]:
+  """Return the targets that did not complete, or not yet, in an invocation.
+
+  Returns None if the invocation's actions cannot be read.
+  """
+  if not workflow_invocation:
+    return []
+  request = dataform_v1.QueryWorkflowInvocationActionsRequest(
+      name=workflow_invocation,
+  )
+  try:
+    actions = client.query_workflow_invocation_actions(request=request)
+    return [
+        target_id(action.target)
+        for action in actions
+        if dataform_v1.WorkflowInvocationAction.State(action.state).name
+        in _RERUN_ACTION_STATES
+    ]
+  except api_exceptions.GoogleAPIError as e:
+    print(f"Could not read actions of '{workflow_invocation}': {e}")
+    return None
+
+
+def compile_dataform(
+    compile_only: bool = False,
+    use_cache: bool = True,
+    changed_only: bool = True,
+) -> Dict[str, Any]:
+  """Compile Dataform pipeline and get overview of the pipeline DAG.
+
+  If the workspace contents are unchanged since an earlier compile, that
+  compilation result is reused instead of compiling again. When executing,
+  only the actions whose definition changed since the last execution from
+  this workspace, the actions that had not completed in that execution when
+  it was checked (including those still pending or running), and their
+  downstream dependents are run.
+
+  Args:
+      compile_only (bool): If True, only compile without execution.
+      use_cache (bool): Reuse the compilation of an identical workspace.
+        Defaults to True.
+      changed_only (bool): Run only changed actions and their dependents. Set
+        to False to run the whole workflow. Defaults to True.
+
+  Returns:
+      Dict[str, Any]: Compilation results including status, the pipeline DAG
+      as a list of actions with their dependencies and, when executed, the
+      targets that were run.
+  """
+  try:
+    client = get_dataform_client()
+    repository_path = client.repository_path(
+        config.project_id, config.location, config.repository_name
     )
+    workspace_path = get_workspace_path()
 
-    if compilation_results.compilation_errors:
+    # An execution must never run a compilation of stale files, so its cache
+    # check reads every file.
+    compiled = _compile_workspace(
+        client,
+        repository_path,
+        workspace_path,
+        use_cache,
+        verify_contents=not compile_only,
+    )
+
+    if compiled["errors"]:
       print("Compilation errors found!")
       return {
           "status": "error",
-          "error_message": str(compilation_results.compilation_errors),
+          "error_message": str(compiled["errors"]),
+          "compilation_cache_hit": compiled["cache_hit"],
       }
 
-    request = dataform_v1.QueryCompilationResultActionsRequest(
-        name=compilation_results.name,
-    )
-
-    actions = DATAFORM_CLIENT.query_compilation_result_actions(
-        request=request
-    ).compilation_result_actions
+    graph = build_action_graph(compiled["actions"])
+    result = {
+        "pipeline_dag": describe_graph(graph),
+        "compilation_result": compiled["name"],
+        "compilation_cache_hit": compiled["cache_hit"],
+    }
 
     if compile_only:
       return {
           "status": "success",
           "message": "Compilation successful (compile-only mode)",
-          "pipeline_dag": str(actions),
+          **result,
       }
 
     # Execute the workflow if not in compile-only mode
     workflow_invocation = dataform_v1.WorkflowInvocation()
-    workflow_invocation.compilation_result = compilation_results.name
+    workflow_invocation.compilation_result = compiled["name"]
+
+    invoked = load_invoked_state(workspace_path) if changed_only else None
+    unfinished = None
+    if invoked is not None:
+      unfinished = _rerun_targets(client, invoked.get("workflow_invocation"))
+      if unfinished is None:
+        # Without the last outcome, skipping anything could lose a failure.
+        result["note"] = (
+            "The last execution could not be read; the whole workflow is run."
+        )
+        invoked = None
+    if invoked is not None:
+      changed = changed_targets(graph, invoked["hashes"])
+      rerun = [t for t in unfinished if t in graph and t not in changed]
+      if not changed and not rerun:
+        return {
+            "status": "success",
+            "message": (
+                "No actions changed since the last execution; nothing was"
+                " run. Use changed_only=False to run the whole workflow."
+            ),
+            **result,
+            "targets_run": [],
+        }
+      selected = changed + rerun
+      workflow_invocation.invocation_config = dataform_v1.InvocationConfig(
+          included_targets=[graph[t]["ref"] for t in selected],
+          transitive_dependents_included=True,
+      )
+      result["changed_targets"] = changed
+      result["rerun_targets"] = rerun
+      result["targets_run"] = downstream_of(graph, selected)
+    else:
+      result["targets_run"] = [
+          t for t in topological_order(graph) if graph[t]["sql_hash"]
+      ]
 
     request = dataform_v1.CreateWorkflowInvocationRequest(
         parent=repository_path, workflow_invocation=workflow_invocation
     )
 
-    workflow_invocation = DATAFORM_CLIENT.create_workflow_invocation(
+    workflow_invocation = client.create_workflow_invocation(
         request=request
     )
+    save_invoked_state(workspace_path, graph, workflow_invocation.name)
+    watch_invocation(get_dataform_client, workflow_invocation.name)
 
     return {
         "status": "success",
         "message": "Compilation and execution successful",
-        "pipeline_dag": str(actions),
+        **result,
         "workflow_invocation_id": workflow_invocation.name,
     }
 
-  except GoogleAPIError as e:
+  except api_exceptions.GoogleAPIError as e:
     error_msg = f"Error in Dataform operation: {e}"
     print(error_msg)
     return {"status": "error", "error_message": error_msg}
@@ -163,50 +600,48 @@ def compile_dataform(compile_only: bool = False) -> Dict[str, Any]:
 def read_file_from_dataform(file_path: str) -> str:
   """Read a file from Dataform.
 
+  Files read or written earlier in the session are served from memory.
+
   Args:
       file_path (str): The fully qualified path of the file to read.
 
   Returns:
       str: The content of the file.
   """
-  workspace_path = get_workspace_path()
   print(f"Reading file: {file_path}")
   try:
-    request = dataform_v1.ReadFileRequest(
-        workspace=workspace_path,
-        path=file_path,
-    )
-    response = DATAFORM_CLIENT.read_file(request=request)
+    index = workspace_index(get_workspace_path())
+    contents = index.read(file_path, _read_file)
     print(f"File Read: {file_path}")
-    return response.file_contents.decode("utf-8")
-  except GoogleAPIError as e:
+    return contents.decode("utf-8")
+  except api_exceptions.GoogleAPIError as e:
     error_msg = f"Error reading file '{file_path}': {e}"
     print(error_msg)
     return error_msg
 
-def search_files_in_dataform(pattern: Optional[str] = None) -> List[str]:
+def search_files_in_dataform(
+    pattern: Optional[str] = None, match: str = "substring"
+) -> List[str]:
   """Search for files in Dataform.
 
+  Searches are served from an index of the workspace files, which is kept up
+  to date by the writes and deletions made through these tools.
+
   Args:
       pattern (Optional[str]): Optional pattern to filter files.
+      match (str): How to match `pattern`: "substring" (default), "prefix",
+        "glob" (e.g. "definitions/*.sqlx") or "regex".
 
   Returns:
       List[str]: A list of file names matching the pattern.
   """
-  workspace_path = get_workspace_path()
   try:
-    request = dataform_v1.SearchFilesRequest(
-        workspace=workspace_path,
-    )
-    response = DATAFORM_CLIENT.search_files(request=request)
-    all_files = [page.file.path for page in response if page.file]
-
-    if pattern:
-      all_files = [f for f in all_files if pattern in f]
+    index = workspace_index(get_workspace_path())
+    all_files = index.search(_list_files, pattern, match)
 
     print(f"Files found: {all_files}")
     return all_files
-  except GoogleAPIError as e:
+  except (api_exceptions.GoogleAPIError, ValueError) as e:
     print(f"Error searching files: {e}")
     return []
 
@@ -231,8 +666,10 @@ def get_dataform_execution_logs(workflow_invocation_id: str) -> Dict[str, Any]:
     request = dataform_v1.QueryWorkflowInvocationActionsRequest(
         name=workflow_invocation_id,
     )
-    actions_response = DATAFORM_CLIENT.query_workflow_invocation_actions(
-        request=request
+    actions_response = (
+        get_dataform_client().query_workflow_invocation_actions(
+            request=request
+        )
     )
 
     actions_details = []
@@ -277,7 +714,7 @@ def get_dataform_execution_logs(workflow_invocation_id: str) -> Dict[str, Any]:
 
     return {"status": "success", "actions": actions_details}
 
-  except GoogleAPIError as e:
+  except api_exceptions.GoogleAPIError as e:
     print(f"Error getting execution logs for '{workflow_invocation_id}': {e}")
     return {
         "status": "error",
@@ -287,6 +724,44 @@ def get_dataform_execution_logs(workflow_invocation_id: str) -> Dict[str, Any]:
     }
 
 
+def wait_for_dataform_workflow(
+    workflow_invocation_id: str, timeout_seconds: float = 300, since: int = 0
+) -> Dict[str, Any]:
+  """Wait for a Dataform workflow invocation to finish and report its actions.
+
+  Use this instead of calling `get_dataform_execution_logs` repeatedly. The
+  invocation is watched in the background, so if the wait times out, calling
+  this again with `since` set to the returned "next_event" continues where it
+  stopped.
+
+  Args:
+      workflow_invocation_id (str): The full ID of the workflow invocation, as
+        returned by `compile_dataform` or `execute_dataform_workflow`.
+      timeout_seconds (float): Maximum number of seconds to wait. Defaults to
+        300.
+      since (int): Index of the first state transition to return. Defaults to
+        0, returning all of them.
+
+  Returns:
+      Dict[str, Any]: A dictionary containing:
+                      "status": "success", "error", or "running" if the
+                      invocation had not finished when the wait timed out.
+                      "state": The invocation state, e.g. "SUCCEEDED".
+                      "actions": Per-action state, start and end time,
+                      duration in milliseconds and errors.
+                      "events": The action and invocation state transitions.
+                      "next_event": Value of `since` for the next call.
+  """
+  try:
+    watcher = watch_invocation(get_dataform_client, workflow_invocation_id)
+    watcher.wait(timeout_seconds)
+    return watcher.report(since)
+  except api_exceptions.GoogleAPIError as e:
+    error_msg = f"Error watching workflow '{workflow_invocation_id}': {e}"
+    print(error_msg)
+    return {"status": "error", "error_message": error_msg}
+
+
 def execute_dataform_workflow(
     workflow_name: str, params: Optional[Dict[str, Any]] = None
 ) -> Dict[str, Any]:
@@ -302,7 +777,8 @@ def execute_dataform_workflow(
       ID.
   """
   try:
-    repository_path = DATAFORM_CLIENT.repository_path(
+    client = get_dataform_client()
+    repository_path = client.repository_path(
         config.project_id, config.location, config.repository_name
     )
 
@@ -321,9 +797,10 @@ def execute_dataform_workflow(
     )
 
     # Execute the workflow
-    workflow_invocation = DATAFORM_CLIENT.create_workflow_invocation(
+    workflow_invocation = client.create_workflow_invocation(
         request=request
     )
+    watch_invocation(get_dataform_client, workflow_invocation.name)
 
     return {
         "status": "success",
@@ -333,7 +810,7 @@ def execute_dataform_workflow(
         "parameters": params,
     }
 
-  except GoogleAPIError as e:
+  except api_exceptions.GoogleAPIError as e:
     error_msg = f"Error executing workflow '{workflow_name}': {e}"
     print(error_msg)
     return {"status": "error", "error_message": error_msg}
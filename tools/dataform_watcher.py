@@ -0,0 +1,280 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""This module provides background watchers for Dataform workflow invocations.
+
+A watcher polls one invocation and its actions on a daemon thread, with an
+interval that grows while nothing changes and drops back to its minimum as soon
+as an action changes state. Every state transition is printed and recorded as
+an event, so a caller can block until the invocation finishes (or a timeout
+hits) and then receive the whole history at once, or pick up where an earlier,
+timed-out wait left off. Watchers outlive a single call; asking for the same
+invocation again attaches to the running watcher instead of starting another.
+"""
+
+import threading
+import time
+from datetime import datetime, timezone
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional
+
+from .dataform_dag import target_id
+from .lazy_import import lazy_import
+
+if TYPE_CHECKING:
+  from google.api_core import exceptions as api_exceptions
+  from google.cloud import dataform_v1
+else:
+  api_exceptions = lazy_import("google.api_core.exceptions")
+  dataform_v1 = lazy_import("google.cloud.dataform_v1")
+
+_TERMINAL_INVOCATION_STATES = ("SUCCEEDED", "CANCELLED", "FAILED")
+
+# Watchers whose invocation finished this long ago are dropped on the next
+# call to `watch_invocation`.
+_FINISHED_WATCHER_TTL_SECONDS = 3600
+
+# Consecutive polling errors after which a watcher gives up.
+_MAX_POLL_ERRORS = 5
+
+
+def _interval_bound(interval: Any, field: str) -> Optional[datetime]:
+  """Return one bound of a `google.type.Interval` as an aware datetime."""
+  if interval is None or not interval.HasField(field):
+    return None
+  return getattr(interval, field).ToDatetime(tzinfo=timezone.utc)
+
+
+def _timestamp(value: Optional[datetime]) -> Optional[str]:
+  return value.isoformat() if value else None
+
+
+def _millis_between(
+    start: Optional[datetime], end: Optional[datetime]
+) -> Optional[int]:
+  if not start or not end:
+    return None
+  return int((end - start).total_seconds() * 1000)
+
+
+class InvocationWatcher:
+  """Polls a workflow invocation in the background and records transitions.
+
+  Args:
+      client_factory (Callable[[], dataform_v1.DataformClient]): Returns the
+        client to poll with.
+      name (str): Full resource name of the workflow invocation.
+      initial_interval (float): Seconds between polls right after a change.
+      max_interval (float): Upper bound on the seconds between polls.
+      multiplier (float): Factor the interval grows by after a quiet poll.
+  """
+
+  def __init__(
+      self,
+      client_factory: Callable[[], "dataform_v1.DataformClient"],
+      name: str,
+      initial_interval: float = 1,
+      max_interval: float = 30,
+      multiplier: float = 1.5,
+  ):
+    self.name = name
+    self._client_factory = client_factory
+    self._initial_interval = initial_interval
+    self._max_interval = max_interval
+    self._multiplier = multiplier
+    self._lock = threading.Lock()
+    self._done = threading.Event()
+    self._thread: Optional[threading.Thread] = None
+    self.state: Optional[str] = None
+    self.error: Optional[str] = None
+    self.polls = 0
+    self.started_at = time.time()
+    self.finished_at: Optional[float] = None
+    self._actions: Dict[str, Dict[str, Any]] = {}
+    self._events: List[Dict[str, Any]] = []
+
+  @property
+  def finished(self) -> bool:
+    return self._done.is_set()
+
+  def start(self) -> "InvocationWatcher":
+    """Start polling on a daemon thread, if not already started."""
+    with self._lock:
+      if self._thread is None:
+        self._thread = threading.Thread(
+            target=self._run, name=f"dataform-watch-{self.name}", daemon=True
+        )
+        self._thread.start()
+    return self
+
+  def wait(self, timeout_seconds: Optional[float] = None) -> bool:
+    """Block until the invocation finishes; return False on timeout."""
+    return self._done.wait(timeout_seconds)
+
+  def _record(self, event: Dict[str, Any]) -> None:
+    event["time"] = datetime.now().astimezone().isoformat()
+    print(
+        f"[{self.name}] {event.get('action', 'invocation')}:"
+        f" {event['from'] or 'NEW'} -> {event['to']}"
+    )
+    self._events.append(event)
+
+  def _poll(self, client: "dataform_v1.DataformClient") -> bool:
+    """Poll once; return whether anything changed."""
+    invocation = client.get_workflow_invocation(
+        request=dataform_v1.GetWorkflowInvocationRequest(name=self.name)
+    )
+    state = dataform_v1.WorkflowInvocation.State(invocation.state).name
+    # Actions are listed after the invocation state, so a terminal state is
+    # never paired with stale action states.
+    actions = client.query_workflow_invocation_actions(
+        request=dataform_v1.QueryWorkflowInvocationActionsRequest(
+            name=self.name
+        )
+    )
+
+    changed = False
+    with self._lock:
+      for action in actions:
+        target = target_id(action.target)
+        action_state = dataform_v1.WorkflowInvocationAction.State(
+            action.state
+        ).name
+        # `invocation_timing` is a raw protobuf Interval, not a proto-plus
+        # message, so its bounds are Timestamps that must be converted.
+        start = _interval_bound(action.invocation_timing, "start_time")
+        end = _interval_bound(action.invocation_timing, "end_time")
+        entry = self._actions.get(target)
+        if entry is None or entry["state"] != action_state:
+          self._record({
+              "action": target,
+              "from": entry["state"] if entry else None,
+              "to": action_state,
+          })
+          changed = True
+        detail = {
+            "target": target,
+            "state": action_state,
+            "start_time": _timestamp(start),
+            "end_time": _timestamp(end),
+            "duration_ms": _millis_between(start, end),
+        }
+        if action.failure_reason:
+          detail["error_message"] = action.failure_reason
+        if action.bigquery_action and action.bigquery_action.job_id:
+          detail["job_id"] = action.bigquery_action.job_id
+        self._actions[target] = detail
+
+      if state != self.state:
+        self._record({"from": self.state, "to": state})
+        self.state = state
+        changed = True
+      self.polls += 1
+    return changed
+
+  def _run(self) -> None:
+    interval = self._initial_interval
+    errors = 0
+    try:
+      while True:
+        try:
+          changed = self._poll(self._client_factory())
+          errors = 0
+        except api_exceptions.GoogleAPIError as e:
+          errors += 1
+          if errors >= _MAX_POLL_ERRORS:
+            with self._lock:
+              self.error = f"Gave up polling after {errors} errors: {e}"
+            return
+          changed = False
+        except Exception as e:
+          # Anything else is a bug that polling again would only repeat.
+          with self._lock:
+            self.error = f"Stopped polling after an unexpected error: {e!r}"
+          return
+        if self.state in _TERMINAL_INVOCATION_STATES:
+          return
+        if changed:
+          interval = self._initial_interval
+        else:
+          interval = min(interval * self._multiplier, self._max_interval)
+        time.sleep(interval)
+    finally:
+      self.finished_at = time.time()
+      self._done.set()
+
+  def snapshot(self, since: int = 0) -> Dict[str, Any]:
+    """Return the current state, per-action details and events from `since`.
+
+    Args:
+        since (int): Index of the first event to return; pass the previous
+          snapshot's "next_event" to only receive new transitions.
+    """
+    with self._lock:
+      return {
+          "workflow_invocation_id": self.name,
+          "state": self.state,
+          "finished": self.finished,
+          "error": self.error,
+          "actions": list(self._actions.values()),
+          "events": self._events[since:],
+          "next_event": len(self._events),
+          "polls": self.polls,
+          "watched_seconds": round(
+              (self.finished_at or time.time()) - self.started_at, 1
+          ),
+      }
+
+  def report(self, since: int = 0) -> Dict[str, Any]:
+    """Return `snapshot` with a tool "status" and, on failure, an error.
+
+    The status is "running" while the watcher is still polling, "success" if
+    the invocation succeeded and "error" otherwise.
+    """
+    result = self.snapshot(since)
+    result["timed_out"] = not result["finished"]
+    if not result["finished"]:
+      result["status"] = "running"
+    elif result["state"] == "SUCCEEDED":
+      result["status"] = "success"
+    else:
+      result["status"] = "error"
+      result["error_message"] = result["error"] or (
+          f"Workflow invocation {self.name} ended in state"
+          f" {result['state']}. See actions for details."
+      )
+    return result
+
+
+_WATCHERS: Dict[str, InvocationWatcher] = {}
+_WATCHERS_LOCK = threading.Lock()
+
+
+def watch_invocation(
+    client_factory: Callable[[], "dataform_v1.DataformClient"], name: str
+) -> InvocationWatcher:
+  """Return the running watcher of an invocation, starting one if needed."""
+  now = time.time()
+  with _WATCHERS_LOCK:
+    for key, watcher in list(_WATCHERS.items()):
+      if (
+          watcher.finished_at
+          and now - watcher.finished_at > _FINISHED_WATCHER_TTL_SECONDS
+      ):
+        del _WATCHERS[key]
+    watcher = _WATCHERS.get(name)
+    # A watcher that gave up on errors is replaced by a fresh one.
+    if watcher is None or (watcher.finished and watcher.error):
+      watcher = InvocationWatcher(client_factory, name)
+      _WATCHERS[name] = watcher
+  return watcher.start()
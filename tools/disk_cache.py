@@ -0,0 +1,111 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""This module provides helpers shared by the on-disk caches of the tools.
+
+Entries are written to a temporary file and atomically renamed into place, so
+readers never see partial files and need no locking. Writers and eviction are
+serialized across processes with an advisory lock file, and least recently used
+entries are evicted once a directory exceeds its byte budget.
+"""
+
+import contextlib
+import fcntl
+import os
+import tempfile
+import time
+from typing import Iterator, Optional
+
+LOCK_FILE_NAME = ".lock"
+
+
+@contextlib.contextmanager
+def file_lock(directory: str) -> Iterator[None]:
+  """Hold an exclusive, cross-process lock on a cache directory."""
+  os.makedirs(directory, exist_ok=True)
+  with open(os.path.join(directory, LOCK_FILE_NAME), "a") as lock_file:
+    fcntl.flock(lock_file, fcntl.LOCK_EX)
+    try:
+      yield
+    finally:
+      fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+@contextlib.contextmanager
+def atomic_write(path: str) -> Iterator[str]:
+  """Yield a temporary path that is renamed to `path` on success."""
+  directory = os.path.dirname(path)
+  os.makedirs(directory, exist_ok=True)
+  fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".tmp-")
+  os.close(fd)
+  try:
+    yield tmp_path
+    os.replace(tmp_path, path)
+  finally:
+    if os.path.exists(tmp_path):
+      os.remove(tmp_path)
+
+
+def touch(path: str) -> None:
+  """Mark a cache entry as recently used."""
+  try:
+    now = time.time()
+    os.utime(path, (now, now))
+  except FileNotFoundError:
+    pass
+
+
+def enforce_byte_budget(
+    directory: str, max_bytes: int, keep: Optional[str] = None
+) -> int:
+  """Evict least recently used files until `directory` fits in `max_bytes`.
+
+  Must be called while holding `file_lock(directory)`.
+
+  Args:
+      directory (str): Cache directory to scan recursively.
+      max_bytes (int): Byte budget for the directory.
+      keep (Optional[str]): Path that must not be evicted, typically the entry
+        that was just written.
+
+  Returns:
+      int: Number of bytes evicted.
+  """
+  entries = []
+  total = 0
+  for root, _, names in os.walk(directory):
+    for name in names:
+      if name == LOCK_FILE_NAME or name.startswith(".tmp-"):
+        continue
+      path = os.path.join(root, name)
+      try:
+        stat = os.stat(path)
+      except FileNotFoundError:
+        continue
+      entries.append((stat.st_mtime, stat.st_size, path))
+      total += stat.st_size
+
+  evicted = 0
+  for _, size, path in sorted(entries):
+    if total <= max_bytes:
+      break
+    if path == keep:
+      continue
+    try:
+      os.remove(path)
+    except FileNotFoundError:
+      continue
+    total -= size
+    evicted += size
+  return evicted
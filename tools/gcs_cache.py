@@ -0,0 +1,205 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""This module provides a content-addressed local disk cache for GCS objects.
+
+Objects are stored under a key derived from bucket, path and generation (or the
+MD5 hash when no generation is known), so a cached copy is valid for as long as
+the object's metadata still matches. Revalidation therefore costs a single
+metadata call. The cache is bounded by `config.gcs_cache_max_bytes` with least
+recently used eviction, and large entries are exposed as memory-mapped files.
+Objects are stored exactly as in GCS, so compressed objects stay compressed.
+Entries are held open while they are read, so eviction by another process
+cannot remove them from under a reader.
+"""
+
+import contextlib
+import hashlib
+import io
+import mmap
+import os
+from typing import TYPE_CHECKING, BinaryIO, Iterator, Optional
+
+from ..config import config
+from .disk_cache import atomic_write, enforce_byte_budget, file_lock, touch
+from .gcs_transfer import download_sliced_to_filename, use_sliced_download
+from .lazy_import import lazy_import
+
+if TYPE_CHECKING:
+  from google.cloud import storage
+else:
+  storage = lazy_import("google.cloud.storage")
+
+# Entries at least this large are memory-mapped instead of read into memory.
+MMAP_THRESHOLD = 1024 * 1024
+
+# Downloads of an entry that another process evicted before it was opened.
+_FETCH_ATTEMPTS = 3
+
+
+class _EntryReader(io.RawIOBase):
+  """Sequential reader over an open entry that keeps its own position."""
+
+  def __init__(self, fd: int, size: int):
+    self._fd = fd
+    self._size = size
+    self._pos = 0
+
+  def readable(self) -> bool:
+    return True
+
+  def readinto(self, b) -> int:
+    data = os.pread(self._fd, min(len(b), self._size - self._pos), self._pos)
+    n = len(data)
+    b[:n] = data
+    self._pos += n
+    return n
+
+
+class CachedObject:
+  """A GCS object stored in the local cache.
+
+  The entry is held open from the moment it is found, so it stays readable if
+  another process evicts it. `path` may disappear at any time and must not be
+  handed out. Close the object, or use it as a context manager, when done.
+  """
+
+  def __init__(self, path: str, file: BinaryIO, generation: Optional[int]):
+    self.path = path
+    self.generation = generation
+    self._file = file
+    self.size = os.fstat(file.fileno()).st_size
+
+  def close(self) -> None:
+    self._file.close()
+
+  def __enter__(self) -> "CachedObject":
+    return self
+
+  def __exit__(self, *exc_info) -> None:
+    self.close()
+
+  def open(self) -> BinaryIO:
+    """Open a stream over the cached bytes, starting at the first byte.
+
+    Closing the stream leaves the object open; streams do not share a position.
+    """
+    return io.BufferedReader(_EntryReader(self._file.fileno(), self.size))
+
+  @contextlib.contextmanager
+  def view(self) -> Iterator[memoryview]:
+    """Expose the cached bytes without copying large objects.
+
+    Objects of `MMAP_THRESHOLD` bytes or more are memory-mapped. Slices taken
+    from the view must not outlive the context.
+    """
+    if self.size < MMAP_THRESHOLD:
+      yield memoryview(os.pread(self._file.fileno(), self.size, 0))
+      return
+    mapped = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+    try:
+      view = memoryview(mapped)
+      try:
+        yield view
+      finally:
+        view.release()
+    finally:
+      mapped.close()
+
+
+class GCSObjectCache:
+  """Size-bounded, generation-keyed cache of GCS objects on local disk."""
+
+  def __init__(self, root: str, max_bytes: int):
+    self.root = root
+    self.max_bytes = max_bytes
+
+  def _entry_path(self, blob: "storage.Blob") -> Optional[str]:
+    version = blob.generation or blob.md5_hash
+    if not version:
+      return None
+    key = f"{blob.bucket.name}/{blob.name}#{version}"
+    digest = hashlib.sha256(key.encode("utf-8")).hexdigest()
+    return os.path.join(self.root, digest[:2], digest)
+
+  def _open(self, path: str, blob: "storage.Blob") -> Optional[CachedObject]:
+    try:
+      file = open(path, "rb")
+    except FileNotFoundError:
+      return None
+    return CachedObject(path, file, blob.generation)
+
+  def lookup(self, blob: "storage.Blob") -> Optional[CachedObject]:
+    """Return the cached copy of a blob whose metadata is loaded, if any."""
+    path = self._entry_path(blob)
+    if path is None:
+      return None
+    cached = self._open(path, blob)
+    if cached is not None:
+      touch(path)
+    return cached
+
+  def fetch(self, blob: "storage.Blob") -> Optional[CachedObject]:
+    """Return the cached copy of a blob, downloading it on a miss.
+
+    Args:
+        blob (storage.Blob): Blob with loaded metadata, e.g. from
+          `bucket.get_blob`.
+
+    Returns:
+        Optional[CachedObject]: The cached object, or None if the blob cannot
+        be cached (no version information, or larger than the cache).
+    """
+    for _ in range(_FETCH_ATTEMPTS):
+      cached = self.lookup(blob)
+      if cached is not None:
+        return cached
+
+      path = self._entry_path(blob)
+      if path is None or (blob.size or 0) > self.max_bytes:
+        return None
+
+      with atomic_write(path) as tmp_path:
+        if use_sliced_download(blob):
+          download_sliced_to_filename(blob, tmp_path)
+        else:
+          blob.download_to_filename(
+              tmp_path,
+              raw_download=True,
+              if_generation_match=blob.generation,
+          )
+      with file_lock(self.root):
+        enforce_byte_budget(self.root, self.max_bytes, keep=path)
+        # Opened under the lock, so eviction cannot remove it first; another
+        # process may still have evicted it before the lock was taken.
+        cached = self._open(path, blob)
+      if cached is not None:
+        return cached
+    raise FileNotFoundError(
+        f"Cache entry for {blob.name} was evicted before it could be opened"
+    )
+
+  def invalidate(self, blob: "storage.Blob") -> None:
+    """Drop the cached copy of a blob, if any."""
+    path = self._entry_path(blob)
+    if path is None:
+      return
+    with file_lock(self.root):
+      if os.path.exists(path):
+        os.remove(path)
+
+
+GCS_CACHE = GCSObjectCache(
+    os.path.join(config.cache_dir, "gcs"), config.gcs_cache_max_bytes
+)
@@ -0,0 +1,329 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""This module provides a persistent local index of GCS bucket listings.
+
+Listings are stored in SQLite, keyed by bucket and object name, together with a
+per-(bucket, prefix) watermark. Refreshes are incremental: the "start_offset"
+strategy only lists names after the last one seen (for landing zones with
+monotonically increasing names), while the "updated" strategy relists with
+minimal fields and only writes objects newer than the watermark. Prefix, glob
+and "files since T" queries are answered from the index without touching GCS.
+"""
+
+import contextlib
+import os
+import sqlite3
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterator, List, Optional
+
+from ..config import config
+from .gcs_tools import iter_bucket_files
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS objects (
+    bucket TEXT NOT NULL,
+    name TEXT NOT NULL,
+    size INTEGER,
+    updated REAL,
+    PRIMARY KEY (bucket, name)
+);
+CREATE INDEX IF NOT EXISTS objects_by_updated ON objects (bucket, updated);
+CREATE TABLE IF NOT EXISTS watermarks (
+    bucket TEXT NOT NULL,
+    prefix TEXT NOT NULL,
+    updated REAL,
+    last_name TEXT,
+    refreshed_at REAL,
+    PRIMARY KEY (bucket, prefix)
+);
+"""
+
+_UPSERT_BATCH_SIZE = 1000
+
+# Sorts after any character that can appear in an object name.
+_PREFIX_UPPER_BOUND = "\U0010ffff"
+
+
+def _to_epoch(value: Optional[datetime]) -> Optional[float]:
+  return value.timestamp() if value else None
+
+
+def _parse_timestamp(value: str) -> float:
+  """Parse an ISO 8601 timestamp, treating naive values as UTC."""
+  parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+  if parsed.tzinfo is None:
+    parsed = parsed.replace(tzinfo=timezone.utc)
+  return parsed.timestamp()
+
+
+def _glob_literal_prefix(pattern: str) -> str:
+  """Return the part of a glob pattern before its first wildcard."""
+  for i, char in enumerate(pattern):
+    if char in "*?[":
+      return pattern[:i]
+  return pattern
+
+
+class BucketIndex:
+  """SQLite-backed index of object names, sizes and update times."""
+
+  def __init__(self, path: str):
+    self.path = path
+    self._initialized = False
+
+  @contextlib.contextmanager
+  def _connect(self) -> Iterator[sqlite3.Connection]:
+    if not self._initialized:
+      os.makedirs(os.path.dirname(self.path), exist_ok=True)
+    conn = sqlite3.connect(self.path, timeout=30)
+    conn.row_factory = sqlite3.Row
+    try:
+      if not self._initialized:
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.executescript(_SCHEMA)
+        self._initialized = True
+      with conn:
+        yield conn
+    finally:
+      conn.close()
+
+  def watermark(
+      self, bucket: str, prefix: str = ""
+  ) -> Optional[Dict[str, Any]]:
+    """Return the stored watermark for a bucket prefix, if any."""
+    with self._connect() as conn:
+      row = conn.execute(
+          "SELECT updated, last_name, refreshed_at FROM watermarks"
+          " WHERE bucket = ? AND prefix = ?",
+          (bucket, prefix),
+      ).fetchone()
+    return dict(row) if row else None
+
+  def refresh(
+      self, bucket: str, prefix: str = "", strategy: str = "updated"
+  ) -> Dict[str, Any]:
+    """Bring the index for a bucket prefix up to date.
+
+    Args:
+        bucket (str): The bucket to index.
+        prefix (str): Only index objects under this prefix.
+        strategy (str): "updated" relists the prefix with minimal fields,
+          writes only objects newer than the watermark and drops deleted
+          objects. "start_offset" only lists names sorting at or after the last
+          indexed name, which is much cheaper for append-only landing zones
+          with increasing names but does not notice overwrites or deletions.
+
+    Returns:
+        Dict[str, Any]: Counts of listed, written and removed objects.
+    """
+    if strategy not in ("updated", "start_offset"):
+      raise ValueError(f"Unknown refresh strategy: {strategy}")
+
+    mark = self.watermark(bucket, prefix) or {}
+    since = mark.get("updated")
+    start_offset = mark.get("last_name") if strategy == "start_offset" else None
+
+    listed = 0
+    written = 0
+    seen = set()
+    batch = []
+    max_updated = since
+    last_name = mark.get("last_name")
+
+    with self._connect() as conn:
+
+      def flush():
+        conn.executemany(
+            "INSERT OR REPLACE INTO objects (bucket, name, size, updated)"
+            " VALUES (?, ?, ?, ?)",
+            batch,
+        )
+        batch.clear()
+
+      for item in iter_bucket_files(
+          bucket, prefix=prefix or None, start_offset=start_offset
+      ):
+        listed += 1
+        updated = _to_epoch(item["updated"])
+        if strategy == "updated":
+          seen.add(item["name"])
+        if last_name is None or item["name"] > last_name:
+          last_name = item["name"]
+        if updated is not None and (
+            max_updated is None or updated > max_updated
+        ):
+          max_updated = updated
+        # Names after the start offset are new by construction. Objects
+        # updated at the watermark itself are upserted again, since others may
+        # have been written within the same timestamp after the last refresh.
+        is_new = since is None or updated is None or updated >= since
+        if strategy == "start_offset" or is_new:
+          batch.append((bucket, item["name"], item["size"], updated))
+          written += 1
+          if len(batch) >= _UPSERT_BATCH_SIZE:
+            flush()
+      if batch:
+        flush()
+
+      removed = 0
+      if strategy == "updated":
+        indexed = conn.execute(
+            "SELECT name FROM objects WHERE bucket = ? AND name >= ?"
+            " AND name < ?",
+            (bucket, prefix, prefix + _PREFIX_UPPER_BOUND),
+        ).fetchall()
+        stale = [
+            (bucket, row["name"])
+            for row in indexed
+            if row["name"] not in seen
+        ]
+        conn.executemany(
+            "DELETE FROM objects WHERE bucket = ? AND name = ?", stale
+        )
+        removed = len(stale)
+
+      conn.execute(
+          "INSERT OR REPLACE INTO watermarks"
+          " (bucket, prefix, updated, last_name, refreshed_at)"
+          " VALUES (?, ?, ?, ?, ?)",
+          (bucket, prefix, max_updated, last_name, time.time()),
+      )
+
+    return {
+        "strategy": strategy,
+        "listed": listed,
+        "written": written,
+        "removed": removed,
+    }
+
+  def query(
+      self,
+      bucket: str,
+      prefix: Optional[str] = None,
+      glob: Optional[str] = None,
+      since: Optional[str] = None,
+      limit: Optional[int] = None,
+  ) -> List[Dict[str, Any]]:
+    """Query indexed objects without contacting GCS.
+
+    Args:
+        bucket (str): The bucket to query.
+        prefix (Optional[str]): Only return names starting with this prefix.
+        glob (Optional[str]): Only return names matching this glob pattern
+          (SQLite GLOB syntax: "*", "?", "[...]").
+        since (Optional[str]): Only return objects updated after this ISO 8601
+          timestamp.
+        limit (Optional[int]): Maximum number of objects to return.
+
+    Returns:
+        List[Dict[str, Any]]: Matching objects ordered by name.
+    """
+    # Narrow every query to a primary-key range on the longest literal prefix.
+    literal = prefix or ""
+    if glob:
+      glob_prefix = _glob_literal_prefix(glob)
+      if glob_prefix.startswith(literal):
+        literal = glob_prefix
+
+    sql = (
+        "SELECT name, size, updated FROM objects"
+        " WHERE bucket = ? AND name >= ? AND name < ?"
+    )
+    params: List[Any] = [bucket, literal, literal + _PREFIX_UPPER_BOUND]
+    if glob:
+      sql += " AND name GLOB ?"
+      params.append(glob)
+    if since:
+      sql += " AND updated > ?"
+      params.append(_parse_timestamp(since))
+    sql += " ORDER BY name"
+    if limit:
+      sql += " LIMIT ?"
+      params.append(limit)
+
+    with self._connect() as conn:
+      rows = conn.execute(sql, params).fetchall()
+    return [
+        {
+            "name": row["name"],
+            "size": row["size"],
+            "updated": (
+                datetime.fromtimestamp(row["updated"], timezone.utc).isoformat()
+                if row["updated"] is not None
+                else None
+            ),
+        }
+        for row in rows
+    ]
+
+
+BUCKET_INDEX = BucketIndex(os.path.join(config.cache_dir, "gcs_index.sqlite3"))
+
+
+def search_bucket_index_tool(
+    bucket_name: str,
+    prefix: Optional[str] = None,
+    glob: Optional[str] = None,
+    since: Optional[str] = None,
+    refresh: bool = False,
+    strategy: str = "updated",
+    max_results: Optional[int] = None,
+) -> Dict[str, Any]:
+  """Find files in a GCS bucket from the local listing index.
+
+  Queries are answered from the index in milliseconds; set `refresh` to first
+  pull in objects changed since the last refresh of the bucket prefix.
+
+  Args:
+      bucket_name (str): The name of the bucket.
+      prefix (Optional[str]): Only return files whose names begin with this
+        prefix. Also scopes the refresh.
+      glob (Optional[str]): Only return files matching this glob pattern, e.g.
+        "landing/2025-*/*.csv".
+      since (Optional[str]): Only return files updated after this ISO 8601
+        timestamp.
+      refresh (bool): Incrementally refresh the index before querying. Defaults
+        to False, but the first query of a bucket prefix always refreshes.
+      strategy (str): Refresh strategy, "updated" or "start_offset". Defaults
+        to "updated".
+      max_results (Optional[int]): Maximum number of files to return.
+
+  Returns:
+      Dict[str, Any]: Dictionary containing the matching files and refresh
+      statistics.
+  """
+  try:
+    refresh_stats = None
+    if refresh or BUCKET_INDEX.watermark(bucket_name, prefix or "") is None:
+      refresh_stats = BUCKET_INDEX.refresh(bucket_name, prefix or "", strategy)
+
+    files = BUCKET_INDEX.query(
+        bucket_name, prefix=prefix, glob=glob, since=since, limit=max_results
+    )
+    return {
+        "status": "success",
+        "bucket_name": bucket_name,
+        "prefix": prefix,
+        "glob": glob,
+        "since": since,
+        "files": files,
+        "total_files": len(files),
+        "refresh": refresh_stats,
+        "watermark": BUCKET_INDEX.watermark(bucket_name, prefix or ""),
+    }
+
+  except Exception as e:
+    return {"status": "error", "error": str(e)}
@@ -16,18 +16,71 @@
 
 It includes functionalities for validating bucket and file existence, listing
 files in buckets,
-and reading files with various options (head, tail, or full content).
+and reading files with various options (head, tail, paged by offset, or full
+content).
 """
 
+import collections
+import concurrent.futures
+import contextlib
+import io
+import itertools
 import json
-from typing import Any, Dict, List, Optional
-from google.cloud import storage
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    BinaryIO,
+    Callable,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+)
 from ..config import config
+from .client_pool import CLIENT_REGISTRY, create_pooled_session
+from .compression import detect_compression, open_decompressed
+from .gcs_cache import GCS_CACHE, CachedObject
+from .gcs_transfer import open_sliced, use_sliced_download
+from .lazy_import import lazy_import
 
+if TYPE_CHECKING:
+  from google.cloud import storage
+else:
+  storage = lazy_import("google.cloud.storage")
 
-def get_gcs_client() -> storage.Client:
-  """Get a configured GCS client."""
-  return storage.Client(project=config.project_id)
+# Initial and maximum byte-range sizes for incremental head/tail/offset reads.
+_RANGE_CHUNK_SIZE = 64 * 1024
+_MAX_RANGE_CHUNK_SIZE = 8 * 1024 * 1024
+
+# Server-side field selection for object listings.
+_LIST_FIELDS = (
+    "items(name,size,contentType,timeCreated,updated),prefixes,nextPageToken"
+)
+_MINIMAL_LIST_FIELDS = "items(name,size,updated),prefixes,nextPageToken"
+_LIST_PAGE_SIZE = 1000
+
+
+def _create_gcs_client(
+    project: str, location: Optional[str], credentials: Any, pool_size: int
+) -> "storage.Client":
+  """Build a GCS client backed by a pooled HTTP session."""
+  session = create_pooled_session(credentials, pool_size)
+  return storage.Client(
+      project=project, credentials=session.credentials, _http=session
+  )
+
+
+CLIENT_REGISTRY.register(
+    "storage",
+    _create_gcs_client,
+    probe=lambda client: client.get_service_account_email(),
+)
+
+
+def get_gcs_client() -> "storage.Client":
+  """Get the shared, pooled GCS client."""
+  return CLIENT_REGISTRY.get("storage", project=config.project_id)
 
 
 def validate_bucket_exists_tool(bucket_name: str) -> Dict[str, Any]:
@@ -69,6 +122,35 @@ def validate_bucket_exists_tool(bucket_name: str) -> Dict[str, Any]:
     return {"status": "error", "error": str(e)}
 
 
+def _file_exists_result(
+    bucket_name: str, file_path: str, blob: Optional["storage.Blob"]
+) -> Dict[str, Any]:
+  """Build the validation result for a blob fetched with `get_blob`."""
+  if blob is None:
+    return {
+        "status": "success",
+        "exists": False,
+        "bucket_name": bucket_name,
+        "file_path": file_path,
+    }
+  return {
+      "status": "success",
+      "exists": True,
+      "bucket_name": bucket_name,
+      "file_path": file_path,
+      "metadata": {
+          "size": blob.size,
+          "content_type": blob.content_type,
+          "created": (
+              blob.time_created.isoformat() if blob.time_created else None
+          ),
+          "updated": blob.updated.isoformat() if blob.updated else None,
+          "md5_hash": blob.md5_hash,
+          "generation": blob.generation,
+      },
+  }
+
+
 def validate_file_exists_tool(
     bucket_name: str, file_path: str
 ) -> Dict[str, Any]:
@@ -84,47 +166,114 @@ def validate_file_exists_tool(
   """
   try:
     client = get_gcs_client()
-    bucket = client.bucket(bucket_name)
-    blob = bucket.blob(file_path)
+    # A single metadata GET answers both existence and metadata.
+    blob = client.bucket(bucket_name).get_blob(file_path)
+    return _file_exists_result(bucket_name, file_path, blob)
 
-    if blob.exists():
-      blob.reload()  # Get fresh metadata
-      return {
-          "status": "success",
-          "exists": True,
-          "bucket_name": bucket_name,
-          "file_path": file_path,
-          "metadata": {
-              "size": blob.size,
-              "content_type": blob.content_type,
-              "created": (
-                  blob.time_created.isoformat() if blob.time_created else None
-              ),
-              "updated": blob.updated.isoformat() if blob.updated else None,
-              "md5_hash": blob.md5_hash,
-              "generation": blob.generation,
-          },
-      }
-    else:
-      return {
-          "status": "success",
-          "exists": False,
-          "bucket_name": bucket_name,
-          "file_path": file_path,
-      }
+  except Exception as e:
+    return {"status": "error", "error": str(e)}
+
+
+def validate_files_exist_tool(
+    files: List[Dict[str, str]], max_workers: int = 16
+) -> Dict[str, Any]:
+  """Validate that many files exist in GCS with concurrent metadata fetches.
+
+  Args:
+      files (List[Dict[str, str]]): Files to validate, each a dict with
+        "bucket_name" and "file_path" keys.
+      max_workers (int): Maximum number of concurrent metadata requests.
+        Defaults to 16.
+
+  Returns:
+      Dict[str, Any]: Dictionary with one result per input file, in input
+      order, each shaped like the result of `validate_file_exists_tool`.
+  """
+  try:
+    client = get_gcs_client()
+
+    def validate(file: Dict[str, str]) -> Dict[str, Any]:
+      bucket_name = file.get("bucket_name")
+      file_path = file.get("file_path")
+      try:
+        blob = client.bucket(bucket_name).get_blob(file_path)
+        return _file_exists_result(bucket_name, file_path, blob)
+      except Exception as e:
+        return {
+            "status": "error",
+            "bucket_name": bucket_name,
+            "file_path": file_path,
+            "error": str(e),
+        }
+
+    workers = max(1, min(max_workers, config.http_pool_size, len(files) or 1))
+    with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as pool:
+      results = list(pool.map(validate, files))
+
+    return {
+        "status": "success",
+        "results": results,
+        "total_files": len(results),
+        "existing_files": sum(1 for r in results if r.get("exists")),
+        "errors": sum(1 for r in results if r["status"] == "error"),
+    }
 
   except Exception as e:
     return {"status": "error", "error": str(e)}
 
 
+def iter_bucket_files(
+    bucket_name: str,
+    prefix: Optional[str] = None,
+    max_results: Optional[int] = None,
+    start_offset: Optional[str] = None,
+    page_size: int = _LIST_PAGE_SIZE,
+) -> Iterator[Dict[str, Any]]:
+  """Lazily iterate over the files in a bucket for in-process consumers.
+
+  Pages are fetched on demand with server-side field selection, so only name,
+  size and updated time are transferred, and iteration stops issuing requests
+  once `max_results` files have been yielded.
+
+  Args:
+      bucket_name (str): The name of the bucket.
+      prefix (Optional[str]): Only yield objects whose names begin with this
+        prefix.
+      max_results (Optional[int]): Maximum number of files to yield.
+      start_offset (Optional[str]): Only yield objects whose names are
+        lexicographically equal to or after this value.
+      page_size (int): Number of objects requested per page.
+
+  Yields:
+      Dict[str, Any]: Dictionaries with "name", "size" and "updated" (a
+      datetime) keys.
+  """
+  client = get_gcs_client()
+  blobs = client.list_blobs(
+      bucket_name,
+      prefix=prefix,
+      max_results=max_results,
+      start_offset=start_offset,
+      page_size=page_size,
+      fields=_MINIMAL_LIST_FIELDS,
+  )
+  for blob in blobs:
+    yield {"name": blob.name, "size": blob.size, "updated": blob.updated}
+
+
 def list_bucket_files_tool(
     bucket_name: str,
     prefix: Optional[str] = None,
     delimiter: Optional[str] = None,
     max_results: Optional[int] = None,
+    page_size: Optional[int] = None,
+    page_token: Optional[str] = None,
 ) -> Dict[str, Any]:
   """List files in a GCS bucket with optional filtering.
 
+  When `page_size` or `page_token` is given, a single page is returned along
+  with a `next_page_token` to pass back for the following page.
+
   Args:
       bucket_name (str): The name of the bucket.
       prefix (Optional[str]): Filter results to objects whose names begin with
@@ -132,36 +281,49 @@ def list_bucket_files_tool(
       delimiter (Optional[str]): Filter results to objects whose names don't
         contain the delimiter.
       max_results (Optional[int]): Maximum number of results to return.
+      page_size (Optional[int]): Number of results per page in paginated mode.
+      page_token (Optional[str]): Token from a previous call's
+        `next_page_token` to fetch the next page.
 
   Returns:
       Dict[str, Any]: Dictionary containing list of files and their metadata.
   """
   try:
     client = get_gcs_client()
-    bucket = client.bucket(bucket_name)
 
-    # Build the list of blobs
-    blobs = bucket.list_blobs(
-        prefix=prefix, delimiter=delimiter, max_results=max_results
+    # Only request the fields that end up in the result.
+    blobs = client.list_blobs(
+        bucket_name,
+        prefix=prefix,
+        delimiter=delimiter,
+        max_results=max_results,
+        page_size=page_size,
+        page_token=page_token,
+        fields=_LIST_FIELDS,
     )
 
+    if page_size or page_token:
+      page = next(blobs.pages, None)
+      items = list(page) if page is not None else []
+      prefixes = sorted(page.prefixes) if page is not None else []
+      next_page_token = blobs.next_page_token
+    else:
+      items = list(blobs)
+      prefixes = sorted(blobs.prefixes)
+      next_page_token = None
+
     # Collect file information
     files = []
-    prefixes = []
-
-    for blob in blobs:
-      if isinstance(blob, storage.Blob):
-        files.append({
-            "name": blob.name,
-            "size": blob.size,
-            "content_type": blob.content_type,
-            "created": (
-                blob.time_created.isoformat() if blob.time_created else None
-            ),
-            "updated": blob.updated.isoformat() if blob.updated else None,
-        })
-      else:
-        prefixes.append(blob)
+    for blob in items:
+      files.append({
+          "name": blob.name,
+          "size": blob.size,
+          "content_type": blob.content_type,
+          "created": (
+              blob.time_created.isoformat() if blob.time_created else None
+          ),
+          "updated": blob.updated.isoformat() if blob.updated else None,
+      })
 
     return {
         "status": "success",
@@ -172,23 +334,231 @@ def list_bucket_files_tool(
         "prefixes": prefixes,
         "total_files": len(files),
         "total_prefixes": len(prefixes),
+        "next_page_token": next_page_token,
     }
 
   except Exception as e:
     return {"status": "error", "error": str(e)}
 
 
+RangeReader = Callable[[int, int], bytes]
+
+
+def _blob_range_reader(blob: "storage.Blob") -> RangeReader:
+  """Read the stored bytes in [start, end) of a blob with a ranged download.
+
+  Raw downloads bypass decompressive transcoding, so ranges always address the
+  stored (possibly compressed) bytes.
+  """
+  return lambda start, end: blob.download_as_bytes(
+      start=start, end=end - 1, raw_download=True, checksum=None
+  )
+
+
+class _RangeStream(io.RawIOBase):
+  """Sequential read-only stream over a range reader.
+
+  Ranges grow from `_RANGE_CHUNK_SIZE` up to `_MAX_RANGE_CHUNK_SIZE`, so short
+  reads stay cheap while long scans need few requests and bounded memory.
+  """
+
+  def __init__(self, read_range: RangeReader, size: int):
+    self._read_range = read_range
+    self._size = size
+    self._pos = 0
+    self._buffer = memoryview(b"")
+    self._chunk_size = _RANGE_CHUNK_SIZE
+    self.bytes_read = 0
+
+  def readable(self) -> bool:
+    return True
+
+  def readinto(self, b) -> int:
+    if not self._buffer:
+      if self._pos >= self._size:
+        return 0
+      end = min(self._size, self._pos + self._chunk_size)
+      self._buffer = memoryview(self._read_range(self._pos, end))
+      if not self._buffer:
+        return 0
+      self._pos += len(self._buffer)
+      self.bytes_read += len(self._buffer)
+      self._chunk_size = min(self._chunk_size * 2, _MAX_RANGE_CHUNK_SIZE)
+    n = min(len(b), len(self._buffer))
+    b[:n] = self._buffer[:n]
+    self._buffer = self._buffer[n:]
+    return n
+
+
+@contextlib.contextmanager
+def open_blob(
+    blob: "storage.Blob", cached: Optional[CachedObject] = None
+) -> Iterator[BinaryIO]:
+  """Open a blob, or its cached copy, as a stream of decompressed bytes.
+
+  gzip and zstd objects, detected by content encoding or extension, are
+  decompressed incrementally, so callers can read or iterate lines without
+  holding the whole payload in memory.
+
+  Args:
+      blob (storage.Blob): Blob with loaded metadata.
+      cached (Optional[CachedObject]): Cached copy of the blob to read instead
+        of GCS.
+
+  Yields:
+      BinaryIO: Stream of decompressed bytes.
+  """
+  compression = detect_compression(blob.name, blob.content_encoding)
+  with contextlib.ExitStack() as stack:
+    if cached is not None:
+      raw = stack.enter_context(cached.open())
+    else:
+      raw = io.BufferedReader(
+          _RangeStream(_blob_range_reader(blob), blob.size or 0)
+      )
+    yield stack.enter_context(open_decompressed(raw, compression))
+
+
+def _decode_line(line: bytes) -> str:
+  return line.rstrip(b"\r\n").decode(errors="replace")
+
+
+def _read_stream_lines(
+    stream: BinaryIO, mode: str, num_lines: int, offset: int
+) -> Tuple[List[str], Dict[str, Any]]:
+  """Read lines from a decompressed stream for the given mode.
+
+  Compressed data cannot be addressed by byte range, so tail mode scans the
+  stream keeping only the last `num_lines` lines, and offset mode skips
+  `offset` decompressed bytes before reading.
+
+  Returns:
+      Tuple[List[str], Dict[str, Any]]: The lines read and, for offset mode,
+      the cursor fields.
+  """
+  if mode == "head":
+    raw_lines = itertools.islice(stream, num_lines)
+    return [_decode_line(line) for line in raw_lines], {}
+  if mode == "tail":
+    raw_lines = collections.deque(stream, num_lines) if num_lines else []
+    return [_decode_line(line) for line in raw_lines], {}
+  if mode == "offset":
+    remaining = max(offset, 0)
+    while remaining > 0:
+      skipped = stream.read(min(remaining, _MAX_RANGE_CHUNK_SIZE))
+      if not skipped:
+        break
+      remaining -= len(skipped)
+    raw_lines = list(itertools.islice(stream, num_lines + 1))
+    has_more = len(raw_lines) > num_lines
+    raw_lines = raw_lines[:num_lines]
+    next_offset = max(offset, 0) - remaining + sum(len(l) for l in raw_lines)
+    return [_decode_line(line) for line in raw_lines], {
+        "offset": offset,
+        "next_offset": next_offset,
+        "has_more": has_more,
+    }
+  return [_decode_line(line) for line in stream], {}
+
+
+def _read_lines_forward(
+    read_range: RangeReader, size: int, start: int, num_lines: int
+) -> Tuple[List[str], int, int]:
+  """Read up to `num_lines` lines starting at byte offset `start`.
+
+  The object is fetched with growing byte-range requests that stop as soon as
+  enough newlines have been seen, so the bytes transferred are bounded by the
+  lines requested rather than the object size.
+
+  Returns:
+      Tuple[List[str], int, int]: The lines read, the byte offset just past the
+      last returned line, and the number of bytes read.
+  """
+  chunks = []
+  newlines = 0
+  pos = start
+  chunk_size = _RANGE_CHUNK_SIZE
+  while pos < size and newlines < num_lines:
+    data = read_range(pos, min(size, pos + chunk_size))
+    if not data:
+      break
+    chunks.append(data)
+    newlines += data.count(b"\n")
+    pos += len(data)
+    chunk_size = min(chunk_size * 2, _MAX_RANGE_CHUNK_SIZE)
+
+  buf = b"".join(chunks)
+  lines = []
+  consumed = 0
+  while len(lines) < num_lines and consumed < len(buf):
+    newline = buf.find(b"\n", consumed)
+    line_end = len(buf) if newline == -1 else newline
+    lines.append(buf[consumed:line_end].rstrip(b"\r").decode(errors="replace"))
+    consumed = min(line_end + 1, len(buf))
+  return lines, start + consumed, len(buf)
+
+
+def _read_lines_backward(
+    read_range: RangeReader, size: int, num_lines: int
+) -> Tuple[List[str], int]:
+  """Read the last `num_lines` lines with reverse byte-range requests.
+
+  Returns:
+      Tuple[List[str], int]: The lines read and the number of bytes read.
+  """
+  chunks = []
+  newlines = 0
+  pos = size
+  chunk_size = _RANGE_CHUNK_SIZE
+  needed = num_lines
+  while pos > 0:
+    start = max(0, pos - chunk_size)
+    data = read_range(start, pos)
+    if not chunks and data.endswith(b"\n"):
+      # The final newline terminates the last line rather than starting one.
+      needed += 1
+    chunks.append(data)
+    newlines += data.count(b"\n")
+    pos = start
+    chunk_size = min(chunk_size * 2, _MAX_RANGE_CHUNK_SIZE)
+    if newlines >= needed:
+      break
+
+  buf = b"".join(reversed(chunks))
+  bytes_read = len(buf)
+  if pos > 0:
+    # Drop the partial first line.
+    buf = buf[buf.find(b"\n") + 1 :]
+  lines = buf.decode(errors="replace").splitlines()
+  return lines[-num_lines:], bytes_read
+
+
 def read_gcs_file_tool(
-    bucket_name: str, file_path: str, mode: str = "full", num_lines: int = 10
+    bucket_name: str,
+    file_path: str,
+    mode: str = "full",
+    num_lines: int = 10,
+    offset: int = 0,
 ) -> Dict[str, Any]:
   """Read content from a GCS file with various options.
 
+  Head, tail and offset modes use byte-range reads, so only the bytes needed for
+  the requested lines are downloaded. gzip and zstd objects are decompressed
+  while streaming; for them "offset" counts decompressed bytes, and tail and
+  offset reads scan the object with bounded memory. Full reads are decoded line
+  by line from the cache, a sliced download or ranged reads.
+
   Args:
       bucket_name (str): The name of the bucket.
       file_path (str): The path of the file within the bucket.
-      mode (str): Reading mode - "head", "tail", or "full". Defaults to "full".
-      num_lines (int): Number of lines to read for head/tail modes. Defaults to
-        10.
+      mode (str): Reading mode - "head", "tail", "offset", or "full". Defaults
+        to "full". "offset" reads `num_lines` lines starting at the byte
+        `offset` and returns a `next_offset` cursor for the following page.
+      num_lines (int): Number of lines to read for head/tail/offset modes.
+        Defaults to 10.
+      offset (int): Byte offset to start reading from in "offset" mode. Use 0
+        for the first page and the returned `next_offset` afterwards. Defaults
+        to 0.
 
   Returns:
       Dict[str, Any]: Dictionary containing file content and metadata.
@@ -196,28 +566,77 @@ def read_gcs_file_tool(
   try:
     client = get_gcs_client()
     bucket = client.bucket(bucket_name)
-    blob = bucket.blob(file_path)
+    blob = bucket.get_blob(file_path)
 
-    if not blob.exists():
+    if blob is None:
       return {
           "status": "error",
           "error": f"File {file_path} does not exist in bucket {bucket_name}",
       }
 
-    # Read the file content
-    content = blob.download_as_text()
-    lines = content.splitlines()
-
-    # Process based on mode
-    if mode == "head":
-      result_lines = lines[:num_lines]
-      position = "start"
-    elif mode == "tail":
-      result_lines = lines[-num_lines:]
-      position = "end"
-    else:  # full
-      result_lines = lines
-      position = "full"
+    num_lines = max(num_lines, 0)
+    size = blob.size or 0
+    compression = detect_compression(blob.name, blob.content_encoding)
+    cursor = {}
+
+    # Serve from the local cache when this generation is already there; full
+    # reads also populate it for the next iteration of the agent loop.
+    cached = GCS_CACHE.lookup(blob)
+    cache_hit = cached is not None
+    if cached is None and mode == "full":
+      cached = GCS_CACHE.fetch(blob)
+
+    with contextlib.ExitStack() as stack:
+      if cached is not None:
+        stack.enter_context(cached)
+        view = stack.enter_context(cached.view())
+        read_range = lambda start, end: bytes(view[start:end])
+      else:
+        read_range = _blob_range_reader(blob)
+
+      # Process based on mode
+      if compression is not None:
+        raw = _RangeStream(read_range, size)
+        stream = stack.enter_context(
+            open_decompressed(io.BufferedReader(raw), compression)
+        )
+        result_lines, cursor = _read_stream_lines(
+            stream, mode, num_lines, offset
+        )
+        bytes_read = raw.bytes_read
+        position = {"head": "start", "tail": "end", "offset": "offset"}.get(
+            mode, "full"
+        )
+      elif mode == "head":
+        result_lines, _, bytes_read = _read_lines_forward(
+            read_range, size, 0, num_lines
+        )
+        position = "start"
+      elif mode == "tail":
+        result_lines, bytes_read = _read_lines_backward(
+            read_range, size, num_lines
+        )
+        position = "end"
+      elif mode == "offset":
+        result_lines, next_offset, bytes_read = _read_lines_forward(
+            read_range, size, max(offset, 0), num_lines
+        )
+        position = "offset"
+        cursor = {
+            "offset": offset,
+            "next_offset": next_offset,
+            "has_more": next_offset < size,
+        }
+      else:  # full
+        # Decode line by line so the raw bytes and the whole decoded text are
+        # never held alongside the result lines.
+        if cached is None and use_sliced_download(blob):
+          stream = stack.enter_context(open_sliced(blob))
+        else:
+          stream = io.BufferedReader(_RangeStream(read_range, size))
+        result_lines, _ = _read_stream_lines(stream, mode, num_lines, offset)
+        bytes_read = size
+        position = "full"
 
     return {
         "status": "success",
@@ -226,7 +645,11 @@ def read_gcs_file_tool(
         "mode": mode,
         "num_lines": len(result_lines),
         "position": position,
+        **cursor,
         "content": "\n".join(result_lines),
+        "bytes_read": bytes_read,
+        "cache_hit": cache_hit,
+        "compression": compression,
         "metadata": {
             "size": blob.size,
             "content_type": blob.content_type,
@@ -4,8 +4,44 @@ Github: ephiewangyf@gmail.com
 Date: 2025-11-13
 Description: Tools for Ingestion agent - Mock implementations
 '''
-from typing import Any, Dict, List, Optional
+from typing import TYPE_CHECKING, Any, Dict, Iterator, List, Optional, Union
+import contextlib
+import hashlib
 import json
+import os
+import shutil
+import tempfile
+from ..config import config
+from .bigquery_query import QueryBudgetExceeded, complete_query, dry_run, submit_query
+from .bigquery_result_cache import RESULT_CACHE
+from .bigquery_results import iter_record_batches, pyarrow
+from .bigquery_tools import get_bigquery_client, get_bigquery_storage_client
+from .compression import detect_compression, open_decompressed
+from .disk_cache import atomic_write, enforce_byte_budget, file_lock, touch
+from .gcs_cache import GCS_CACHE, CachedObject
+from .gcs_tools import get_gcs_client, open_blob
+from .gcs_transfer import download_sliced_to_filename, open_sliced
+from .lazy_import import lazy_import
+
+if TYPE_CHECKING:
+    from google.cloud import bigquery, storage
+else:
+    bigquery = lazy_import("google.cloud.bigquery")
+
+# Objects larger than this are handed over as a local file path, not inline.
+_INLINE_MAX_BYTES = 1024 * 1024
+
+# Rows requested per BigQuery result page.
+_QUERY_PAGE_SIZE = 10000
+
+# Query results beyond the inline limit are spilled here.
+_SPILL_DIR = os.path.join(config.cache_dir, "query_bq")
+
+# GCS objects beyond the inline limit are spilled here.
+_GCS_SPILL_DIR = os.path.join(config.cache_dir, "fetch_gcs")
+
+# Writes of a spill that another process evicted before it was returned.
+_SPILL_ATTEMPTS = 3
 
 
 def fetch_apigee(api_endpoint: str, params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
@@ -34,30 +70,217 @@ def fetch_apigee(api_endpoint: str, params: Optional[Dict[str, Any]] = None) ->
     }
 
 
-def query_bq(query: str, dataset_id: Optional[str] = None, table_id: Optional[str] = None) -> Dict[str, Any]:
+def _resolve_query(query: str, dataset_id: Optional[str], table_id: Optional[str]) -> str:
+    """Turn a table identifier into a SELECT statement; SQL is returned as is."""
+    identifier = query.strip().strip("`")
+    if not identifier and table_id:
+        identifier = table_id
+    if not identifier or any(char.isspace() for char in identifier):
+        return query
+    parts = identifier.split(".")
+    if len(parts) == 1:
+        if not dataset_id:
+            raise ValueError(f"dataset_id is required to query table '{identifier}'")
+        parts = [dataset_id] + parts
+    if len(parts) == 2:
+        parts = [config.project_id] + parts
+    return f"SELECT * FROM `{'.'.join(parts)}`"
+
+
+def _page_nbytes(page: Union["pyarrow.RecordBatch", List[Dict[str, Any]]]) -> int:
+    if pyarrow is not None:
+        return page.nbytes
+    return len(json.dumps(page, default=str))
+
+
+def _page_records(page: Union["pyarrow.RecordBatch", List[Dict[str, Any]]]) -> List[Dict[str, Any]]:
+    if pyarrow is not None:
+        return page.to_pylist()
+    return page
+
+
+def iter_query_pages(
+    query: str,
+    job_config: Optional["bigquery.QueryJobConfig"] = None,
+    max_rows: Optional[int] = None,
+    max_bytes: Optional[int] = None,
+    page_size: int = _QUERY_PAGE_SIZE,
+    stats: Optional[Dict[str, Any]] = None,
+) -> Iterator[Union["pyarrow.RecordBatch", List[Dict[str, Any]]]]:
+    """Run a query and lazily yield its result pages.
+    
+    The query goes through the byte budget and the local result cache. Pages
+    are only downloaded as they are consumed, and iteration stops once
+    `max_rows` rows or `max_bytes` bytes have been yielded.
+    
+    Args:
+        query (str): Standard SQL query.
+        job_config (Optional[bigquery.QueryJobConfig]): Job configuration.
+        max_rows (Optional[int]): Maximum number of rows to yield; the last
+            page is cut short if needed.
+        max_bytes (Optional[int]): Maximum size of the yielded pages; the page
+            that would exceed it is dropped.
+        page_size (int): Rows requested per page.
+        stats (Optional[Dict[str, Any]]): Filled in with the cost record, the
+            number of rows and bytes yielded, and whether the result was
+            truncated by a cap.
+    
+    Yields:
+        Union[pyarrow.RecordBatch, List[Dict[str, Any]]]: Arrow record batches,
+        or lists of row dictionaries when `pyarrow` is not installed.
+    """
+    stats = {} if stats is None else stats
+    stats.update({"rows": 0, "bytes": 0, "truncated": False})
+    client = get_bigquery_client()
+    estimate = dry_run(client, query, job_config)
+    cache_path = RESULT_CACHE.entry_path(client, query, job_config, estimate)
+    stats["result_cache_path"] = cache_path
+
+    cached = RESULT_CACHE.read(cache_path, estimate) if cache_path else None
+    if cached is not None:
+        table, stats["cost"] = cached
+        pages = table.to_batches(max_chunksize=page_size)
+    else:
+        job, cost = submit_query(client, query, job_config, estimate=estimate)
+        try:
+            rows = job.result(page_size=page_size)
+        finally:
+            complete_query(job, cost)
+        cost["result_cache_hit"] = False
+        stats["cost"] = cost
+        if pyarrow is not None:
+            pages = iter_record_batches(rows, get_bigquery_storage_client())
+        else:
+            pages = ([dict(row.items()) for row in page] for page in rows.pages)
+
+    for page in pages:
+        if max_rows is not None and stats["rows"] + len(page) > max_rows:
+            page = page[:max_rows - stats["rows"]]
+            stats["truncated"] = True
+        nbytes = _page_nbytes(page)
+        if max_bytes is not None and stats["bytes"] + nbytes > max_bytes:
+            stats["truncated"] = True
+            return
+        stats["rows"] += len(page)
+        stats["bytes"] += nbytes
+        if len(page):
+            yield page
+        if stats["truncated"]:
+            return
+
+
+def query_bq(
+    query: str,
+    dataset_id: Optional[str] = None,
+    table_id: Optional[str] = None,
+    max_rows: Optional[int] = None,
+    max_bytes: Optional[int] = None,
+) -> Dict[str, Any]:
     """Query BigQuery table.
     
+    Results are streamed page by page. Small results are returned inline;
+    once they exceed the inline limit, all pages are spilled to a local
+    zstd-compressed Arrow IPC file and its path is returned instead, so large
+    results never enter the context. Spilling requires `pyarrow`; without it,
+    results are truncated at the inline limit.
+    
     Args:
         query (str): SQL query string or table identifier.
         dataset_id (Optional[str]): Dataset ID if querying a specific table.
+            Also the default dataset for unqualified table names in SQL.
         table_id (Optional[str]): Table ID if querying a specific table.
+        max_rows (Optional[int]): Maximum number of rows to fetch. Defaults to
+            `config.bq_query_max_rows`.
+        max_bytes (Optional[int]): Maximum size of the fetched results.
+            Defaults to `config.bq_query_max_bytes`.
     
     Returns:
-        Dict[str, Any]: Mock query results.
+        Dict[str, Any]: Query results inline, or the path and schema of the
+        local result file.
     """
-    return {
-        "status": "success",
-        "source": "bigquery",
-        "query": query,
-        "dataset_id": dataset_id,
-        "table_id": table_id,
-        "results": [
-            {"column1": "value1", "column2": "value2", "column3": 123},
-            {"column1": "value3", "column2": "value4", "column3": 456},
-        ],
-        "row_count": 2,
-        "message": "This is a mock BigQuery query result"
-    }
+    try:
+        sql = _resolve_query(query, dataset_id, table_id)
+        job_config = bigquery.QueryJobConfig()
+        if dataset_id:
+            job_config.default_dataset = f"{config.project_id}.{dataset_id}"
+
+        stats: Dict[str, Any] = {}
+        inline = []
+        spill_path = None
+        spill_schema = None
+        writer = None
+        try:
+            for page in iter_query_pages(
+                sql,
+                job_config,
+                max_rows=max_rows or config.bq_query_max_rows,
+                max_bytes=max_bytes or config.bq_query_max_bytes,
+                stats=stats,
+            ):
+                if writer is None and stats["bytes"] <= _INLINE_MAX_BYTES:
+                    inline.append(page)
+                    continue
+                if pyarrow is None:
+                    stats["truncated"] = True
+                    break
+                if writer is None:
+                    os.makedirs(_SPILL_DIR, exist_ok=True)
+                    fd, spill_path = tempfile.mkstemp(suffix=".arrow", dir=_SPILL_DIR)
+                    os.close(fd)
+                    spill_schema = page.schema
+                    writer = pyarrow.ipc.new_file(
+                        spill_path,
+                        spill_schema,
+                        options=pyarrow.ipc.IpcWriteOptions(compression="zstd"),
+                    )
+                    for spilled in inline:
+                        writer.write_batch(spilled)
+                    inline = []
+                writer.write_batch(page)
+        finally:
+            if writer is not None:
+                writer.close()
+
+        result = {
+            "status": "success",
+            "source": "bigquery",
+            "query": sql,
+            "dataset_id": dataset_id,
+            "table_id": table_id,
+            "row_count": stats["rows"],
+            "truncated": stats["truncated"],
+            "result_cache_hit": stats["cost"]["result_cache_hit"],
+            "cost": stats["cost"],
+        }
+        cache_path = stats["result_cache_path"]
+        store = cache_path and not stats["truncated"] and not result["result_cache_hit"]
+
+        if spill_path is not None:
+            with file_lock(_SPILL_DIR):
+                enforce_byte_budget(_SPILL_DIR, config.bq_spill_max_bytes, keep=spill_path)
+            if store:
+                RESULT_CACHE.store_file(cache_path, spill_path)
+            result["local_path"] = spill_path
+            result["format"] = "arrow_ipc"
+            result["schema"] = [
+                {"name": field.name, "type": str(field.type)}
+                for field in spill_schema
+            ]
+            return result
+
+        if store and inline:
+            RESULT_CACHE.store(cache_path, pyarrow.Table.from_batches(inline))
+        result["results"] = [row for page in inline for row in _page_records(page)]
+        return result
+    except QueryBudgetExceeded as e:
+        return {
+            "status": "error",
+            "source": "bigquery",
+            "error": str(e),
+            "estimated_bytes_processed": e.estimated_bytes,
+        }
+    except Exception as e:
+        return {"status": "error", "source": "bigquery", "error": str(e)}
 
 
 def fetch_pub(topic: str, subscription: Optional[str] = None, max_messages: int = 10) -> Dict[str, Any]:
@@ -163,27 +386,138 @@ def fetch_crm(record_type: str, record_id: Optional[str] = None, filters: Option
     }
 
 
+def _gcs_spill_path(blob: "storage.Blob", compression: Optional[str]) -> str:
+    """Return where the decompressed bytes of a blob version are spilled."""
+    version = blob.generation or blob.md5_hash
+    key = f"{blob.bucket.name}/{blob.name}#{version}"
+    digest = hashlib.sha256(key.encode("utf-8")).hexdigest()
+    name = os.path.basename(blob.name)
+    root, extension = os.path.splitext(name)
+    if compression and detect_compression(extension):
+        name = root
+    return os.path.join(_GCS_SPILL_DIR, digest[:2], f"{digest}-{name}")
+
+
+def _write_gcs_spill(
+    blob: "storage.Blob", cached: Optional[CachedObject], compression: Optional[str], tmp_path: str
+) -> None:
+    """Write the decompressed bytes of a blob to `tmp_path`."""
+    if cached is not None and compression is None:
+        # A hard link shares the cached bytes but outlives the cache entry.
+        os.remove(tmp_path)
+        try:
+            os.link(cached.path, tmp_path)
+            return
+        except OSError:
+            pass
+    elif cached is None and compression is None:
+        download_sliced_to_filename(blob, tmp_path)
+        return
+    with contextlib.ExitStack() as stack:
+        raw = stack.enter_context(
+            cached.open() if cached is not None else open_sliced(blob)
+        )
+        stream = stack.enter_context(open_decompressed(raw, compression))
+        with open(tmp_path, "wb") as f:
+            shutil.copyfileobj(stream, f)
+
+
+def _spill_gcs_object(
+    blob: "storage.Blob", cached: Optional[CachedObject], compression: Optional[str]
+) -> str:
+    """Write the decompressed bytes of a blob to a local file and return its path.
+    
+    The bytes are read from the cached copy if there is one; an uncompressed
+    cached copy is hard-linked where possible, so the spill survives eviction
+    of the cache entry. Objects too large for the cache are downloaded with
+    concurrent range reads instead, straight into the spill file or, if
+    compressed, into a temporary file that is decompressed from. Spills are
+    keyed by the blob's generation, so fetching an unchanged object again
+    reuses its spill. The spill is marked as most recently used under the spill
+    directory lock before its path is returned, so eviction reaches it last.
+    """
+    path = _gcs_spill_path(blob, compression)
+    reusable = bool(blob.generation or blob.md5_hash)
+    for _ in range(_SPILL_ATTEMPTS):
+        if reusable:
+            with file_lock(_GCS_SPILL_DIR):
+                if os.path.exists(path):
+                    touch(path)
+                    return path
+        with atomic_write(path) as tmp_path:
+            _write_gcs_spill(blob, cached, compression, tmp_path)
+        with file_lock(_GCS_SPILL_DIR):
+            # Another process may have evicted the spill before the lock was
+            # taken; it is written again then.
+            if os.path.exists(path):
+                touch(path)
+                enforce_byte_budget(_GCS_SPILL_DIR, config.gcs_spill_max_bytes, keep=path)
+                return path
+    raise FileNotFoundError(f"Spill of {blob.name} was evicted before it could be returned")
+
+
 def fetch_gcs(bucket_name: str, file_path: str) -> Dict[str, Any]:
     """Fetch data from GCS.
     
+    Objects are served from the local GCS object cache, which is revalidated
+    against the object's generation with a single metadata call. gzip and zstd
+    objects are decompressed while streaming. Objects larger than the inline
+    limit are returned as the path of a local file holding the decompressed
+    bytes instead of content; for uncompressed objects it is a hard link to
+    the cached copy where possible. Cache entries themselves are never handed
+    out, since they can be evicted at any time. Objects too large for the
+    cache are downloaded to that file with concurrent range reads rather than
+    read into memory.
+    
     Args:
         bucket_name (str): GCS bucket name.
         file_path (str): GCS file path.
     
     Returns:
-        Dict[str, Any]: Mock GCS data.
+        Dict[str, Any]: GCS object content or local cached file path.
     """
-    return {
-        "status": "success",
-        "source": "gcs",
-        "bucket_name": bucket_name,
-        "file_path": file_path,
-        "data": {
-            "message": "This is a mock GCS data",
-            "timestamp": "2025-11-13T10:00:00Z",
-            "records": [
-                {"id": 1, "name": "record1", "value": "data1"},
-                {"id": 2, "name": "record2", "value": "data2"},
-            ]
+    try:
+        blob = get_gcs_client().bucket(bucket_name).get_blob(file_path)
+        if blob is None:
+            return {
+                "status": "error",
+                "source": "gcs",
+                "error": f"File {file_path} does not exist in bucket {bucket_name}",
+            }
+
+        cached = GCS_CACHE.lookup(blob)
+        cache_hit = cached is not None
+        if cached is None:
+            cached = GCS_CACHE.fetch(blob)
+        compression = detect_compression(blob.name, blob.content_encoding)
+        result = {
+            "status": "success",
+            "source": "gcs",
+            "bucket_name": bucket_name,
+            "file_path": file_path,
+            "generation": blob.generation,
+            "size": blob.size,
+            "content_type": blob.content_type,
+            "compression": compression,
+            "cache_hit": cache_hit,
         }
-    }
\ No newline at end of file
+        with contextlib.ExitStack() as stack:
+            if cached is not None:
+                stack.enter_context(cached)
+            if compression is None and (blob.size or 0) > _INLINE_MAX_BYTES:
+                result["local_path"] = _spill_gcs_object(blob, cached, compression)
+                return result
+
+            # Read at most one byte past the inline limit, so large
+            # decompressed payloads are never materialized.
+            with open_blob(blob, cached) as stream:
+                data = stream.read(_INLINE_MAX_BYTES + 1)
+            if len(data) <= _INLINE_MAX_BYTES:
+                result["data"] = data.decode("utf-8", errors="replace")
+            else:
+                # A cached copy is stored compressed, so the path handed out
+                # points at a decompressed spill of the object instead.
+                result["local_path"] = _spill_gcs_object(blob, cached, compression)
+            return result
+    except Exception as e:
+        return {"status": "error", "source": "gcs", "error": str(e)}
@@ -0,0 +1,66 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""This module provides deferred imports of heavy third-party modules.
+
+`lazy_import` returns a stand-in module that imports the real one on first
+attribute access. Tool modules bind the Google Cloud SDKs this way, so that
+importing them costs nothing until a tool actually runs. Annotations that name
+SDK types are quoted, with the real imports under `TYPE_CHECKING`, so that
+defining a function does not trigger the import either.
+"""
+
+import importlib
+import importlib.util
+import sys
+import types
+from typing import Any, List, Optional
+
+
+class _LazyModule(types.ModuleType):
+  """Stand-in for a module that is imported on first attribute access."""
+
+  def __getattr__(self, attr: str) -> Any:
+    # Only called for attributes the stand-in itself lacks; after the first
+    # call the import is a lookup in `sys.modules`.
+    return getattr(importlib.import_module(self.__name__), attr)
+
+  def __dir__(self) -> List[str]:
+    return dir(importlib.import_module(self.__name__))
+
+
+def lazy_import(
+    name: str, optional: bool = False
+) -> Optional[types.ModuleType]:
+  """Return a module that is imported on first attribute access.
+
+  Args:
+      name (str): Absolute name of the module, e.g. "google.cloud.bigquery".
+      optional (bool): If True, return None when the module is not installed.
+        Availability is checked without importing the module, but the parent
+        packages of a dotted name are imported to find it.
+
+  Returns:
+      Optional[types.ModuleType]: The module if it is already imported,
+      otherwise a stand-in for it.
+  """
+  if name in sys.modules:
+    return sys.modules[name]
+  if optional:
+    try:
+      if importlib.util.find_spec(name) is None:
+        return None
+    except ImportError:
+      return None
+  return _LazyModule(name)
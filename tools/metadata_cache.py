@@ -0,0 +1,95 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""This module provides an in-process TTL cache for metadata lookups.
+
+Entries expire after a fixed time-to-live and can be invalidated explicitly.
+Concurrent misses for the same key share a single load, and hit/miss counters
+are kept so the TTL can be tuned.
+"""
+
+import threading
+import time
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+
+class TTLCache:
+  """Thread-safe cache whose entries expire after `ttl_seconds`."""
+
+  def __init__(self, ttl_seconds: float):
+    self.ttl_seconds = ttl_seconds
+    self._lock = threading.Lock()
+    self._entries: Dict[Hashable, Tuple[float, Any]] = {}
+    self._load_locks: Dict[Hashable, threading.Lock] = {}
+    self.hits = 0
+    self.misses = 0
+
+  def _lookup(self, key: Hashable) -> Tuple[bool, Any]:
+    with self._lock:
+      entry = self._entries.get(key)
+      if entry is not None and entry[0] > time.monotonic():
+        self.hits += 1
+        return True, entry[1]
+      self._entries.pop(key, None)
+      return False, None
+
+  def get_or_load(self, key: Hashable, loader: Callable[[], Any]) -> Any:
+    """Return the cached value for `key`, calling `loader` on a miss.
+
+    Only one caller loads a given key at a time; the others wait for it and
+    then read its result from the cache.
+    """
+    found, value = self._lookup(key)
+    if found:
+      return value
+
+    with self._lock:
+      load_lock = self._load_locks.setdefault(key, threading.Lock())
+    with load_lock:
+      found, value = self._lookup(key)
+      if found:
+        return value
+      with self._lock:
+        self.misses += 1
+      value = loader()
+      with self._lock:
+        self._entries[key] = (time.monotonic() + self.ttl_seconds, value)
+      return value
+
+  def invalidate(
+      self, predicate: Optional[Callable[[Hashable], bool]] = None
+  ) -> int:
+    """Drop entries whose key matches `predicate`, or all entries.
+
+    Returns:
+        int: Number of entries dropped.
+    """
+    with self._lock:
+      keys = [k for k in self._entries if predicate is None or predicate(k)]
+      for key in keys:
+        del self._entries[key]
+      return len(keys)
+
+  def stats(self) -> Dict[str, Any]:
+    """Return hit/miss counters and the number of live entries."""
+    with self._lock:
+      now = time.monotonic()
+      total = self.hits + self.misses
+      return {
+          "hits": self.hits,
+          "misses": self.misses,
+          "hit_rate": self.hits / total if total else None,
+          "entries": sum(1 for e in self._entries.values() if e[0] > now),
+          "ttl_seconds": self.ttl_seconds,
+      }
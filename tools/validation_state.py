@@ -0,0 +1,162 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""This module provides a local store of per-partition validation results.
+
+For every (table, rule set) pair it records which partitions have been
+validated, the partition's last modification time at that point (its
+watermark), and the raw validation counts. Incremental validation compares the
+watermarks with the table's current partitions to find the ones that need
+revalidating, and merges the stored counts of the others into the summary.
+"""
+
+import contextlib
+import hashlib
+import json
+import os
+import sqlite3
+import time
+from typing import Any, Dict, Iterator, List
+
+from ..config import config
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS partitions (
+    dataset TEXT NOT NULL,
+    table_name TEXT NOT NULL,
+    rules_key TEXT NOT NULL,
+    partition_id TEXT NOT NULL,
+    last_modified INTEGER,
+    result TEXT NOT NULL,
+    validated_at REAL,
+    PRIMARY KEY (dataset, table_name, rules_key, partition_id)
+);
+"""
+
+
+def rules_key(rules: List[Dict[str, Any]]) -> str:
+  """Fingerprint a rule set, so that changing the rules revalidates all."""
+  return hashlib.sha256(
+      json.dumps(rules, sort_keys=True, default=str).encode("utf-8")
+  ).hexdigest()[:16]
+
+
+class ValidationState:
+  """SQLite-backed watermarks and results of validated partitions."""
+
+  def __init__(self, path: str):
+    self.path = path
+    self._initialized = False
+
+  @contextlib.contextmanager
+  def _connect(self) -> Iterator[sqlite3.Connection]:
+    if not self._initialized:
+      os.makedirs(os.path.dirname(self.path), exist_ok=True)
+    conn = sqlite3.connect(self.path, timeout=30)
+    conn.row_factory = sqlite3.Row
+    try:
+      if not self._initialized:
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.executescript(_SCHEMA)
+        self._initialized = True
+      with conn:
+        yield conn
+    finally:
+      conn.close()
+
+  def load(
+      self, dataset: str, table_name: str, key: str
+  ) -> Dict[str, Dict[str, Any]]:
+    """Return the stored watermark and result of each validated partition."""
+    with self._connect() as conn:
+      rows = conn.execute(
+          "SELECT partition_id, last_modified, result, validated_at"
+          " FROM partitions"
+          " WHERE dataset = ? AND table_name = ? AND rules_key = ?",
+          (dataset, table_name, key),
+      ).fetchall()
+    return {
+        row["partition_id"]: {
+            "last_modified": row["last_modified"],
+            "result": json.loads(row["result"]),
+            "validated_at": row["validated_at"],
+        }
+        for row in rows
+    }
+
+  def save(
+      self,
+      dataset: str,
+      table_name: str,
+      key: str,
+      results: Dict[str, Dict[str, Any]],
+  ) -> None:
+    """Store validation results keyed by partition ID.
+
+    Args:
+        results (Dict[str, Dict[str, Any]]): Per partition, a dict with the
+          "last_modified" watermark and the raw "result".
+    """
+    now = time.time()
+    with self._connect() as conn:
+      conn.executemany(
+          "INSERT OR REPLACE INTO partitions (dataset, table_name, rules_key,"
+          " partition_id, last_modified, result, validated_at)"
+          " VALUES (?, ?, ?, ?, ?, ?, ?)",
+          [
+              (
+                  dataset,
+                  table_name,
+                  key,
+                  partition_id,
+                  entry["last_modified"],
+                  json.dumps(entry["result"], default=str),
+                  now,
+              )
+              for partition_id, entry in results.items()
+          ],
+      )
+
+  def remove(
+      self,
+      dataset: str,
+      table_name: str,
+      key: str,
+      partition_ids: List[str],
+  ) -> None:
+    """Forget partitions that no longer exist."""
+    with self._connect() as conn:
+      conn.executemany(
+          "DELETE FROM partitions WHERE dataset = ? AND table_name = ?"
+          " AND rules_key = ? AND partition_id = ?",
+          [(dataset, table_name, key, p) for p in partition_ids],
+      )
+
+  def reset(self, dataset: str, table_name: str) -> int:
+    """Forget every validated partition of a table.
+
+    Returns:
+        int: Number of partitions forgotten.
+    """
+    with self._connect() as conn:
+      cursor = conn.execute(
+          "DELETE FROM partitions WHERE dataset = ? AND table_name = ?",
+          (dataset, table_name),
+      )
+      return cursor.rowcount
+
+
+VALIDATION_STATE = ValidationState(
+    os.path.join(config.cache_dir, "validation_state.sqlite3")
+)